@@ -18,8 +18,16 @@ internal static class Program
 
     private sealed record Result(List<Issue> issues);
 
+    // First line written in --server mode so clients can detect support.
+    private const string ServerBanner = "cymise-dtdl-validator-server/1";
+
     public static int Main(string[] args)
     {
+        if (args.Any(a => string.Equals(a, "--server", StringComparison.OrdinalIgnoreCase)))
+        {
+            return RunServer();
+        }
+
         try
         {
             var inputPath = GetArgValue(args, "--input");
@@ -31,71 +39,43 @@ internal static class Program
                 return 1;
             }
 
-            var jsonFiles = DiscoverJsonFiles(inputPath).ToList();
-            if (jsonFiles.Count == 0)
-            {
-                var empty = new Result(new List<Issue>
-                {
-                    new Issue(
-                        severity: "error",
-                        code: "no_input_files",
-                        message: $"No .json files found under input '{inputPath}'."
-                    )
-                });
-
-                WriteResult(empty, outPath);
-                return 2;
-            }
-
-            var modelTexts = new List<string>(capacity: jsonFiles.Count);
-            foreach (var file in jsonFiles)
+            List<string> modelTexts;
+            if (inputPath == "-")
             {
-                // Read as UTF-8; tolerate BOM etc.
-                var text = File.ReadAllText(file, Encoding.UTF8);
-                modelTexts.Add(text);
+                // Models piped on stdin as a single JSON document (object or array).
+                using var stdin = new StreamReader(Console.OpenStandardInput(), Encoding.UTF8);
+                modelTexts = new List<string> { stdin.ReadToEnd() };
             }
-
-            var parser = new ModelParser();
-
-            try
+            else
             {
-                // Authoritative parse/validate. If invalid, throws ParsingException.
-                _ = parser.Parse(modelTexts);
+                var jsonFiles = DiscoverJsonFiles(inputPath).ToList();
+                if (jsonFiles.Count == 0)
+                {
+                    var empty = new Result(new List<Issue>
+                    {
+                        new Issue(
+                            severity: "error",
+                            code: "no_input_files",
+                            message: $"No .json files found under input '{inputPath}'."
+                        )
+                    });
 
-                // If no exception, no errors.
-                var ok = new Result(new List<Issue>());
-                WriteResult(ok, outPath);
-                return 0;
-            }
-            catch (ParsingException ex)
-            {
-                var issues = new List<Issue>();
+                    WriteResult(empty, outPath);
+                    return 2;
+                }
 
-                // Map DTDLParser errors into our stable DTO shape.
-                foreach (var err in ex.Errors)
+                modelTexts = new List<string>(capacity: jsonFiles.Count);
+                foreach (var file in jsonFiles)
                 {
-                    // ValidationID is a machine-readable code (when present).
-                    // PrimaryID is often the dtmi involved (when present).
-                    var code = SafeToString(err.ValidationID) ?? "dtdl_parse_error";
-                    var dtmi = SafeToString(err.PrimaryID);
-
-                    // We usually don't get a JSON pointer path from the parser;
-                    // keep null for now (compatible with Python DTO).
-                    issues.Add(new Issue(
-                        severity: "error",
-                        code: code,
-                        message: err.Message,
-                        dtmi: dtmi,
-                        path: null
-                    ));
+                    // Read as UTF-8; tolerate BOM etc.
+                    var text = File.ReadAllText(file, Encoding.UTF8);
+                    modelTexts.Add(text);
                 }
-
-                var result = new Result(issues);
-                WriteResult(result, outPath);
-
-                // Errors found
-                return 2;
             }
+
+            var (result, exitCode) = Validate(modelTexts);
+            WriteResult(result, outPath);
+            return exitCode;
         }
         catch (Exception ex)
         {
@@ -117,6 +97,116 @@ internal static class Program
         }
     }
 
+    private static (Result Result, int ExitCode) Validate(List<string> modelTexts)
+    {
+        var parser = new ModelParser();
+
+        try
+        {
+            // Authoritative parse/validate. If invalid, throws ParsingException.
+            _ = parser.Parse(modelTexts);
+
+            // If no exception, no errors.
+            return (new Result(new List<Issue>()), 0);
+        }
+        catch (ParsingException ex)
+        {
+            var issues = new List<Issue>();
+
+            // Map DTDLParser errors into our stable DTO shape.
+            foreach (var err in ex.Errors)
+            {
+                // ValidationID is a machine-readable code (when present).
+                // PrimaryID is often the dtmi involved (when present).
+                var code = SafeToString(err.ValidationID) ?? "dtdl_parse_error";
+                var dtmi = SafeToString(err.PrimaryID);
+
+                // We usually don't get a JSON pointer path from the parser;
+                // keep null for now (compatible with Python DTO).
+                issues.Add(new Issue(
+                    severity: "error",
+                    code: code,
+                    message: err.Message,
+                    dtmi: dtmi,
+                    path: null
+                ));
+            }
+
+            // Errors found
+            return (new Result(issues), 2);
+        }
+    }
+
+    /// <summary>
+    /// Long-lived mode: after the banner line, each request is "&lt;byte length&gt;\n"
+    /// followed by one UTF-8 JSON document; each response uses the same framing and
+    /// carries the usual { "issues": [...] } payload. Exits when stdin closes.
+    /// </summary>
+    private static int RunServer()
+    {
+        using var stdin = Console.OpenStandardInput();
+        using var stdout = Console.OpenStandardOutput();
+        WriteFrameLine(stdout, ServerBanner);
+
+        while (true)
+        {
+            var header = ReadFrameLine(stdin);
+            if (header is null)
+                return 0;
+            if (!int.TryParse(header, out var length) || length < 0)
+                return 1;
+
+            var payload = new byte[length];
+            var read = 0;
+            while (read < length)
+            {
+                var n = stdin.Read(payload, read, length - read);
+                if (n == 0)
+                    return 1;
+                read += n;
+            }
+
+            Result result;
+            try
+            {
+                (result, _) = Validate(new List<string> { Encoding.UTF8.GetString(payload) });
+            }
+            catch (Exception ex)
+            {
+                result = new Result(new List<Issue>
+                {
+                    new Issue(severity: "error", code: "tool_failure", message: ex.ToString())
+                });
+            }
+
+            var body = Encoding.UTF8.GetBytes(Serialize(result));
+            WriteFrameLine(stdout, body.Length.ToString(System.Globalization.CultureInfo.InvariantCulture));
+            stdout.Write(body, 0, body.Length);
+            stdout.Flush();
+        }
+    }
+
+    private static string? ReadFrameLine(Stream stream)
+    {
+        var buffer = new List<byte>();
+        while (true)
+        {
+            var b = stream.ReadByte();
+            if (b == -1)
+                return buffer.Count == 0 ? null : Encoding.ASCII.GetString(buffer.ToArray());
+            if (b == '\n')
+                return Encoding.ASCII.GetString(buffer.ToArray()).TrimEnd('\r');
+            buffer.Add((byte)b);
+        }
+    }
+
+    private static void WriteFrameLine(Stream stream, string line)
+    {
+        var bytes = Encoding.ASCII.GetBytes(line + "\n");
+        stream.Write(bytes, 0, bytes.Length);
+        stream.Flush();
+    }
+
     private static IEnumerable<string> DiscoverJsonFiles(string inputPath)
     {
         if (File.Exists(inputPath))
@@ -134,9 +224,8 @@ internal static class Program
         return Array.Empty<string>();
     }
 
-    private static void WriteResult(Result result, string? outPath)
-    {
-        var json = JsonSerializer.Serialize(
+    private static string Serialize(Result result)
+        => JsonSerializer.Serialize(
             result,
             new JsonSerializerOptions
             {
@@ -144,6 +233,10 @@ internal static class Program
                 PropertyNamingPolicy = JsonNamingPolicy.CamelCase
             });
 
+    private static void WriteResult(Result result, string? outPath)
+    {
+        var json = Serialize(result);
+
         if (!string.IsNullOrWhiteSpace(outPath))
         {
             File.WriteAllText(outPath, json, Encoding.UTF8);
@@ -179,9 +272,12 @@ internal static class Program
         Console.Error.WriteLine();
         Console.Error.WriteLine("Usage:");
         Console.Error.WriteLine("  Cymise.DtdlValidator.Cli --input <fileOrFolder> [--out <result.json>]");
+        Console.Error.WriteLine("  Cymise.DtdlValidator.Cli --server");
         Console.Error.WriteLine();
         Console.Error.WriteLine("Notes:");
         Console.Error.WriteLine("  --input can be a .json file or a folder (recursive *.json discovery).");
+        Console.Error.WriteLine("  --input - reads one JSON document (object or array of models) from stdin.");
+        Console.Error.WriteLine("  --server keeps the process alive and answers length-framed requests on stdio.");
         Console.Error.WriteLine("  Outputs JSON: { \"issues\": [ ... ] } to stdout unless --out is provided.");
     }
 }
@@ -0,0 +1,28 @@
+"""
+Build hook for optional compiled accelerators.
+
+Project metadata lives in pyproject.toml. When Cython is available the modules
+listed below are compiled; a failed compile is not fatal because every module has
+a pure-Python fallback. Cython is not a build requirement; to get the compiled
+modules, install it and build with ``pip install --no-build-isolation .``.
+"""
+
+from setuptools import Extension, setup
+
+_CYTHON_MODULES = [
+    ("cymise.dtdl._fastclassify", "src/cymise/dtdl/_fastclassify.pyx"),
+    ("cymise.revision_diff._walker", "src/cymise/revision_diff/_walker.pyx"),
+]
+
+try:
+    from Cython.Build import cythonize
+except ImportError:
+    ext_modules = []
+else:
+    ext_modules = cythonize(
+        [Extension(name, [source], optional=True) for name, source in _CYTHON_MODULES],
+        language_level=3,
+        quiet=True,
+    )
+
+setup(ext_modules=ext_modules)
@@ -0,0 +1,49 @@
+# cython: language_level=3, boundscheck=False, wraparound=False
+"""
+Compiled versions of the helpers in ``cymise.dtdl.classify``.
+
+Semantics match the pure-Python implementations exactly; ``classify`` imports
+these when the extension has been built and falls back otherwise.
+"""
+
+from cymise.dtdl.classify import ALLOWED_KEYS
+
+cdef frozenset _ALLOWED = ALLOWED_KEYS
+
+
+cpdef bint has_type(dict model, str expected):
+    cdef object raw_type = model.get("@type")
+    cdef object entry
+    cdef str suffix
+
+    if type(raw_type) is str:
+        return raw_type == expected or (<str>raw_type).endswith("." + expected)
+    if type(raw_type) is list:
+        suffix = "." + expected
+        for entry in <list>raw_type:
+            if type(entry) is str and (entry == expected or (<str>entry).endswith(suffix)):
+                return True
+    return False
+
+
+cpdef object first_string(object value):
+    cdef object item
+
+    if type(value) is str:
+        return value
+    if type(value) is list:
+        for item in <list>value:
+            if type(item) is str:
+                return item
+    return None
+
+
+cpdef dict filter_keys(dict item):
+    cdef dict cleaned = {}
+    cdef object key
+    cdef object value
+
+    for key, value in item.items():
+        if key in _ALLOWED:
+            cleaned[key] = value
+    return cleaned
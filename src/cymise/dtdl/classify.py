@@ -0,0 +1,60 @@
+"""
+Small classification helpers shared by the DTDL importer and exporter.
+
+These run for every content item of every model, so they resolve the value type
+once and avoid rebuilding key sets or suffix strings per call. When the optional
+``_fastclassify`` Cython extension is built (see setup.py) its compiled versions
+replace the pure-Python definitions below.
+"""
+
+from __future__ import annotations
+
+from typing import Any
+
+from .preflight import KNOWN_KEYS
+
+# Keys kept on exported models and content items.
+ALLOWED_KEYS = frozenset(KNOWN_KEYS | {"target"})
+
+_TYPE_SUFFIXES = {
+    "Interface": ".Interface",
+    "Relationship": ".Relationship",
+}
+
+
+def has_type(model: dict[str, Any], expected: str) -> bool:
+    """Return True when ``@type`` is, or lists, ``expected`` (optionally namespaced)."""
+    raw_type = model.get("@type")
+    raw_cls = type(raw_type)
+    if raw_cls is not str and raw_cls is not list:
+        return False
+
+    suffix = _TYPE_SUFFIXES.get(expected) or "." + expected
+    if raw_cls is str:
+        return raw_type == expected or raw_type.endswith(suffix)
+    for entry in raw_type:
+        if type(entry) is str and (entry == expected or entry.endswith(suffix)):
+            return True
+    return False
+
+
+def first_string(value: Any) -> str | None:
+    """Return ``value`` if it is a string, else the first string in a list."""
+    if type(value) is str:
+        return value
+    if type(value) is list:
+        for item in value:
+            if type(item) is str:
+                return item
+    return None
+
+
+def filter_keys(item: dict[str, Any]) -> dict[str, Any]:
+    """Copy ``item`` keeping only ``ALLOWED_KEYS`` (in the item's own key order)."""
+    return {k: v for k, v in item.items() if k in ALLOWED_KEYS}
+
+
+try:
+    from ._fastclassify import filter_keys, first_string, has_type  # noqa: F401, F811
+except ImportError:  # pragma: no cover - depends on optional compiled extension
+    pass
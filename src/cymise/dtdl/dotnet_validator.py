@@ -1,14 +1,26 @@
 from __future__ import annotations
 
-import json
+import atexit
+import hashlib
 import os
 import shlex
 import subprocess
+import threading
+from collections import OrderedDict
+from functools import lru_cache
 from pathlib import Path
 from typing import Any
 
+from cymise import fastjson
+from cymise.procserver import FramedProcessServer
+
 from .validation_types import Severity, ValidationIssue, ValidationResult
 
+try:
+    import xxhash
+except ImportError:  # pragma: no cover - depends on optional dependency
+    xxhash = None
+
 _PROJECT_ROOT = Path(__file__).resolve().parents[3]
 _VALIDATOR_EXE_PATH = (
     _PROJECT_ROOT
@@ -22,11 +34,35 @@ _VALIDATOR_EXE_PATH = (
 
 _DEFAULT_TIMEOUT = 60
 
+# First line printed by the validator in --server mode.
+_SERVER_BANNER = b"cymise-dtdl-validator-server/1"
+
+# Results for identical piped payloads are reused; tool failures are never cached.
+# Issues are immutable tuples, so copying the list is enough to isolate callers.
+_RESULT_CACHE_SIZE = 64
+_RESULT_CACHE: OrderedDict[bytes, ValidationResult] = OrderedDict()
+_RESULT_CACHE_LOCK = threading.Lock()
+_UNCACHEABLE_CODES = frozenset(
+    {
+        "validator_not_found",
+        "validator_timeout",
+        "validator_start_failed",
+        "validator_process_failed",
+        "invalid_validator_output",
+        "tool_failure",
+    }
+)
+
 
 def _build_command() -> list[str]:
-    env_value = os.getenv("CYMISE_DTDL_VALIDATOR_CMD")
+    return list(_build_command_cached(os.getenv("CYMISE_DTDL_VALIDATOR_CMD")))
+
+
+@lru_cache(maxsize=4)
+def _build_command_cached(env_value: str | None) -> tuple[str, ...]:
+    # Keyed on the env value so edits to CYMISE_DTDL_VALIDATOR_CMD still apply.
     if env_value:
-        return shlex.split(env_value, posix=False)
+        return tuple(shlex.split(env_value, posix=False))
 
     # Default: call the built executable directly
     try:
@@ -34,7 +70,13 @@ def _build_command() -> list[str]:
     except ValueError:
         exe_arg = str(_VALIDATOR_EXE_PATH)
 
-    return [exe_arg]
+    return (exe_arg,)
+
+
+def _as_text(raw: str | bytes | None) -> str:
+    if isinstance(raw, bytes):
+        return raw.decode("utf-8", errors="replace")
+    return raw or ""
 
 
 def _map_severity(raw: Any) -> Severity:
@@ -70,23 +112,131 @@ def _parse_issues(payload: Any) -> list[ValidationIssue]:
     return parsed
 
 
-def validate_with_dotnet(input_path: str | Path) -> ValidationResult:
+class DotnetValidatorPool(FramedProcessServer):
+    """
+    Keep one validator process warm in ``--server`` mode to avoid CLR start-up.
+
+    Executables that do not print the server banner are treated as lacking server
+    support (``supported`` becomes False) and callers fall back to per-call spawns.
+    """
+
+    def __init__(self, command: list[str], *, timeout: float = _DEFAULT_TIMEOUT):
+        super().__init__(command, banner=_SERVER_BANNER, timeout=timeout, cwd=_PROJECT_ROOT)
+
+    def validate_bytes(self, payload: bytes) -> bytes | None:
+        """
+        Send one JSON document and return the raw validator output.
+
+        Returns None when server mode is unavailable or the process died; raises
+        ``subprocess.TimeoutExpired`` when the request exceeds ``timeout``.
+        """
+        return self.request(payload)
+
+
+_POOL: DotnetValidatorPool | None = None
+_POOL_LOCK = threading.Lock()
+
+
+def _get_pool() -> DotnetValidatorPool | None:
+    """Return the shared warm validator unless disabled via CYMISE_DTDL_VALIDATOR_SERVER=0."""
+    global _POOL
+    if os.getenv("CYMISE_DTDL_VALIDATOR_SERVER", "1") == "0":
+        return None
+    command = _build_command()
+    with _POOL_LOCK:
+        if _POOL is None or _POOL.command != command:
+            if _POOL is not None:
+                _POOL.close()
+            _POOL = DotnetValidatorPool(command)
+        return _POOL
+
+
+@atexit.register
+def _close_pool() -> None:
+    if _POOL is not None:
+        _POOL.close()
+
+
+def validate_with_dotnet(
+    input_path: str | Path | None = None, *, input_bytes: bytes | None = None
+) -> ValidationResult:
     """
     Execute the .NET DTDL validator and return its findings as ValidationResult.
 
+    Pass either ``input_path`` (a file or folder) or ``input_bytes`` (one serialized
+    JSON document piped to the validator's stdin, avoiding a temp file).
+
     The function is resilient: it never raises for validation failures and will
     return a ValidationResult with an error issue if the tool cannot be executed.
     """
 
+    if (input_path is None) == (input_bytes is None):
+        raise ValueError("Provide exactly one of input_path or input_bytes.")
+
+    if input_bytes is None:
+        return _run_validator(input_path, None)
+
+    key = _payload_key(_build_command(), input_bytes)
+    with _RESULT_CACHE_LOCK:
+        cached = _RESULT_CACHE.get(key)
+        if cached is not None:
+            _RESULT_CACHE.move_to_end(key)
+            return ValidationResult(issues=list(cached.issues))
+
+    result = _run_validator(None, input_bytes)
+    if not any(issue.code in _UNCACHEABLE_CODES for issue in result.issues):
+        with _RESULT_CACHE_LOCK:
+            _RESULT_CACHE[key] = ValidationResult(issues=list(result.issues))
+            while len(_RESULT_CACHE) > _RESULT_CACHE_SIZE:
+                _RESULT_CACHE.popitem(last=False)
+    return result
+
+
+def clear_validator_cache() -> None:
+    """Drop cached validator results (e.g. after rebuilding the validator)."""
+    with _RESULT_CACHE_LOCK:
+        _RESULT_CACHE.clear()
+
+
+def _payload_key(command: list[str], payload: bytes) -> bytes:
+    hasher = xxhash.xxh3_128() if xxhash is not None else hashlib.blake2b(digest_size=16)
+    hasher.update("\0".join(command).encode("utf-8"))
+    hasher.update(b"\0")
+    hasher.update(payload)
+    return hasher.digest()
+
+
+def _run_validator(
+    input_path: str | Path | None, input_bytes: bytes | None
+) -> ValidationResult:
     result = ValidationResult()
+    if input_bytes is not None:
+        pool = _get_pool()
+        if pool is not None:
+            try:
+                output = pool.validate_bytes(input_bytes)
+            except subprocess.TimeoutExpired:
+                result.add_issue(
+                    severity="error",
+                    message="DTDL validator timed out.",
+                    code="validator_timeout",
+                )
+                return result
+            if output is not None:
+                _collect_issues(result, output)
+                return result
+
     command = _build_command()
-    command.extend(["--input", str(Path(input_path))])
+    if input_bytes is not None:
+        command.extend(["--input", "-"])
+    else:
+        command.extend(["--input", os.fspath(input_path)])
 
     try:
         completed = subprocess.run(
             command,
+            input=input_bytes,
             capture_output=True,
-            text=True,
             cwd=_PROJECT_ROOT,
             timeout=_DEFAULT_TIMEOUT,
         )
@@ -113,7 +263,7 @@ def validate_with_dotnet(input_path: str | Path) -> ValidationResult:
         return result
 
     if completed.returncode not in (0, 2):
-        stderr = completed.stderr.strip()
+        stderr = _as_text(completed.stderr).strip()
         detail = f": {stderr}" if stderr else ""
         result.add_issue(
             severity="error",
@@ -122,10 +272,15 @@ def validate_with_dotnet(input_path: str | Path) -> ValidationResult:
         )
         return result
 
+    _collect_issues(result, completed.stdout)
+    return result
+
+
+def _collect_issues(result: ValidationResult, output: str | bytes | None) -> None:
     try:
-        payload = json.loads(completed.stdout or "{}")
+        payload = fastjson.loads(output or "{}")
         result.issues.extend(_parse_issues(payload))
-    except json.JSONDecodeError as exc:
+    except fastjson.JSONDecodeError as exc:
         result.add_issue(
             severity="error",
             message=f"Failed to parse validator output: {exc.msg}",
@@ -137,5 +292,3 @@ def validate_with_dotnet(input_path: str | Path) -> ValidationResult:
             message=f"Unexpected validator output: {exc}",
             code="invalid_validator_output",
         )
-
-    return result
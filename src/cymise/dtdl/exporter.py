@@ -1,18 +1,27 @@
 from __future__ import annotations
 
-import json
+import copy
+import threading
+from collections import OrderedDict
 from dataclasses import dataclass, field
 from pathlib import Path
-from tempfile import NamedTemporaryFile
-from typing import Any
+from typing import Any, Iterable
 
+from cymise import fastjson
+from cymise.dtdl.classify import filter_keys, has_type
 from cymise.dtdl.dotnet_validator import validate_with_dotnet
-from cymise.dtdl.preflight import KNOWN_KEYS, preflight_validate
+from cymise.dtdl.preflight import preflight_validate
 from cymise.dtdl.validation_types import ValidationResult
 from cymise.graph.service import GraphService
 
 DEFAULT_CONTEXT = "dtmi:dtdl:context;3"
 
+# Recent exports keyed on (database, snapshot version, context); see
+# GraphService.snapshot_version for what invalidates an entry.
+_EXPORT_CACHE_SIZE = 4
+_EXPORT_CACHE: OrderedDict[tuple[Any, ...], list[dict[str, Any]]] = OrderedDict()
+_EXPORT_CACHE_LOCK = threading.Lock()
+
 
 @dataclass(slots=True)
 class ExportCounts:
@@ -31,59 +40,58 @@ class ExportResult:
 def export_dtdl_to_models(
     graph_service: GraphService, *, context: str | None = None
 ) -> list[dict[str, Any]]:
-    nodes = graph_service.list_nodes()
+    """
+    Build DTDL model dicts for the current graph.
+
+    Repeated exports of unchanged data are served from a small cache; callers
+    always receive their own copy and may mutate it freely.
+    """
+
+    bind = graph_service.repo.session.get_bind()
+    key = (id(bind), str(bind.url), graph_service.snapshot_version(), context)
+    with _EXPORT_CACHE_LOCK:
+        cached = _EXPORT_CACHE.get(key)
+        if cached is not None:
+            _EXPORT_CACHE.move_to_end(key)
+            return copy.deepcopy(cached)
+
+    models = _build_models(graph_service, context)
+    with _EXPORT_CACHE_LOCK:
+        _EXPORT_CACHE[key] = copy.deepcopy(models)
+        while len(_EXPORT_CACHE) > _EXPORT_CACHE_SIZE:
+            _EXPORT_CACHE.popitem(last=False)
+    return models
+
+
+def _build_models(graph_service: GraphService, context: str | None) -> list[dict[str, Any]]:
+    # One query for all twins; edges resolve their endpoints from this map instead
+    # of issuing two lookups per edge.
+    twins = list(graph_service.repo.list_twins())
+    node_map = {twin.dtmi: twin for twin in twins}
+    dtmi_by_id = {twin.id: twin.dtmi for twin in twins}
     edges = graph_service.repo.list_relationships()
-    node_map = {node.dtmi: node for node in nodes}
     edges_by_source: dict[str, list[dict[str, str | None]]] = {}
 
     for edge in edges:
-        source = graph_service.repo.get_twin_by_id(edge.source_id)
-        target = graph_service.repo.get_twin_by_id(edge.target_id)
-        if not source or not target:
+        source_dtmi = dtmi_by_id.get(edge.source_id)
+        target_dtmi = dtmi_by_id.get(edge.target_id)
+        if not source_dtmi or not target_dtmi:
             continue
-        edges_by_source.setdefault(source.dtmi, []).append(
-            {"name": edge.name, "target": target.dtmi}
+        edges_by_source.setdefault(source_dtmi, []).append(
+            {"name": edge.name, "target": target_dtmi}
         )
 
     models: list[dict[str, Any]] = []
     for dtmi, node in node_map.items():
         base_model = _load_model_document(graph_service, dtmi)
-        doc_used = base_model is not None
-        if base_model is None:
-            base_model = {"@id": dtmi, "@type": "Interface"}
-
-        base_model["@context"] = context or base_model.get("@context") or DEFAULT_CONTEXT
-        base_model["@id"] = dtmi
-        base_model["@type"] = base_model.get("@type") or "Interface"
-
-        if node.display_name:
-            base_model["displayName"] = node.display_name
-
-        contents = []
-        if isinstance(base_model.get("contents"), list):
-            contents = [
-                _sanitize_content_item(item)
-                for item in base_model["contents"]
-                if _keep_non_relationship(item)
-            ]
-        rels = []
-        for rel in edges_by_source.get(dtmi, []):
-            rels.append(
-                {
-                    "@type": "Relationship",
-                    "name": rel["name"] or "rel",
-                    "target": rel["target"],
-                }
-            )
-        base_model["contents"] = contents + rels
-
-        cleaned = _sanitize_model(base_model)
-        if cleaned is not None:
-            models.append(cleaned)
-            if doc_used:
-                # Stored on the model for caller to
-                # aggregate via counts (handled in export_dtdl)
-                cleaned["_doc_used"] = True
+        model = _build_model_dict(
+            base_model, node.display_name, dtmi, context, edges_by_source.get(dtmi, ())
+        )
+        models.append(model)
+        if base_model is not None:
+            # Stored on the model for caller to
+            # aggregate via counts (handled in export_dtdl)
+            model["_doc_used"] = True
 
     return models
 
@@ -104,105 +112,84 @@ def export_dtdl(
     if not models:
         return result
 
-    output_path = Path(output_path)
-    output_path.write_text(json.dumps(models, indent=2), encoding="utf-8")
+    with open(output_path, "wb") as fh:
+        fh.write(fastjson.dumps(models, indent=True))
     result.counts.files_written = 1
 
     # Validation aggregation (non-raising)
     preflight = preflight_validate(models)
     result.validation.issues.extend(preflight.issues)
 
-    with NamedTemporaryFile(mode="w+", suffix=".json", delete=True, encoding="utf-8") as tmp:
-        json.dump(models, tmp)
-        tmp.flush()
-        dotnet = validate_with_dotnet(Path(tmp.name))
+    dotnet = validate_with_dotnet(input_bytes=fastjson.dumps(models))
     result.validation.issues.extend(dotnet.issues)
 
-    error_dtmis = {
-        issue.model_id
-        for issue in result.validation.issues
-        if issue.severity == "error" and issue.model_id
-    }
-    result.counts.invalid_models = (
-        len(error_dtmis)
-        if error_dtmis
-        else len([i for i in result.validation.issues if i.severity == "error"])
-    )
+    error_dtmis, error_count = result.validation.error_summary()
+    result.counts.invalid_models = len(error_dtmis) or error_count
 
     return result
 
 
 def _load_model_document(graph_service: GraphService, dtmi: str) -> dict[str, Any] | None:
+    # The parsed payload is freshly decoded and only read by _build_model_dict,
+    # so it is returned without copying.
     doc = graph_service.get_model_document(dtmi)
     if not doc:
         return None
     try:
-        payload = json.loads(doc.content)
-    except json.JSONDecodeError:
+        payload = fastjson.loads(doc.content)
+    except fastjson.JSONDecodeError:
         return None
 
     if isinstance(payload, dict):
         if payload.get("@id") == dtmi:
-            return dict(payload)
+            return payload
         return None
 
     if isinstance(payload, list):
         for item in payload:
             if isinstance(item, dict) and item.get("@id") == dtmi:
-                return dict(item)
+                return item
     return None
 
 
-def _has_type(model: dict[str, Any], expected: str) -> bool:
-    raw_type = model.get("@type")
-    if isinstance(raw_type, str):
-        return raw_type == expected or raw_type.endswith("." + expected)
-    if isinstance(raw_type, list):
-        return any(
-            isinstance(t, str) and (t == expected or t.endswith("." + expected))
-            for t in raw_type
-        )
-    return False
-
-
-def _sanitize_content_item(item: Any) -> dict[str, Any]:
-    if not isinstance(item, dict):
-        return {}
-
-    allowed_keys = KNOWN_KEYS | {"target"}
-    cleaned = {k: v for k, v in item.items() if k in allowed_keys}
-
-    # Only keep if there is a type and it is not a relationship (relationships are rebuilt)
-    if _has_type(cleaned, "Relationship"):
-        return {}
-    return cleaned
-
-
-def _sanitize_model(model: dict[str, Any]) -> dict[str, Any] | None:
-    allowed_keys = KNOWN_KEYS | {"target"}
-    cleaned = {k: v for k, v in model.items() if k in allowed_keys or k in ("@context", "@id")}
-    contents = cleaned.get("contents")
-    if contents and isinstance(contents, list):
-        new_contents: list[dict[str, Any]] = []
-        for item in contents:
-            if not isinstance(item, dict):
-                continue
-            rel_clean = {k: v for k, v in item.items() if k in allowed_keys}
-            if _has_type(rel_clean, "Relationship"):
-                if "target" not in rel_clean or "name" not in rel_clean:
-                    continue
-                new_contents.append(
-                    {
-                        "@type": "Relationship",
-                        "name": rel_clean.get("name") or "rel",
-                        "target": rel_clean.get("target"),
-                    }
-                )
-            else:
-                new_contents.append(rel_clean)
-        cleaned["contents"] = new_contents
-    return cleaned if cleaned else None
+def _build_model_dict(
+    base: dict[str, Any] | None,
+    display_name: str | None,
+    dtmi: str,
+    context: str | None,
+    rels: Iterable[dict[str, str | None]],
+) -> dict[str, Any]:
+    """
+    Build one sanitized export model in a single new dict.
+
+    Allowed keys keep the source document's order; overridden keys that were absent
+    are appended in the order @context, @type, displayName, contents. Stored
+    relationships are dropped and rebuilt from the graph edges.
+    """
+
+    if base is None:
+        base = {"@id": dtmi, "@type": "Interface"}
+
+    model = filter_keys(base)
+    model["@context"] = context or base.get("@context") or DEFAULT_CONTEXT
+    model["@id"] = dtmi
+    model["@type"] = base.get("@type") or "Interface"
+    if display_name:
+        model["displayName"] = display_name
+
+    source_contents = base.get("contents")
+    contents = (
+        [filter_keys(item) for item in source_contents if _keep_non_relationship(item)]
+        if isinstance(source_contents, list)
+        else []
+    )
+    contents.extend(
+        {"@type": "Relationship", "name": rel["name"] or "rel", "target": rel["target"]}
+        for rel in rels
+    )
+    model["contents"] = contents
+    return model
 
 
 def _keep_non_relationship(item: Any) -> bool:
-    return isinstance(item, dict) and not _has_type(item, "Relationship")
+    return isinstance(item, dict) and not has_type(item, "Relationship")
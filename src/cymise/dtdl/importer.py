@@ -1,16 +1,22 @@
 from __future__ import annotations
 
-import json
+import os
+from collections import defaultdict, deque
+from concurrent.futures import Future, ThreadPoolExecutor
 from dataclasses import dataclass, field
 from pathlib import Path
-from tempfile import NamedTemporaryFile
-from typing import Any, Iterable
+from typing import Any, Iterable, Iterator
 
+from cymise import fastjson
+from cymise.dtdl.classify import first_string, has_type
 from cymise.dtdl.dotnet_validator import validate_with_dotnet
 from cymise.dtdl.preflight import preflight_validate
 from cymise.dtdl.validation_types import ValidationIssue, ValidationResult
 from cymise.graph.service import GraphService
 
+# File reads release the GIL, so threads overlap well.
+_PARSE_WORKERS = min(32, (os.cpu_count() or 1) * 4)
+
 
 @dataclass(slots=True)
 class ImportCounts:
@@ -37,13 +43,14 @@ def import_dtdl(input_path: str | Path, graph_service: GraphService) -> ImportRe
     """
 
     result = ImportResult()
-    root = Path(input_path)
-    files: list[Path] = []
-
-    if root.is_dir():
-        files = list(root.rglob("*.json"))
-    elif root.is_file():
-        files = [root]
+    root = os.fspath(input_path)
+    parsed: Iterable[tuple[str, Any, Exception | None]]
+
+    if os.path.isdir(root):
+        # Files are discovered lazily and parsed while the walk continues.
+        parsed = _parse_files(_iter_json_files(root))
+    elif os.path.isfile(root):
+        parsed = [_parse_file(root)]
     else:
         result.validation.add_issue(
             severity="error",
@@ -53,30 +60,25 @@ def import_dtdl(input_path: str | Path, graph_service: GraphService) -> ImportRe
         result.counts.invalid_models += 1
         return result
 
-    result.counts.files_scanned = len(files)
-
     models: list[dict[str, Any]] = []
-    model_sources: list[tuple[str, dict[str, Any]]] = []
 
-    for file_path in files:
-        try:
-            raw_text = file_path.read_text(encoding="utf-8")
-            payload = json.loads(raw_text)
-        except FileNotFoundError:
+    for file_path, payload, error in parsed:
+        result.counts.files_scanned += 1
+        if isinstance(error, FileNotFoundError):
             result.validation.add_issue(
                 severity="error",
                 message=f"Model file not found: {file_path}",
                 code="file_not_found",
-                path=str(file_path),
+                path=file_path,
             )
             result.counts.invalid_models += 1
             continue
-        except json.JSONDecodeError as exc:
+        if isinstance(error, fastjson.JSONDecodeError):
             result.validation.add_issue(
                 severity="error",
-                message=f"Invalid JSON in {file_path}: {exc.msg}",
+                message=f"Invalid JSON in {file_path}: {error.msg}",
                 code="invalid_json",
-                path=str(file_path),
+                path=file_path,
             )
             result.counts.invalid_models += 1
             continue
@@ -93,7 +95,7 @@ def import_dtdl(input_path: str | Path, graph_service: GraphService) -> ImportRe
                 severity="error",
                 message=f"Root JSON in {file_path} must be an object or array.",
                 code="invalid_root",
-                path=str(file_path),
+                path=file_path,
             )
             result.counts.invalid_models += 1
             continue
@@ -101,14 +103,13 @@ def import_dtdl(input_path: str | Path, graph_service: GraphService) -> ImportRe
         for item in entries:
             if isinstance(item, dict):
                 models.append(item)
-                model_sources.append((raw_text, item))
                 result.counts.models_loaded += 1
             else:
                 result.validation.add_issue(
                     severity="error",
                     message=f"Encountered non-object model in {file_path}.",
                     code="invalid_model_shape",
-                    path=str(file_path),
+                    path=file_path,
                 )
                 result.counts.invalid_models += 1
 
@@ -134,107 +135,139 @@ def import_dtdl(input_path: str | Path, graph_service: GraphService) -> ImportRe
     preflight_result = preflight_validate(models)
     result.validation.issues.extend(preflight_result.issues)
 
-    # .NET validation (batch via temp file)
-    with NamedTemporaryFile(mode="w+", suffix=".json", delete=True, encoding="utf-8") as tmp:
-        json.dump(models, tmp)
-        tmp.flush()
-        dotnet_result = validate_with_dotnet(Path(tmp.name))
+    # .NET validation (batch piped over stdin)
+    dotnet_result = validate_with_dotnet(input_bytes=fastjson.dumps(models))
     result.validation.issues.extend(dotnet_result.issues)
 
     # Track invalid models based on validation results
-    error_dtmis = {
-        issue.model_id
-        for issue in result.validation.issues
-        if issue.severity == "error" and issue.model_id
-    }
+    error_dtmis, _ = result.validation.error_summary()
     result.counts.invalid_models += len(error_dtmis)
 
-    # Upsert ModelDocuments for DTMI-bearing models
-    for raw_text, model in model_sources:
-        dtmi = model.get("@id")
-        if not isinstance(dtmi, str):
-            continue
-        graph_service.repo.upsert_model_document(
-            name=str(model.get("displayName") or dtmi),
-            content=raw_text,
-            dtmi=dtmi,
+    issues_by_id: dict[str, list[ValidationIssue]] = defaultdict(list)
+    for issue in result.validation.issues:
+        if issue.model_id:
+            issues_by_id[issue.model_id].append(issue)
+
+    # Documents, twins and edges are written in one transaction, so a failure part
+    # way through leaves the store as it was before the import.
+    with graph_service.repo.transaction():
+        # Upsert ModelDocuments for DTMI-bearing models
+        document_rows: list[dict[str, Any]] = []
+        for model in models:
+            dtmi = model.get("@id")
+            if not isinstance(dtmi, str):
+                continue
+            document_rows.append(
+                {
+                    "name": str(model.get("displayName") or dtmi),
+                    "content": fastjson.dumps(model).decode("utf-8"),
+                    "dtmi": dtmi,
+                }
+            )
+        result.counts.model_documents_upserted += graph_service.repo.upsert_model_documents(
+            document_rows
         )
-        result.counts.model_documents_upserted += 1
 
-    interface_dtmis = {
-        dtmi for dtmi, model in dtmi_to_model.items() if _has_type(model, "Interface")
-    }
+        interface_dtmis = {
+            dtmi for dtmi, model in dtmi_to_model.items() if has_type(model, "Interface")
+        }
+
+        # Create/update interface nodes together with their validation payloads
+        twin_rows: list[dict[str, Any]] = []
+        for dtmi in interface_dtmis:
+            model = dtmi_to_model[dtmi]
+            node_issues = issues_by_id.get(dtmi, [])
+            twin_rows.append(
+                {
+                    "dtmi": dtmi,
+                    "display_name": first_string(model.get("displayName")),
+                    "validation": _issues_payload(node_issues),
+                }
+            )
+        twin_ids = graph_service.repo.upsert_twins(twin_rows)
+        result.counts.interface_nodes_upserted += len(twin_rows)
+
+        # Create relationship edges (only between imported dtmis)
+        edge_rows: list[dict[str, Any]] = []
+        for dtmi in interface_dtmis:
+            model = dtmi_to_model[dtmi]
+            contents = model.get("contents") or []
+            if not isinstance(contents, list):
+                continue
+            for item in contents:
+                if not isinstance(item, dict):
+                    continue
+                if not has_type(item, "Relationship"):
+                    continue
+                target = item.get("target")
+                if not isinstance(target, str):
+                    continue
+                if target not in interface_dtmis:
+                    result.counts.edges_skipped_missing_target += 1
+                    continue
+                edge_rows.append(
+                    {
+                        "source_id": twin_ids[dtmi],
+                        "target_id": twin_ids[target],
+                        "name": first_string(item.get("name")),
+                    }
+                )
+        result.counts.relationship_edges_created += graph_service.repo.add_relationships(
+            edge_rows
+        )
 
-    # Create/update interface nodes
-    for dtmi in interface_dtmis:
-        model = dtmi_to_model[dtmi]
-        display_name = _first_string(model.get("displayName"))
-        if graph_service.get_node(dtmi):
-            graph_service.update_twin(dtmi, display_name=display_name)
-        else:
-            graph_service.create_twin(dtmi, display_name=display_name)
-        result.counts.interface_nodes_upserted += 1
+    return result
 
-        node_issues = [issue for issue in result.validation.issues if issue.model_id == dtmi]
-        graph_service.set_node_validation(dtmi, _issues_payload(node_issues))
 
-    # Create relationship edges (only between imported dtmis)
-    for dtmi in interface_dtmis:
-        model = dtmi_to_model[dtmi]
-        contents = model.get("contents") or []
-        if not isinstance(contents, list):
+def _iter_json_files(root: str) -> Iterator[str]:
+    """Yield ``*.json`` file paths under ``root`` using scandir, without Path objects."""
+    stack = [root]
+    while stack:
+        try:
+            with os.scandir(stack.pop()) as entries:
+                for entry in entries:
+                    if entry.is_dir(follow_symlinks=False):
+                        stack.append(entry.path)
+                    elif os.path.normcase(entry.name).endswith(".json") and entry.is_file():
+                        yield entry.path
+        except OSError:
+            # Unreadable directories are skipped, as Path.rglob does.
             continue
-        for item in contents:
-            if not isinstance(item, dict):
-                continue
-            if not _has_type(item, "Relationship"):
-                continue
-            target = item.get("target")
-            if not isinstance(target, str):
-                continue
-            if target not in interface_dtmis:
-                result.counts.edges_skipped_missing_target += 1
-                continue
-            name = _first_string(item.get("name"))
-            graph_service.create_relationship(dtmi, target, name=name)
-            result.counts.relationship_edges_created += 1
 
-    return result
 
+def _parse_files(paths: Iterable[str]) -> Iterator[tuple[str, Any, Exception | None]]:
+    """Parse files on a thread pool, yielding ``(path, payload, error)`` in input order."""
+    with ThreadPoolExecutor(max_workers=_PARSE_WORKERS) as executor:
+        pending: deque[Future[tuple[str, Any, Exception | None]]] = deque()
+        for path in paths:
+            pending.append(executor.submit(_parse_file, path))
+            # Bound the read-ahead so huge trees do not queue every file at once.
+            if len(pending) >= _PARSE_WORKERS * 2:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
 
-def _has_type(model: dict[str, Any], expected: str) -> bool:
-    raw_type = model.get("@type")
-    if isinstance(raw_type, str):
-        return raw_type == expected or raw_type.endswith("." + expected)
-    if isinstance(raw_type, list):
-        return any(
-            isinstance(t, str) and (t == expected or t.endswith("." + expected))
-            for t in raw_type
-        )
-    return False
+
+def _parse_file(file_path: str) -> tuple[str, Any, Exception | None]:
+    try:
+        return file_path, _read_payload(file_path), None
+    except (FileNotFoundError, fastjson.JSONDecodeError) as exc:
+        return file_path, None, exc
 
 
-def _first_string(value: Any) -> str | None:
-    if isinstance(value, str):
-        return value
-    if isinstance(value, list):
-        for item in value:
-            if isinstance(item, str):
-                return item
-    return None
+def _read_payload(file_path: str) -> Any:
+    """
+    Parse one model file in a single in-memory parse.
+
+    Validation is cross-model, so every model is held at once anyway; streaming
+    array items would only slow the parse down.
+    """
+    with open(file_path, "rb") as fh:
+        return fastjson.loads(fh.read())
 
 
 def _issues_payload(issues: list[ValidationIssue]) -> dict[str, Any]:
     return {
-        "issues": [
-            {
-                "severity": issue.severity,
-                "message": issue.message,
-                "model_id": issue.model_id,
-                "path": issue.path,
-                "code": issue.code,
-            }
-            for issue in issues
-        ],
+        "issues": [issue._asdict() for issue in issues],
         "is_ok": not any(issue.severity == "error" for issue in issues),
     }
@@ -6,9 +6,17 @@ from typing import Any, Iterable
 
 from .validation_types import ValidationResult
 
+try:
+    import re2
+except ImportError:  # pragma: no cover - depends on optional dependency
+    re2 = None
+
 # Simple DTMI shape: dtmi:<path>;<version>
 DTMI_PATTERN = re.compile(r"^dtmi:[A-Za-z0-9_:]+;[1-9][0-9]*$")
 
+# Linear-time automaton for the id checks when google-re2 is installed.
+_DTMI_RE2 = re2.compile(DTMI_PATTERN.pattern) if re2 is not None else None
+
 # Known top-level Interface keys for a light-weight check.
 KNOWN_KEYS = {
     "@id",
@@ -38,7 +46,6 @@ def preflight_validate(models: Iterable[Any]) -> ValidationResult:
     """
 
     result = ValidationResult()
-    parsed_models: list[dict[str, Any]] = []
 
     if models is None:
         result.add_issue(
@@ -61,35 +68,38 @@ def preflight_validate(models: Iterable[Any]) -> ValidationResult:
         )
         return result
 
-    for idx, model in iterator:
+    dtmi_match = (_DTMI_RE2 or DTMI_PATTERN).match
+    id_to_index: dict[str, int] = {}
+    # Paths index the models that parsed to dicts, skipping rejected entries.
+    parsed_idx = -1
+
+    for input_idx, model in iterator:
         if isinstance(model, str):
             try:
                 model = json.loads(model)
             except json.JSONDecodeError as exc:
                 result.add_issue(
                     severity="error",
-                    message=f"Model at index {idx} is not valid JSON: {exc.msg}",
-                    path=f"[{idx}]",
+                    message=f"Model at index {input_idx} is not valid JSON: {exc.msg}",
+                    path=f"[{input_idx}]",
                 )
                 continue
         if not isinstance(model, dict):
             result.add_issue(
                 severity="error",
-                message=f"Model at index {idx} must be a dict.",
-                path=f"[{idx}]",
+                message=f"Model at index {input_idx} must be a dict.",
+                path=f"[{input_idx}]",
             )
             continue
-        parsed_models.append(model)
 
-    id_to_index: dict[str, int] = {}
-
-    for idx, model in enumerate(parsed_models):
+        parsed_idx += 1
         model_id = model.get("@id")
-        path = f"[{idx}]"
+        path = f"[{parsed_idx}]"
+        keys = model.keys()
 
         # Required keys
-        for key in REQUIRED_KEYS:
-            if key not in model:
+        if not REQUIRED_KEYS <= keys:
+            for key in sorted(REQUIRED_KEYS - keys):
                 result.add_issue(
                     severity="error",
                     message=f"Missing required key '{key}'.",
@@ -100,7 +110,7 @@ def preflight_validate(models: Iterable[Any]) -> ValidationResult:
 
         # DTMI sanity
         if isinstance(model_id, str):
-            if not DTMI_PATTERN.match(model_id):
+            if dtmi_match(model_id) is None:
                 result.add_issue(
                     severity="error",
                     message="Invalid DTMI format (expected dtmi:<path>;<version>).",
@@ -119,7 +129,7 @@ def preflight_validate(models: Iterable[Any]) -> ValidationResult:
                     code="duplicate_id",
                 )
             else:
-                id_to_index[model_id] = idx
+                id_to_index[model_id] = parsed_idx
         elif model_id is not None:
             result.add_issue(
                 severity="error",
@@ -173,15 +183,16 @@ def preflight_validate(models: Iterable[Any]) -> ValidationResult:
                 code="invalid_contents_type",
             )
 
-        # Unknown/custom keys -> warnings
-        for key in model.keys():
-            if key not in KNOWN_KEYS:
-                result.add_issue(
-                    severity="warning",
-                    message=f"Unknown key '{key}' detected.",
-                    model_id=model_id,
-                    path=path,
-                    code="unknown_key",
-                )
+        # Unknown/custom keys -> warnings (subset test first; most models are clean)
+        if not keys <= KNOWN_KEYS:
+            for key in keys:
+                if key not in KNOWN_KEYS:
+                    result.add_issue(
+                        severity="warning",
+                        message=f"Unknown key '{key}' detected.",
+                        model_id=model_id,
+                        path=path,
+                        code="unknown_key",
+                    )
 
     return result
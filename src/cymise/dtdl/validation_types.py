@@ -1,14 +1,19 @@
 from __future__ import annotations
 
 from dataclasses import dataclass, field
-from typing import Literal, Optional
+from typing import Literal, NamedTuple, Optional
 
 Severity = Literal["error", "warning"]
 
 
-@dataclass(slots=True)
-class ValidationIssue:
-    """Single validation finding produced by pre-flight checks."""
+class ValidationIssue(NamedTuple):
+    """
+    Single validation finding produced by pre-flight checks.
+
+    A NamedTuple rather than a dataclass: validator runs can yield thousands of
+    issues and tuples are cheaper to build and hold. Issues are immutable; use
+    ``_replace`` to derive a modified copy.
+    """
 
     severity: Severity
     message: str
@@ -35,6 +40,17 @@ class ValidationResult:
     def is_ok(self) -> bool:
         return not self.errors
 
+    def error_summary(self) -> tuple[set[str], int]:
+        """Return the model ids with errors and the total error count in one pass."""
+        model_ids: set[str] = set()
+        count = 0
+        for issue in self.issues:
+            if issue.severity == "error":
+                count += 1
+                if issue.model_id:
+                    model_ids.add(issue.model_id)
+        return model_ids, count
+
     def add_issue(
         self,
         severity: Severity,
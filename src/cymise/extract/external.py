@@ -0,0 +1,112 @@
+"""
+Invocation of external extractor commands (FreeCAD/KiCad CLIs).
+
+By default every extraction spawns the configured command once per file. Setting
+``CYMISE_EXTRACT_SERVER=1`` opts into a persistent worker instead: the command is
+started once with ``--server``, must print ``cymise-extractor-server/1``, and then
+receives each file path as a framed request (see ``cymise.procserver``) and
+answers with a framed JSON document. An empty response signals a failed
+extraction. Commands that do not speak the protocol fall back to per-file spawns.
+"""
+
+from __future__ import annotations
+
+import atexit
+import os
+import shlex
+import shutil
+import subprocess
+import threading
+from functools import lru_cache
+from typing import Optional
+
+from cymise.procserver import FramedProcessServer
+
+_SERVER_BANNER = b"cymise-extractor-server/1"
+
+_SERVERS: dict[tuple[str, ...], FramedProcessServer] = {}
+_SERVERS_LOCK = threading.Lock()
+
+
+def run_extractor(
+    command: list[str], file_path: str, *, timeout: float = 30
+) -> subprocess.CompletedProcess:
+    """
+    Run ``command`` on ``file_path`` and return its output as bytes.
+
+    Raises ``subprocess.TimeoutExpired`` and ``OSError`` like ``subprocess.run``.
+    """
+    server = _get_server(command, timeout)
+    if server is not None:
+        body = server.request(os.fsencode(file_path))
+        if body is not None:
+            return subprocess.CompletedProcess(
+                command, 0 if body else 1, stdout=body, stderr=b""
+            )
+
+    return subprocess.run(
+        command + [file_path],
+        capture_output=True,
+        text=False,
+        timeout=timeout,
+        check=False,
+    )
+
+
+def split_command(value: str) -> list[str]:
+    """``shlex.split`` for command strings from the environment, memoized per value."""
+    return list(_split_command(value))
+
+
+def find_executable(candidates: tuple[str, ...]) -> Optional[str]:
+    """
+    Return the first of ``candidates`` found on PATH.
+
+    Results are memoized per PATH value so batch extraction does not rescan PATH
+    for every file; call ``reset_command_cache`` after installing a tool.
+    """
+    return _find_executable(candidates, os.getenv("PATH"))
+
+
+def reset_command_cache() -> None:
+    """Forget memoized command lookups (e.g. after changing PATH contents)."""
+    _split_command.cache_clear()
+    _find_executable.cache_clear()
+
+
+@lru_cache(maxsize=8)
+def _split_command(value: str) -> tuple[str, ...]:
+    return tuple(shlex.split(value))
+
+
+@lru_cache(maxsize=8)
+def _find_executable(candidates: tuple[str, ...], _path_env: Optional[str]) -> Optional[str]:
+    for candidate in candidates:
+        found = shutil.which(candidate)
+        if found:
+            return found
+    return None
+
+
+def shutdown_extractor_servers() -> None:
+    """Stop any persistent extractor processes."""
+    with _SERVERS_LOCK:
+        servers = list(_SERVERS.values())
+        _SERVERS.clear()
+    for server in servers:
+        server.close()
+
+
+atexit.register(shutdown_extractor_servers)
+
+
+def _get_server(command: list[str], timeout: float) -> FramedProcessServer | None:
+    if os.getenv("CYMISE_EXTRACT_SERVER", "0") != "1":
+        return None
+    key = tuple(command)
+    with _SERVERS_LOCK:
+        server = _SERVERS.get(key)
+        if server is None:
+            server = FramedProcessServer(command, banner=_SERVER_BANNER, timeout=timeout)
+            _SERVERS[key] = server
+    return server if server.supported else None
@@ -1,15 +1,16 @@
 from __future__ import annotations
 
-import json
-import shlex
-import shutil
-import subprocess
+import os
 from dataclasses import dataclass, field
 from pathlib import Path
 from typing import Any, Optional
 
+from cymise import fastjson
+from cymise.extract.external import find_executable, run_extractor, split_command
 from cymise.graph.service import GraphService
 
+_CONTAINERS = (dict, list)
+
 
 @dataclass(slots=True)
 class ExtractResult:
@@ -20,18 +21,49 @@ class ExtractResult:
 
 
 def find_dt_keys(data: Any) -> set[str]:
+    """
+    Collect every ``dt_*`` dict key anywhere in a nested dict/list structure.
+
+    Walks iteratively and visits each container once, so aliased sub-trees are not
+    re-scanned and deep or self-referencing payloads cannot exhaust the stack.
+    """
     keys: set[str] = set()
-    if isinstance(data, dict):
-        for k, v in data.items():
-            if isinstance(k, str) and k.startswith("dt_"):
-                keys.add(k)
-            keys.update(find_dt_keys(v))
-    elif isinstance(data, list):
-        for item in data:
-            keys.update(find_dt_keys(item))
+    if not isinstance(data, _CONTAINERS):
+        return keys
+    seen: set[int] = set()
+    stack = [data]
+    while stack:
+        node = stack.pop()
+        if id(node) in seen:
+            continue
+        seen.add(id(node))
+        if isinstance(node, dict):
+            try:
+                for k, v in node.items():
+                    # Slice equality is cheaper than isinstance + startswith; parsed
+                    # JSON only has string keys.
+                    if k[:3] == "dt_":
+                        keys.add(k)
+                    if isinstance(v, _CONTAINERS):
+                        stack.append(v)
+            except TypeError:
+                # Non-string keys can only come from dicts built in Python.
+                for k, v in node.items():
+                    if isinstance(k, str) and k.startswith("dt_"):
+                        keys.add(k)
+                    if isinstance(v, _CONTAINERS):
+                        stack.append(v)
+        else:
+            stack.extend([item for item in node if isinstance(item, _CONTAINERS)])
     return keys
 
 
+def _as_text(raw: str | bytes | None) -> str:
+    if isinstance(raw, bytes):
+        return raw.decode("utf-8", errors="replace")
+    return raw or ""
+
+
 def extract_freecad(
     graph_service: GraphService, file_id: int, *, fail_silently: bool = True
 ) -> ExtractResult:
@@ -53,28 +85,25 @@ def extract_freecad(
     cmd = _build_command()
     if cmd:
         try:
-            completed = subprocess.run(
-                cmd + [str(file_path)],
-                capture_output=True,
-                text=True,
-                timeout=30,
-                check=False,
-            )
+            # Output stays as bytes and goes straight to the JSON parser, skipping
+            # a full text decode of potentially large trees.
+            completed = run_extractor(cmd, str(file_path), timeout=30)
             tool_info["mode"] = "headless"
             if completed.returncode == 0 and completed.stdout:
-                tree = json.loads(completed.stdout)
-                dt_keys.update(find_dt_keys(tree))
+                tree = fastjson.loads(completed.stdout)
             else:
-                errors.append(completed.stderr or "FreeCAD command failed.")
+                errors.append(_as_text(completed.stderr) or "FreeCAD command failed.")
         except Exception as exc:
             errors.append(f"FreeCAD invocation failed: {exc}")
 
+    # Single walk over whichever tree survived (headless output or fallback skeleton)
     dt_keys.update(find_dt_keys(tree))
+    sorted_keys = sorted(dt_keys)
     dto = {
         "file_id": file_id,
         "path": str(file_path),
         "tree": tree,
-        "dt_keys": sorted(dt_keys),
+        "dt_keys": sorted_keys,
         "tool": tool_info,
     }
     if errors:
@@ -93,7 +122,7 @@ def extract_freecad(
         ok=not errors,
         message="Extraction complete" if not errors else "Extraction completed with errors",
         extracted_object_id=extracted.id,
-        dt_keys=sorted(dt_keys),
+        dt_keys=list(sorted_keys),
     )
 
 
@@ -101,24 +130,14 @@ def _build_command() -> Optional[list[str]]:
     env_cmd = _env_cmd()
     if env_cmd:
         return env_cmd
-    for candidate in ("FreeCADCmd", "freecadcmd", "FreeCAD", "freecad"):
-        found = shutil.which(candidate)
-        if found:
-            return [found]
+    found = find_executable(("FreeCADCmd", "freecadcmd", "FreeCAD", "freecad"))
+    if found:
+        return [found]
     return None
 
 
 def _env_cmd() -> Optional[list[str]]:
-    value = _get_env("CYMISE_FREECAD_EXTRACT_CMD")
+    value = os.getenv("CYMISE_FREECAD_EXTRACT_CMD")
     if value:
-        return shlex.split(value)
+        return split_command(value)
     return None
-
-
-def _get_env(name: str) -> Optional[str]:
-    try:
-        import os
-
-        return os.getenv(name)
-    except Exception:
-        return None
@@ -1,24 +1,30 @@
 from __future__ import annotations
 
-import json
+import mmap
+import os
 import re
-import shlex
-import shutil
-import subprocess
-from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Any, Optional
+from typing import Iterator, Optional
 
-from cymise.extract.freecad_extractor import find_dt_keys
+from cymise import fastjson
+from cymise.extract.external import run_extractor, split_command
+from cymise.extract.freecad_extractor import ExtractResult, _as_text, find_dt_keys
 from cymise.graph.service import GraphService
 
-
-@dataclass(slots=True)
-class ExtractResult:
-    ok: bool
-    message: str
-    extracted_object_id: Optional[int] = None
-    dt_keys: list[str] = field(default_factory=list)
+# Patterns used on every native parse; compiled once so each call goes straight to
+# the bound pattern methods instead of the re module cache. They are bytes
+# patterns so they can scan a memory-mapped file without decoding it.
+_RE_COMP_HEAD = re.compile(rb"\(comp\s")
+_RE_REF = re.compile(rb"\(ref\s+([^)]+)\)")
+_RE_VALUE = re.compile(rb"\(value\s+([^)]+)\)")
+_RE_FOOTPRINT = re.compile(rb"\(footprint\s+([^)]+)\)")
+_RE_MODULE_HEAD = re.compile(rb"\(module\s")
+_RE_MOD_REF = re.compile(rb"reference\s+([A-Za-z0-9]+)")
+_RE_MOD_VAL = re.compile(rb"value\s+([A-Za-z0-9\-\+\.]+)")
+_RE_NET = re.compile(rb"\(net\s+(\d+)\s+\"([^\"]+)\"\)")
+_RE_DT = re.compile(rb"dt_[A-Za-z0-9_\-]+")
+# Characters that affect s-expression nesting: parens, string quotes, escapes.
+_RE_SEXP_DELIM = re.compile(rb'[()"\\]')
 
 
 def extract_kicad(
@@ -52,20 +58,14 @@ def extract_kicad(
     ext_cmd = _env_command()
     if ext_cmd:
         try:
-            completed = subprocess.run(
-                ext_cmd + [str(file_path)],
-                capture_output=True,
-                text=True,
-                timeout=30,
-                check=False,
-            )
+            completed = run_extractor(ext_cmd, str(file_path), timeout=30)
             if completed.returncode == 0 and completed.stdout:
-                payload = json.loads(completed.stdout)
+                payload = fastjson.loads(completed.stdout)
                 if isinstance(payload, dict):
                     data.update(payload)
                     tool_info["mode"] = "external"
             else:
-                errors.append(completed.stderr or "External KiCad extractor failed.")
+                errors.append(_as_text(completed.stderr) or "External KiCad extractor failed.")
         except Exception as exc:
             errors.append(f"External KiCad extractor failed: {exc}")
 
@@ -74,8 +74,8 @@ def extract_kicad(
             parsed = _parse_kicad_file(file_path)
             data["components"] = parsed["components"]
             data["nets"] = parsed["nets"]
-            # Merge dt_keys
-            data["dt_keys"] = sorted(set(parsed["dt_keys"]))
+            # Already unique and sorted; merged with walked keys below
+            data["dt_keys"] = parsed["dt_keys"]
         except Exception as exc:
             msg = f"Native parse failed: {exc}"
             if fail_silently:
@@ -86,7 +86,8 @@ def extract_kicad(
     # Aggregate dt_keys regardless of source
     dt_keys = set(data.get("dt_keys") or [])
     dt_keys.update(find_dt_keys(data))
-    data["dt_keys"] = sorted(dt_keys)
+    sorted_keys = sorted(dt_keys)
+    data["dt_keys"] = sorted_keys
     if errors:
         data["errors"] = errors
 
@@ -104,7 +105,7 @@ def extract_kicad(
         ok=ok_flag,
         message="Extraction complete" if ok_flag else "Extraction completed with errors",
         extracted_object_id=extracted.id,
-        dt_keys=sorted(dt_keys),
+        dt_keys=list(sorted_keys),
     )
 
 
@@ -118,73 +119,122 @@ def _detect_type(path: Path) -> str:
 
 
 def _env_command() -> Optional[list[str]]:
-    value = _get_env("CYMISE_KICAD_EXTRACT_CMD")
+    value = os.getenv("CYMISE_KICAD_EXTRACT_CMD")
     if not value:
         return None
-    return shlex.split(value)
-
+    return split_command(value)
 
-def _get_env(name: str) -> Optional[str]:
-    try:
-        import os
 
-        return os.getenv(name)
-    except Exception:
-        return None
+def _parse_kicad_file(path: Path) -> dict:
+    # Scan the file through a read-only memory map with bytes patterns; only the
+    # small captured groups are decoded.
+    with open(path, "rb") as fh:
+        if os.fstat(fh.fileno()).st_size == 0:
+            return _parse_kicad_bytes(b"")
+        with mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ) as text:
+            return _parse_kicad_bytes(text)
 
 
-def _parse_kicad_file(path: Path) -> dict:
-    text = path.read_text(encoding="utf-8", errors="ignore")
+def _parse_kicad_bytes(text: bytes | mmap.mmap) -> dict:
     components = _parse_components(text)
     nets = _parse_nets(text)
-    dt_keys = set()
-    for comp in components:
-        dt_keys.update(find_dt_keys(comp))
-    dt_keys.update(find_dt_keys(nets))
-    # Scan raw text for dt_ keys to catch schematic properties
-    for match in re.finditer(r"dt_[A-Za-z0-9_\-]+", text):
-        dt_keys.add(match.group(0))
+    # One scan of the raw text catches every dt_ token, including those inside
+    # component blocks and schematic properties; extract_kicad walks the assembled
+    # structure once more for keys the regex cannot see.
+    dt_keys = {_decode(key) for key in set(_RE_DT.findall(text))}
     return {"components": components, "nets": nets, "dt_keys": sorted(dt_keys)}
 
 
-def _parse_components(text: str) -> list[dict]:
+def _decode(raw: bytes) -> str:
+    return raw.decode("utf-8", errors="ignore")
+
+
+def _group(match: Optional[re.Match[bytes]]) -> str:
+    return _decode(match.group(1)) if match else ""
+
+
+def _parse_components(text: bytes | mmap.mmap) -> list[dict]:
     components: list[dict] = []
     # Best-effort: look for "(comp (ref R1) ... (value 10k) ... (footprint ...))"
-    for block in re.findall(r"\(comp\s+(.*?)\)", text, re.DOTALL):
-        ref_match = re.search(r"\(ref\s+([^)]+)\)", block)
-        value_match = re.search(r"\(value\s+([^)]+)\)", block)
-        footprint_match = re.search(r"\(footprint\s+([^)]+)\)", block)
+    for block in _iter_sexp_blocks(text, _RE_COMP_HEAD):
         comp_dict = {
-            "ref": ref_match.group(1) if ref_match else "",
-            "value": value_match.group(1) if value_match else "",
-            "footprint": footprint_match.group(1) if footprint_match else "",
+            "ref": _group(_RE_REF.search(block)),
+            "value": _group(_RE_VALUE.search(block)),
+            "footprint": _group(_RE_FOOTPRINT.search(block)),
+            # Block dt_ tokens are collected by the raw-text scan in _parse_kicad_file.
+            "dt_keys": [],
         }
-        comp_dict["dt_keys"] = sorted(find_dt_keys(block) | find_dt_keys(comp_dict))
         components.append(comp_dict)
 
     # Fallback simple: search for (module ... (fp_text reference R1 ...)
     if not components:
-        for block in re.findall(r"\(module\s+([^\s)]+).*?\)", text, re.DOTALL):
-            ref_match = re.search(r"reference\s+([A-Za-z0-9]+)", block)
-            val_match = re.search(r"value\s+([A-Za-z0-9\-\+\.]+)", block)
+        for block in _iter_sexp_blocks(text, _RE_MODULE_HEAD):
             comp_dict = {
-                "ref": ref_match.group(1) if ref_match else "",
-                "value": val_match.group(1) if val_match else "",
+                "ref": _group(_RE_MOD_REF.search(block)),
+                "value": _group(_RE_MOD_VAL.search(block)),
                 "footprint": "",
+                "dt_keys": [],
             }
-            comp_dict["dt_keys"] = sorted(find_dt_keys(block) | find_dt_keys(comp_dict))
             components.append(comp_dict)
     return components
 
 
-def _parse_nets(text: str) -> dict:
+def _iter_sexp_blocks(text: bytes | mmap.mmap, head: re.Pattern[bytes]) -> Iterator[bytes]:
+    """
+    Yield the body of every balanced s-expression whose opening matches ``head``.
+
+    Paren depth is tracked in one forward pass (parens inside quoted strings are
+    ignored), so nested sub-expressions cost linear time instead of regex
+    backtracking. A truncated final expression yields the rest of the text.
+    """
+    pos = 0
+    while True:
+        opening = head.search(text, pos)
+        if opening is None:
+            return
+        end = _sexp_end(text, opening.start())
+        if end is None:
+            yield text[opening.end() :]
+            return
+        yield text[opening.end() : end - 1]
+        pos = end
+
+
+def _sexp_end(text: bytes | mmap.mmap, start: int) -> Optional[int]:
+    # Returns the index just past the paren closing the expression opened at start.
+    depth = 0
+    in_string = False
+    escaped_at = -1
+    for match in _RE_SEXP_DELIM.finditer(text, start):
+        index = match.start()
+        char = match.group()
+        if in_string:
+            if index == escaped_at:
+                continue
+            if char == b"\\":
+                escaped_at = index + 1
+            elif char == b'"':
+                in_string = False
+        elif char == b"(":
+            depth += 1
+        elif char == b")":
+            depth -= 1
+            if depth == 0:
+                return index + 1
+        elif char == b'"':
+            in_string = True
+    return None
+
+
+def _parse_nets(text: bytes | mmap.mmap) -> dict:
     nets: dict[str, dict] = {}
-    # KiCad net definition: (net <id> "<name>")
-    for match in re.finditer(r"\(net\s+\d+\s+\"([^\"]+)\"\)", text):
-        name = match.group(1)
-        nets.setdefault(name, {"connections": 0})
-    # Simple connection counting: look for (net <id> ...) references
-    for match in re.finditer(r"\(net\s+(\d+)\s+\"([^\"]+)\"\)", text):
-        name = match.group(2)
-        nets[name]["connections"] += 1
+    # KiCad net definition: (net <id> "<name>"); every occurrence counts as a
+    # connection, so one pass both registers and counts each net.
+    for match in _RE_NET.finditer(text):
+        name = _decode(match.group(2))
+        record = nets.get(name)
+        if record is None:
+            nets[name] = {"connections": 1}
+        else:
+            record["connections"] += 1
     return nets
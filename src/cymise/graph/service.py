@@ -1,8 +1,9 @@
 from __future__ import annotations
 
-from collections import deque
 from typing import Iterable, Optional
 
+from sqlalchemy import inspect
+
 from cymise.store.models import RelationshipEdge, TwinNode
 from cymise.store.repo import StoreRepository
 
@@ -14,6 +15,15 @@ class GraphService:
 
     def __init__(self, repo: StoreRepository):
         self.repo = repo
+        # Twins resolved by _require_twin/_require_twin_by_id. Entries are only
+        # trusted while still persistent in the session; see _cached_twin.
+        self._twin_by_dtmi_cache: dict[str, TwinNode] = {}
+        self._twin_by_id_cache: dict[int, TwinNode] = {}
+
+    def clear_cache(self) -> None:
+        """Forget twins memoized by lookup helpers."""
+        self._twin_by_dtmi_cache.clear()
+        self._twin_by_id_cache.clear()
 
     # Twin operations
     def create_twin(
@@ -25,6 +35,7 @@ class GraphService:
         twin = self.repo.add_twin(
             dtmi=dtmi, display_name=display_name, model_version=model_version
         )
+        self.clear_cache()
         return self._to_node(twin)
 
     def update_twin(
@@ -36,11 +47,13 @@ class GraphService:
         twin = self.repo.update_twin(
             dtmi, display_name=display_name, model_version=model_version
         )
+        self.clear_cache()
         if not twin:
             raise ValueError(f"Twin not found for dtmi={dtmi}")
         return self._to_node(twin)
 
     def delete_twin(self, dtmi: str) -> bool:
+        self.clear_cache()
         return self.repo.delete_twin_by_dtmi(dtmi)
 
     def get_node(self, dtmi: str) -> Optional[GraphNode]:
@@ -63,23 +76,15 @@ class GraphService:
 
     def get_outgoing_neighbors(self, dtmi: str) -> list[GraphNode]:
         twin = self._require_twin(dtmi)
-        edges = self.repo.get_relationships_for_source(twin.id)
-        neighbor_nodes = []
-        for edge in edges:
-            target = self.repo.get_twin_by_id(edge.target_id)
-            if target:
-                neighbor_nodes.append(target)
-        return [self._to_node(n) for n in neighbor_nodes]
+        ids = [edge.target_id for edge in self.repo.get_relationships_for_source(twin.id)]
+        twins = self.repo.get_twins_by_ids(ids)
+        return [self._to_node(twins[i]) for i in ids if i in twins]
 
     def get_incoming_neighbors(self, dtmi: str) -> list[GraphNode]:
         twin = self._require_twin(dtmi)
-        edges = self.repo.get_relationships_for_target(twin.id)
-        neighbor_nodes = []
-        for edge in edges:
-            source = self.repo.get_twin_by_id(edge.source_id)
-            if source:
-                neighbor_nodes.append(source)
-        return [self._to_node(n) for n in neighbor_nodes]
+        ids = [edge.source_id for edge in self.repo.get_relationships_for_target(twin.id)]
+        twins = self.repo.get_twins_by_ids(ids)
+        return [self._to_node(twins[i]) for i in ids if i in twins]
 
     def get_subgraph(
         self, start_dtmi: str, max_hops: int, directed: bool = True
@@ -90,49 +95,63 @@ class GraphService:
         start = self._require_twin(start_dtmi)
         visited_nodes: dict[int, TwinNode] = {start.id: start}
         visited_edges: dict[int, RelationshipEdge] = {}
-        queue: deque[tuple[int, int]] = deque()
-        queue.append((start.id, 0))
-
-        while queue:
-            node_id, depth = queue.popleft()
-            if depth >= max_hops:
-                continue
-            # Directed traversal (default): follow outgoing relationships only.
-            # Undirected traversal: treat incoming edges as traversable for
-            # visualization.
-            outgoing = self.repo.get_relationships_for_source(node_id)
-            incoming = self.repo.get_relationships_for_target(node_id)
-
-            if directed:
-                edges_to_walk = list(outgoing)
-            else:
-                edges_to_walk = list(outgoing) + list(incoming)
-
-            for edge in edges_to_walk:
-                if edge.id not in visited_edges:
-                    visited_edges[edge.id] = edge
-
+        frontier: list[int] = [start.id]
+
+        # Breadth-first, one level at a time so each hop resolves its newly
+        # discovered twins with a single bulk lookup.
+        for _depth in range(max_hops):
+            if not frontier:
+                break
+            discovered: dict[int, None] = {}
+            for node_id in frontier:
+                # Directed traversal (default): follow outgoing relationships only.
+                # Undirected traversal: treat incoming edges as traversable for
+                # visualization.
                 if directed:
-                    # Only traverse source -> target
-                    neighbor_id = edge.target_id
+                    edges_to_walk = self.repo.get_relationships_for_source(node_id)
                 else:
-                    # Traverse to the "other end" (visual neighborhood)
-                    neighbor_id = (
-                        edge.target_id if edge.source_id == node_id else edge.source_id
-                    )
-
-                if neighbor_id not in visited_nodes:
-                    neighbor = self.repo.get_twin_by_id(neighbor_id)
-                    if neighbor:
-                        visited_nodes[neighbor_id] = neighbor
-                        queue.append((neighbor_id, depth + 1))
+                    edges_to_walk = self.repo.get_relationships_for_node(node_id)
+
+                for edge in edges_to_walk:
+                    if edge.id not in visited_edges:
+                        visited_edges[edge.id] = edge
+
+                    if directed:
+                        # Only traverse source -> target
+                        neighbor_id = edge.target_id
+                    else:
+                        # Traverse to the "other end" (visual neighborhood)
+                        neighbor_id = (
+                            edge.target_id if edge.source_id == node_id else edge.source_id
+                        )
+
+                    if neighbor_id not in visited_nodes:
+                        discovered[neighbor_id] = None
+
+            found = self.repo.get_twins_by_ids(discovered)
+            frontier = []
+            for neighbor_id in discovered:
+                neighbor = found.get(neighbor_id)
+                if neighbor:
+                    visited_nodes[neighbor_id] = neighbor
+                    frontier.append(neighbor_id)
+
+        endpoints = dict(visited_nodes)
+        missing = {
+            twin_id
+            for edge in visited_edges.values()
+            for twin_id in (edge.source_id, edge.target_id)
+            if twin_id not in endpoints
+        }
+        if missing:
+            endpoints.update(self.repo.get_twins_by_ids(missing))
 
         nodes = [self._to_node(twin) for twin in visited_nodes.values()]
         edges = [
             self._to_edge(
                 edge,
-                self._require_twin_by_id(edge.source_id),
-                self._require_twin_by_id(edge.target_id),
+                self._twin_from(endpoints, edge.source_id),
+                self._twin_from(endpoints, edge.target_id),
             )
             for edge in visited_edges.values()
         ]
@@ -141,6 +160,7 @@ class GraphService:
     # Validation
     def set_node_validation(self, dtmi: str, payload: Optional[dict]) -> GraphNode:
         twin = self.repo.set_twin_validation(dtmi, payload)
+        self.clear_cache()
         if not twin:
             raise ValueError(f"Twin not found for dtmi={dtmi}")
         return self._to_node(twin)
@@ -174,6 +194,10 @@ class GraphService:
         return self._to_edge(edge, source, target)
 
     # Documents
+    def snapshot_version(self) -> tuple:
+        """Token that changes whenever graph or model-document data changes."""
+        return self.repo.snapshot_version()
+
     def get_model_document(self, dtmi: str):
         return self.repo.get_model_document_by_dtmi(dtmi)
 
@@ -194,6 +218,26 @@ class GraphService:
         file_obj = self.repo.add_file_object(path=path, media_type=media_type, version=version, twin_id=twin_id)
         return self._file_to_dict(file_obj)
 
+    def add_file_objects(self, paths: list[str], twin_dtmi: Optional[str] = None) -> list[dict]:
+        """Register several files in one insert, optionally attached to one twin."""
+        twin_id = None
+        if twin_dtmi:
+            twin = self.repo.get_twin_by_dtmi(twin_dtmi)
+            if not twin:
+                raise ValueError(f"Twin not found for dtmi={twin_dtmi}")
+            twin_id = twin.id
+        ids = self.repo.add_file_objects({"path": path, "twin_id": twin_id} for path in paths)
+        return [
+            {
+                "id": file_id,
+                "path": path,
+                "media_type": None,
+                "version": None,
+                "twin_dtmi": twin_dtmi if twin_id else None,
+            }
+            for file_id, path in zip(ids, paths)
+        ]
+
     def list_file_objects(self) -> list[dict]:
         file_objs = self.repo.list_file_objects()
         return [self._file_to_dict(f) for f in file_objs]
@@ -214,8 +258,9 @@ class GraphService:
         return self._file_to_dict(updated)
 
     def diff_latest_extraction_for_file(self, file_object_id: int, kind: str) -> Optional[dict]:
+        # The two newest rows come back in one query and are diffed as loaded.
         extractions = self.repo.list_extracted_objects_for_file(
-            file_object_id, kind=kind, newest_first=True
+            file_object_id, kind=kind, newest_first=True, limit=2
         )
         if len(extractions) < 2:
             return None
@@ -223,12 +268,7 @@ class GraphService:
         from cymise.revision_diff.service import RevisionDiffService
 
         service = RevisionDiffService(self)
-        result = service.diff_extracted_objects(
-            old_id=extractions[1].id,
-            new_id=extractions[0].id,
-        )
-        if not result:
-            return None
+        result = service.diff_objects(extractions[1], extractions[0])
         return RevisionDiffService.to_dict(result)
 
     def stitch_file(self, file_object_id: int) -> list[dict]:
@@ -271,21 +311,46 @@ class GraphService:
 
     # Helpers
     def _require_twin(self, dtmi: str) -> TwinNode:
-        twin = self.repo.get_twin_by_dtmi(dtmi)
-        if not twin:
-            raise ValueError(f"Twin not found for dtmi={dtmi}")
+        twin = self._cached_twin(self._twin_by_dtmi_cache, dtmi)
+        if twin is None:
+            twin = self.repo.get_twin_by_dtmi(dtmi)
+            if not twin:
+                raise ValueError(f"Twin not found for dtmi={dtmi}")
+            self._remember_twin(twin)
         return twin
 
     def _require_twin_by_id(self, twin_id: int) -> TwinNode:
-        twin = self.repo.get_twin_by_id(twin_id)
+        twin = self._cached_twin(self._twin_by_id_cache, twin_id)
+        if twin is None:
+            twin = self.repo.get_twin_by_id(twin_id)
+            if not twin:
+                raise ValueError(f"Twin not found for id={twin_id}")
+            self._remember_twin(twin)
+        return twin
+
+    @staticmethod
+    def _cached_twin(cache: dict, key) -> Optional[TwinNode]:
+        twin = cache.get(key)
+        # Twins deleted or rolled back behind the service's back stop being
+        # persistent, so stale entries fall through to a fresh lookup.
+        if twin is not None and not inspect(twin).persistent:
+            cache.pop(key, None)
+            return None
+        return twin
+
+    def _remember_twin(self, twin: TwinNode) -> None:
+        self._twin_by_dtmi_cache[twin.dtmi] = twin
+        self._twin_by_id_cache[twin.id] = twin
+
+    @staticmethod
+    def _twin_from(twins: dict[int, TwinNode], twin_id: int) -> TwinNode:
+        twin = twins.get(twin_id)
         if not twin:
             raise ValueError(f"Twin not found for id={twin_id}")
         return twin
 
     def _edges_for_node(self, node_id: int) -> Iterable[RelationshipEdge]:
-        outgoing = self.repo.get_relationships_for_source(node_id)
-        incoming = self.repo.get_relationships_for_target(node_id)
-        return list(outgoing) + list(incoming)
+        return self.repo.get_relationships_for_node(node_id)
 
     @staticmethod
     def _to_node(twin: TwinNode) -> GraphNode:
@@ -307,10 +372,10 @@ class GraphService:
         )
 
     def _file_to_dict(self, file_obj):
-        twin_dtmi = None
-        if file_obj.twin_id:
-            twin = self.repo.get_twin_by_id(file_obj.twin_id)
-            twin_dtmi = twin.dtmi if twin else None
+        # twin_node is eager-loaded by list_file_objects; elsewhere the many-to-one
+        # load is answered from the identity map when the twin is already loaded.
+        twin = file_obj.twin_node
+        twin_dtmi = twin.dtmi if twin else None
         return {
             "id": file_obj.id,
             "path": file_obj.path,
@@ -1,10 +1,20 @@
 from __future__ import annotations
 
-from dataclasses import asdict, dataclass
+from dataclasses import dataclass
 from typing import Optional
 
 from cymise.graph.service import GraphService
 
+# List-valued keys emitted by RevisionDiffService for KiCad and FreeCAD diffs.
+_STRUCTURAL_LIST_KEYS = (
+    "components_added",
+    "components_removed",
+    "nets_added",
+    "nets_removed",
+    "tree_nodes_added",
+    "tree_nodes_removed",
+)
+
 
 @dataclass(slots=True)
 class ImpactEvidence:
@@ -55,6 +65,7 @@ class ImpactService:
         structural = diff.get("structural") or {}
 
         impacted_map: dict[str, ImpactRecord] = {}
+        stitch_map = self._stitch_targets(file_object_id, [*dt_key_added, *dt_key_removed])
 
         def add_impact(dtmi: str, severity: float, confidence: float, evidence: ImpactEvidence):
             record = impacted_map.get(dtmi)
@@ -72,7 +83,7 @@ class ImpactService:
                 )
 
         for dt_key in dt_key_added:
-            resolved = self._resolve_dtmi(dt_key, file_object_id)
+            resolved = self._resolve_dtmi(dt_key, stitch_map)
             if not resolved:
                 continue
             dtmi, is_direct = resolved
@@ -86,7 +97,7 @@ class ImpactService:
             )
 
         for dt_key in dt_key_removed:
-            resolved = self._resolve_dtmi(dt_key, file_object_id)
+            resolved = self._resolve_dtmi(dt_key, stitch_map)
             if not resolved:
                 continue
             dtmi, is_direct = resolved
@@ -108,13 +119,15 @@ class ImpactService:
                 )
 
         propagated_records: list[ImpactRecord] = []
-        if hops > 0:
+        propagated_dtmis: set[str] = set()
+        if hops > 0 and impacted_map:
             origin_dtmis = list(impacted_map.keys())
             for origin_dtmi in origin_dtmis:
                 neighbors = self._neighbors(origin_dtmi, directed=directed)
                 for neighbor in neighbors:
-                    if neighbor in impacted_map or any(p.dtmi == neighbor for p in propagated_records):
+                    if neighbor in impacted_map or neighbor in propagated_dtmis:
                         continue
+                    propagated_dtmis.add(neighbor)
                     propagated_records.append(
                         ImpactRecord(
                             dtmi=neighbor,
@@ -146,21 +159,31 @@ class ImpactService:
             summary=summary,
         )
 
-    def _resolve_dtmi(self, dt_key: str, file_object_id: int) -> Optional[tuple[str, bool]]:
+    def _stitch_targets(self, file_object_id: int, dt_keys: list) -> dict[str, str]:
+        """Map dt_key -> target DTMI from the file's stitches, fetched once per computation."""
+        if all(not isinstance(k, str) or k.startswith("dtmi:") for k in dt_keys):
+            return {}
+        targets: dict[str, str] = {}
+        # Accepted stitches take precedence over candidates for the same key.
+        for status in ("accepted", "candidate"):
+            for stitch in self.graph_service.list_stitches(
+                file_object_id=file_object_id, status=status
+            ):
+                dt_key = stitch.get("dt_key")
+                if stitch.get("target_dtmi") and dt_key not in targets:
+                    targets[dt_key] = stitch["target_dtmi"]
+        return targets
+
+    @staticmethod
+    def _resolve_dtmi(dt_key: str, stitch_map: dict[str, str]) -> Optional[tuple[str, bool]]:
         if not isinstance(dt_key, str):
             return None
         if dt_key.startswith("dtmi:"):
             return dt_key, True
 
-        stitches = []
-        for status in ("accepted", "candidate"):
-            stitches.extend(
-                self.graph_service.list_stitches(file_object_id=file_object_id, status=status)
-            )
-
-        for stitch in stitches:
-            if stitch.get("dt_key") == dt_key and stitch.get("target_dtmi"):
-                return stitch["target_dtmi"], False
+        target = stitch_map.get(dt_key)
+        if target:
+            return target, False
         return None
 
     def _structural_changed(self, structural: dict) -> bool:
@@ -168,9 +191,15 @@ class ImpactService:
             return False
         if "hash_changed" in structural:
             return bool(structural.get("hash_changed"))
-        for key, value in structural.items():
-            if key == "kind_mismatch":
+        if "kind_mismatch" in structural:
+            return True
+        # Fast path for the KiCad/FreeCAD diff shapes produced by RevisionDiffService
+        for key in _STRUCTURAL_LIST_KEYS:
+            value = structural.get(key)
+            if isinstance(value, list) and any(value):
                 return True
+        # Generic fallback for other diff shapes
+        for value in structural.values():
             if isinstance(value, list) and any(value):
                 return True
             if isinstance(value, bool) and value:
@@ -191,4 +220,27 @@ class ImpactService:
 
     @staticmethod
     def to_dict(result: ImpactResult) -> dict:
-        return asdict(result)
+        # Built by hand: every field is a scalar or a list of flat records, so the
+        # recursive deep copy done by dataclasses.asdict is unnecessary.
+        return {
+            "file_object_id": result.file_object_id,
+            "kind": result.kind,
+            "old_extracted_object_id": result.old_extracted_object_id,
+            "new_extracted_object_id": result.new_extracted_object_id,
+            "impacted": [_record_to_dict(record) for record in result.impacted],
+            "propagated": [_record_to_dict(record) for record in result.propagated],
+            "summary": result.summary,
+        }
+
+
+def _record_to_dict(record: ImpactRecord) -> dict:
+    return {
+        "dtmi": record.dtmi,
+        "severity": record.severity,
+        "confidence": record.confidence,
+        "evidences": [
+            {"kind": evidence.kind, "detail": evidence.detail, "source": evidence.source}
+            for evidence in record.evidences
+        ],
+        "is_propagated": record.is_propagated,
+    }
@@ -0,0 +1,138 @@
+"""
+Long-lived helper processes driven over a length-framed stdio protocol.
+
+Requests and responses are framed as ``<byte length>\\n<payload>``. On start-up the
+child must print a single banner line identifying the protocol; executables that
+do not are treated as lacking server support (``supported`` becomes False) so
+callers can fall back to spawning one process per call.
+"""
+
+from __future__ import annotations
+
+import subprocess
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterator, Optional
+
+# A helper that has not printed its banner by then is treated as broken, however
+# long requests themselves may take.
+_BANNER_TIMEOUT = 5.0
+
+
+class FramedProcessServer:
+    """Keep one child process warm and exchange framed messages with it."""
+
+    def __init__(
+        self,
+        command: list[str],
+        *,
+        banner: bytes,
+        timeout: float,
+        banner_timeout: float = _BANNER_TIMEOUT,
+        cwd: Optional[str | Path] = None,
+    ):
+        self.command = list(command)
+        self.banner = banner
+        self.timeout = timeout
+        self.banner_timeout = min(banner_timeout, timeout)
+        self.cwd = cwd
+        self.supported = True
+        self._proc: subprocess.Popen[bytes] | None = None
+        self._lock = threading.Lock()
+
+    def request(self, payload: bytes) -> bytes | None:
+        """
+        Send one framed request and return the raw response body.
+
+        Returns None when server mode is unavailable or the process died; raises
+        ``subprocess.TimeoutExpired`` when the request exceeds ``timeout``.
+        """
+        with self._lock:
+            proc = self._ensure_process()
+            if proc is None:
+                return None
+            response = None
+            try:
+                with self._deadline(proc, self.timeout):
+                    proc.stdin.write(b"%d\n" % len(payload))
+                    proc.stdin.write(payload)
+                    proc.stdin.flush()
+                    response = self._read_frame(proc)
+            except (OSError, ValueError):
+                response = None
+            finally:
+                if response is None:
+                    self._stop()
+            return response
+
+    def close(self) -> None:
+        with self._lock:
+            self._stop()
+
+    def _ensure_process(self) -> subprocess.Popen[bytes] | None:
+        if not self.supported:
+            return None
+        if self._proc is not None and self._proc.poll() is None:
+            return self._proc
+        try:
+            proc = subprocess.Popen(
+                [*self.command, "--server"],
+                stdin=subprocess.PIPE,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.DEVNULL,
+                cwd=self.cwd,
+            )
+        except OSError:
+            self.supported = False
+            return None
+        try:
+            with self._deadline(proc, self.banner_timeout):
+                banner = proc.stdout.readline()
+        except subprocess.TimeoutExpired:
+            banner = b""
+        if banner.strip() != self.banner:
+            self.supported = False
+            proc.kill()
+            proc.wait()
+            return None
+        self._proc = proc
+        return proc
+
+    @contextmanager
+    def _deadline(self, proc: subprocess.Popen[bytes], timeout: float) -> Iterator[None]:
+        # Blocking pipe reads have no portable timeout, so kill the process instead.
+        expired = threading.Event()
+
+        def _expire() -> None:
+            expired.set()
+            proc.kill()
+
+        timer = threading.Timer(timeout, _expire)
+        timer.start()
+        try:
+            yield
+        finally:
+            timer.cancel()
+        if expired.is_set():
+            raise subprocess.TimeoutExpired(self.command, timeout)
+
+    @staticmethod
+    def _read_frame(proc: subprocess.Popen[bytes]) -> bytes | None:
+        header = proc.stdout.readline()
+        if not header:
+            return None
+        size = int(header)
+        body = proc.stdout.read(size)
+        return body if len(body) == size else None
+
+    def _stop(self) -> None:
+        proc, self._proc = self._proc, None
+        if proc is None:
+            return
+        try:
+            proc.stdin.close()
+            proc.wait(timeout=2)
+        except (OSError, subprocess.TimeoutExpired):
+            proc.kill()
+            proc.wait()
@@ -0,0 +1,42 @@
+# cython: language_level=3, boundscheck=False, wraparound=False
+"""
+Compiled version of ``cymise.revision_diff.tree.flatten_tree_paths``.
+
+Semantics match the pure-Python implementation exactly; ``tree`` imports it when
+the extension has been built and falls back otherwise.
+"""
+
+
+cpdef set flatten_tree_paths(object tree):
+    cdef set paths = set()
+    # Parallel stacks of nodes and their joined path prefixes (None above the root)
+    cdef list nodes = [tree]
+    cdef list prefixes = [None]
+    cdef object node
+    cdef object prefix
+    cdef object name
+    cdef object children
+    cdef object child
+    cdef object leaf
+
+    while nodes:
+        node = nodes.pop()
+        prefix = prefixes.pop()
+        if isinstance(node, dict):
+            name = (<dict>node).get("name") or (<dict>node).get("label")
+            children = (<dict>node).get("children") or []
+            if isinstance(name, str):
+                prefix = name if prefix is None else <str>prefix + "/" + <str>name
+                paths.add(prefix)
+            if isinstance(children, list):
+                for child in <list>children:
+                    nodes.append(child)
+                    prefixes.append(prefix)
+        elif isinstance(node, list):
+            for child in <list>node:
+                nodes.append(child)
+                prefixes.append(prefix)
+        else:
+            leaf = node if isinstance(node, str) else str(node)
+            paths.add(leaf if prefix is None else <str>prefix + "/" + <str>leaf)
+    return paths
@@ -1,11 +1,12 @@
 from __future__ import annotations
 
-import hashlib
-import json
-from dataclasses import asdict, dataclass
+import copy
+from dataclasses import dataclass, field
 from typing import Any, Optional
 
 from cymise.graph.service import GraphService
+from cymise.revision_diff.tree import flatten_tree_paths
+from cymise.store.hashing import is_canonical_digest, strip_digest_tag, structural_digest
 
 
 @dataclass(slots=True)
@@ -14,11 +15,34 @@ class RevisionDiffResult:
     kind: str
     old_extracted_object_id: int
     new_extracted_object_id: int
-    dt_key_added: list[str]
-    dt_key_removed: list[str]
-    dt_key_unchanged: list[str]
+    added_keys: set[str]
+    removed_keys: set[str]
+    unchanged_keys: set[str]
     structural: dict
     summary: str
+    _sorted: dict[str, list[str]] = field(
+        default_factory=dict, init=False, repr=False, compare=False
+    )
+
+    # The sorted views are only built when read; callers that just need the
+    # summary or the counts never pay for sorting large key sets.
+    @property
+    def dt_key_added(self) -> list[str]:
+        return self._sorted_view("added", self.added_keys)
+
+    @property
+    def dt_key_removed(self) -> list[str]:
+        return self._sorted_view("removed", self.removed_keys)
+
+    @property
+    def dt_key_unchanged(self) -> list[str]:
+        return self._sorted_view("unchanged", self.unchanged_keys)
+
+    def _sorted_view(self, name: str, keys: set[str]) -> list[str]:
+        view = self._sorted.get(name)
+        if view is None:
+            view = self._sorted[name] = sorted(keys)
+        return view
 
 
 class RevisionDiffService:
@@ -29,35 +53,46 @@ class RevisionDiffService:
         self, old_id: int, new_id: int
     ) -> Optional[RevisionDiffResult]:
         repo = self.graph_service.repo
-        old_obj = repo.get_extracted_object_by_id(old_id)
-        new_obj = repo.get_extracted_object_by_id(new_id)
+        objects = repo.get_extracted_objects_by_ids((old_id, new_id))
+        old_obj = objects.get(old_id)
+        new_obj = objects.get(new_id)
 
         if not old_obj or not new_obj:
             return None
+        return self.diff_objects(old_obj, new_obj)
 
+    def diff_objects(self, old_obj: Any, new_obj: Any) -> RevisionDiffResult:
+        """Diff two already-loaded extracted objects."""
         file_object_id = new_obj.file_object_id
         kind = new_obj.kind or old_obj.kind
 
         old_keys = self._extract_dt_keys(old_obj.data)
         new_keys = self._extract_dt_keys(new_obj.data)
 
-        dt_key_added = sorted(new_keys - old_keys)
-        dt_key_removed = sorted(old_keys - new_keys)
-        dt_key_unchanged = sorted(old_keys & new_keys)
+        if old_keys == new_keys:
+            # Re-extracting an unchanged file is the common case; equality exits on a
+            # length mismatch and otherwise costs a single pass of lookups.
+            added_keys: set[str] = set()
+            removed_keys: set[str] = set()
+            unchanged_keys = new_keys
+        else:
+            added_keys = new_keys - old_keys
+            removed_keys = old_keys - new_keys
+            unchanged_keys = old_keys & new_keys
 
         structural = self._structural_diff(old_obj, new_obj)
         structural_summary = self._structural_summary(structural)
 
-        summary = f"dt_keys +{len(dt_key_added)} -{len(dt_key_removed)}, structural: {structural_summary}"
+        summary = f"dt_keys +{len(added_keys)} -{len(removed_keys)}, structural: {structural_summary}"
 
         return RevisionDiffResult(
             file_object_id=file_object_id,
             kind=kind,
             old_extracted_object_id=old_obj.id,
             new_extracted_object_id=new_obj.id,
-            dt_key_added=dt_key_added,
-            dt_key_removed=dt_key_removed,
-            dt_key_unchanged=dt_key_unchanged,
+            added_keys=added_keys,
+            removed_keys=removed_keys,
+            unchanged_keys=unchanged_keys,
             structural=structural,
             summary=summary,
         )
@@ -81,30 +116,44 @@ class RevisionDiffService:
         if kind == "freecad_tree":
             return self._structural_diff_freecad(old_data, new_data)
 
-        return self._structural_diff_hash(old_data, new_data)
+        return self._structural_diff_hash(
+            old_data, new_data, old_obj.content_hash, new_obj.content_hash
+        )
 
     def _structural_diff_kicad(self, old_data: dict, new_data: dict) -> dict:
-        old_components = self._component_identities(
-            old_data.get("components") or old_data.get("parts") or []
+        components_added, components_removed = self._identity_diff(
+            old_data.get("components") or old_data.get("parts") or [],
+            new_data.get("components") or new_data.get("parts") or [],
+            self._component_identities,
         )
-        new_components = self._component_identities(
-            new_data.get("components") or new_data.get("parts") or []
+        nets_added, nets_removed = self._identity_diff(
+            old_data.get("nets") or [], new_data.get("nets") or [], self._net_identities
         )
-
-        old_nets = self._net_identities(old_data.get("nets") or [])
-        new_nets = self._net_identities(new_data.get("nets") or [])
-
         return {
-            "components_added": sorted(new_components - old_components),
-            "components_removed": sorted(old_components - new_components),
-            "nets_added": sorted(new_nets - old_nets),
-            "nets_removed": sorted(old_nets - new_nets),
+            "components_added": components_added,
+            "components_removed": components_removed,
+            "nets_added": nets_added,
+            "nets_removed": nets_removed,
         }
 
+    @staticmethod
+    def _identity_diff(old_items: Any, new_items: Any, identities) -> tuple[list, list]:
+        # The same list object yields the same identity sets. Python equality is not
+        # used: it treats 1, 1.0 and True as equal while their identities differ.
+        if old_items is new_items:
+            return [], []
+        old_ids = identities(old_items)
+        new_ids = identities(new_items)
+        return sorted(new_ids - old_ids), sorted(old_ids - new_ids)
+
     def _component_identities(self, components: Any) -> set[str]:
         identities: set[str] = set()
         if not isinstance(components, list):
             return identities
+        # Fast path for the usual uniform list where every component has a ref.
+        refs = _uniform_field(components, "ref")
+        if refs is not None and "" not in refs:
+            return refs
         for comp in components:
             if isinstance(comp, dict):
                 ref = comp.get("ref") or comp.get("reference")
@@ -146,60 +195,30 @@ class RevisionDiffService:
         }
 
     def _flatten_tree_paths(self, tree: Any) -> set[str]:
-        paths: set[str] = set()
-
-        def walk(node: Any, prefix: list[str]):
-            if isinstance(node, dict):
-                name = node.get("name") or node.get("label")
-                children = node.get("children") or []
-                current_prefix = prefix
-                if isinstance(name, str):
-                    current_prefix = prefix + [name]
-                    paths.add("/".join(current_prefix))
-                if isinstance(children, list):
-                    for child in children:
-                        walk(child, current_prefix)
-                return
-
-            if isinstance(node, list):
-                for child in node:
-                    walk(child, prefix)
-                return
-
-            if isinstance(node, str):
-                paths.add("/".join(prefix + [node]))
-                return
-
-            # Fallback string identity for unexpected shapes
-            paths.add("/".join(prefix + [str(node)]))
-
-        walk(tree, [])
-        return paths
-
-    def _structural_diff_hash(self, old_data: Any, new_data: Any) -> dict:
-        exclude_keys = {"tool_info", "errors", "timestamp", "created_at", "updated_at"}
-
-        def clean(obj: Any):
-            if isinstance(obj, dict):
-                return {
-                    k: clean(v)
-                    for k, v in obj.items()
-                    if k not in exclude_keys
-                }
-            if isinstance(obj, list):
-                return [clean(v) for v in obj]
-            return obj
-
-        def digest(obj: Any) -> str:
-            try:
-                normalized = json.dumps(clean(obj), sort_keys=True, separators=(",", ":"))
-                return hashlib.sha256(normalized.encode("utf-8")).hexdigest()
-            except Exception:
-                fallback = str(obj)
-                return hashlib.sha256(fallback.encode("utf-8")).hexdigest()
-
-        old_hash = digest(old_data)
-        new_hash = digest(new_data)
+        return flatten_tree_paths(tree)
+
+    def _structural_diff_hash(
+        self,
+        old_data: Any,
+        new_data: Any,
+        old_hash: Optional[str] = None,
+        new_hash: Optional[str] = None,
+    ) -> dict:
+        # Digests stored with the extracted objects skip serialization entirely, but
+        # only when both come from the current scheme; otherwise both are recomputed.
+        if not (is_canonical_digest(old_hash) and is_canonical_digest(new_hash)):
+            old_hash = new_hash = None
+        if old_hash is None:
+            old_hash = structural_digest(old_data)
+        if new_hash is None:
+            # The same object needs no second hash. Python equality is not enough:
+            # 1, 1.0 and True compare equal but serialize differently.
+            if new_data is old_data:
+                new_hash = old_hash
+            else:
+                new_hash = structural_digest(new_data)
+        old_hash = strip_digest_tag(old_hash)
+        new_hash = strip_digest_tag(new_hash)
         return {
             "data_hash_old": old_hash,
             "data_hash_new": new_hash,
@@ -228,5 +247,38 @@ class RevisionDiffService:
         return "structural diff"
 
     @staticmethod
-    def to_dict(result: RevisionDiffResult) -> dict:
-        return asdict(result)
+    def to_dict(result: RevisionDiffResult, *, deep: bool = False) -> dict:
+        """
+        Return the result as a plain dict.
+
+        By default the key lists and the structural dict are shared with
+        ``result`` rather than copied; pass ``deep=True`` for an independent copy.
+        """
+        data = {
+            "file_object_id": result.file_object_id,
+            "kind": result.kind,
+            "old_extracted_object_id": result.old_extracted_object_id,
+            "new_extracted_object_id": result.new_extracted_object_id,
+            "dt_key_added": result.dt_key_added,
+            "dt_key_removed": result.dt_key_removed,
+            "dt_key_unchanged": result.dt_key_unchanged,
+            "structural": result.structural,
+            "summary": result.summary,
+        }
+        return copy.deepcopy(data) if deep else data
+
+
+def _uniform_field(items: list, key: str) -> Optional[set[str]]:
+    """
+    Return ``{item[key] for item in items}`` when every item is a dict with a
+    string under ``key``; None sends the caller to its per-item fallback.
+    """
+    try:
+        values = {item[key] for item in items}
+        # join raises TypeError unless every value is a string, checking them all
+        # in C rather than with a Python-level isinstance loop.
+        "".join(values)
+    except (KeyError, TypeError):
+        # a non-dict item, a missing key or a non-string/unhashable value
+        return None
+    return values
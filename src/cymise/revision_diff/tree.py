@@ -0,0 +1,46 @@
+"""
+Path flattening for FreeCAD object trees.
+
+Large assemblies reach tens of thousands of nodes, so the walk is iterative and
+builds each path with a single concatenation. When the optional ``_walker`` Cython
+extension is built (see setup.py) its compiled version replaces the pure-Python
+definition below.
+"""
+
+from __future__ import annotations
+
+from typing import Any, Optional
+
+
+def flatten_tree_paths(tree: Any) -> set[str]:
+    """Return the ``/``-joined path of every named node and leaf in ``tree``."""
+    paths: set[str] = set()
+    # Iterative walk carrying each node's joined path (None above the root), so
+    # every path is built with one concatenation instead of a list copy + join.
+    stack: list[tuple[Any, Optional[str]]] = [(tree, None)]
+    push = stack.append
+    while stack:
+        node, prefix = stack.pop()
+        if isinstance(node, dict):
+            name = node.get("name") or node.get("label")
+            children = node.get("children") or []
+            if isinstance(name, str):
+                prefix = name if prefix is None else prefix + "/" + name
+                paths.add(prefix)
+            if isinstance(children, list):
+                for child in children:
+                    push((child, prefix))
+        elif isinstance(node, list):
+            for child in node:
+                push((child, prefix))
+        else:
+            # Strings are leaf names; other shapes fall back to their str() identity
+            leaf = node if isinstance(node, str) else str(node)
+            paths.add(leaf if prefix is None else prefix + "/" + leaf)
+    return paths
+
+
+try:
+    from ._walker import flatten_tree_paths  # noqa: F401, F811
+except ImportError:  # pragma: no cover - depends on optional compiled extension
+    pass
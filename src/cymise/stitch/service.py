@@ -26,80 +26,62 @@ class StitchService:
         if not file_obj:
             return []
 
-        extracted_objects = self.graph_service.repo.list_extracted_objects_for_file(file_object_id)
         candidates: list[StitchCandidateDTO] = []
-        seen_keys: set[tuple[int, str, Optional[str]]] = set()
-
-        for extracted in extracted_objects:
-            data = extracted.data or {}
-            dt_keys = data.get("dt_keys") or []
-            if not dt_keys:
+        # target_dtmi follows from dt_key, so the key identifies a candidate
+        seen_keys: set[tuple[int, str]] = set()
+        for pair in self.graph_service.repo.list_extracted_dt_keys_for_file(file_object_id):
+            if pair in seen_keys:
                 continue
-
-            for dt_key in dt_keys:
-                if not isinstance(dt_key, str):
-                    continue
-
-                if dt_key.startswith("dtmi:"):
-                    target_dtmi = dt_key
-                    confidence = 0.9
-                    rationale = "dt_key looks like DTMI"
-                else:
-                    target_dtmi = None
-                    confidence = 0.3
-                    rationale = "unresolved dt_key"
-
-                dedupe_key = (extracted.id, dt_key, target_dtmi)
-                if dedupe_key in seen_keys:
-                    continue
-                seen_keys.add(dedupe_key)
-
-                candidates.append(
-                    StitchCandidateDTO(
-                        file_object_id=file_object_id,
-                        extracted_object_id=extracted.id,
-                        dt_key=dt_key,
-                        target_dtmi=target_dtmi,
-                        confidence=confidence,
-                        rationale=rationale,
-                        status="candidate",
-                    )
+            seen_keys.add(pair)
+            extracted_id, dt_key = pair
+
+            if dt_key.startswith("dtmi:"):
+                target_dtmi = dt_key
+                confidence = 0.9
+                rationale = "dt_key looks like DTMI"
+            else:
+                target_dtmi = None
+                confidence = 0.3
+                rationale = "unresolved dt_key"
+
+            candidates.append(
+                StitchCandidateDTO(
+                    file_object_id=file_object_id,
+                    extracted_object_id=extracted_id,
+                    dt_key=dt_key,
+                    target_dtmi=target_dtmi,
+                    confidence=confidence,
+                    rationale=rationale,
+                    status="candidate",
                 )
+            )
 
         return candidates
 
     def persist_candidates(self, candidates: list[StitchCandidateDTO]) -> list[int]:
-        ids: list[int] = []
-        for candidate in candidates:
-            row = self.graph_service.repo.add_stitch_candidate(
-                file_object_id=candidate.file_object_id,
-                extracted_object_id=candidate.extracted_object_id,
-                dt_key=candidate.dt_key,
-                target_dtmi=candidate.target_dtmi,
-                confidence=candidate.confidence,
-                rationale=candidate.rationale,
-                status=candidate.status,
-            )
-            ids.append(row.id)
-        return ids
+        return self.graph_service.repo.add_stitch_candidates(map(_candidate_row, candidates))
 
     def stitch_file(self, file_object_id: int) -> list[dict]:
-        candidates = self.generate_candidates_for_file(file_object_id)
-        if not candidates:
-            return []
-        ids = self.persist_candidates(candidates)
-        result = []
-        for candidate_id, candidate in zip(ids, candidates):
-            result.append(
-                {
-                    "id": candidate_id,
-                    "file_object_id": candidate.file_object_id,
-                    "extracted_object_id": candidate.extracted_object_id,
-                    "dt_key": candidate.dt_key,
-                    "target_dtmi": candidate.target_dtmi,
-                    "confidence": candidate.confidence,
-                    "rationale": candidate.rationale,
-                    "status": candidate.status,
-                }
-            )
-        return result
+        with self.graph_service.repo.transaction():
+            candidates = self.generate_candidates_for_file(file_object_id)
+            if not candidates:
+                return []
+            rows = [_candidate_row(candidate) for candidate in candidates]
+            ids = self.graph_service.repo.add_stitch_candidates(rows)
+        # The inserted rows double as the result, so each candidate costs one dict.
+        for candidate_id, row in zip(ids, rows):
+            row["id"] = candidate_id
+        return rows
+
+
+def _candidate_row(candidate: StitchCandidateDTO) -> dict:
+    # Plain literal rather than dataclasses.asdict, which recurses and deep-copies.
+    return {
+        "file_object_id": candidate.file_object_id,
+        "extracted_object_id": candidate.extracted_object_id,
+        "dt_key": candidate.dt_key,
+        "target_dtmi": candidate.target_dtmi,
+        "confidence": candidate.confidence,
+        "rationale": candidate.rationale,
+        "status": candidate.status,
+    }
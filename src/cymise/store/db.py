@@ -1,9 +1,10 @@
 from __future__ import annotations
 
+import sqlite3
 from pathlib import Path
 from typing import Optional
 
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event, inspect
 from sqlalchemy.engine import Engine
 from sqlalchemy.orm import Session, sessionmaker
 
@@ -11,22 +12,84 @@ from .models import Base
 
 DEFAULT_DB_PATH = Path(__file__).resolve().parents[3] / "cymise.db"
 
+# Applied to every new connection. WAL with synchronous=NORMAL avoids an fsync per
+# commit while staying crash-safe; the rest keeps more of the working set in memory.
+_SQLITE_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA cache_size=-65536",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA mmap_size=268435456",
+)
+
+
+# Repository inserts and updates use RETURNING, added in SQLite 3.35.
+_MIN_SQLITE_VERSION = (3, 35)
+
 
 def get_engine(db_path: Optional[Path | str] = None) -> Engine:
     """Create an engine for the given SQLite path (defaults to repo root)."""
+    if sqlite3.sqlite_version_info < _MIN_SQLITE_VERSION:
+        required = ".".join(map(str, _MIN_SQLITE_VERSION))
+        raise RuntimeError(
+            f"SQLite {required} or newer is required (found {sqlite3.sqlite_version})."
+        )
     resolved = Path(db_path) if db_path else DEFAULT_DB_PATH
-    return create_engine(f"sqlite+pysqlite:///{resolved}", future=True, echo=False)
+    # A larger compiled-statement cache than the default 500 keeps every repository
+    # and service query shape compiled across a long UI session.
+    engine = create_engine(
+        f"sqlite+pysqlite:///{resolved}", future=True, echo=False, query_cache_size=1200
+    )
+    event.listen(engine, "connect", _apply_sqlite_pragmas)
+    return engine
+
+
+def _apply_sqlite_pragmas(dbapi_connection, _connection_record) -> None:
+    cursor = dbapi_connection.cursor()
+    try:
+        for pragma in _SQLITE_PRAGMAS:
+            cursor.execute(pragma)
+    finally:
+        cursor.close()
 
 
 def create_db(engine: Optional[Engine] = None) -> Engine:
-    """Create tables if they do not exist and return the engine."""
+    """Create missing tables, columns and indexes and return the engine."""
     engine = engine or get_engine()
     Base.metadata.create_all(engine)
+    _add_missing_columns(engine)
+    # create_all only emits indexes together with new tables; add any that were
+    # introduced after an existing database was created.
+    for table in Base.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(engine, checkfirst=True)
     return engine
 
 
+def _add_missing_columns(engine: Engine) -> None:
+    # create_all never alters existing tables; add nullable columns introduced
+    # since the database was created so older files keep working.
+    existing = inspect(engine)
+    with engine.begin() as conn:
+        for table in Base.metadata.sorted_tables:
+            present = {column["name"] for column in existing.get_columns(table.name)}
+            for column in table.columns:
+                if column.name in present or not column.nullable:
+                    continue
+                column_type = column.type.compile(dialect=engine.dialect)
+                conn.exec_driver_sql(
+                    f'ALTER TABLE "{table.name}" ADD COLUMN "{column.name}" {column_type}'
+                )
+
+
 def get_session(engine: Optional[Engine] = None) -> Session:
     """Return a new session bound to the given or default engine."""
     engine = engine or get_engine()
-    SessionLocal = sessionmaker(bind=engine, autoflush=False, autocommit=False, future=True)
+    # expire_on_commit=False: the app owns the only writer, so objects stay valid
+    # after a commit and reading them back does not cost a SELECT per instance.
+    # autoflush=False: every StoreRepository write ends in a flush or commit, so no
+    # query relies on pending changes being flushed for it.
+    SessionLocal = sessionmaker(
+        bind=engine, autoflush=False, autocommit=False, expire_on_commit=False, future=True
+    )
     return SessionLocal()
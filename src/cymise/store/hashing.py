@@ -0,0 +1,103 @@
+"""
+Content digests for extraction payloads.
+
+A digest covers the payload serialized as sorted, compact JSON with volatile
+bookkeeping keys (timestamps, tool info, errors) removed at any depth, so two
+extractions of an unchanged file hash the same.
+
+Stored digests are compared across machines and installs, so the encoding and
+the algorithm are fixed: the stdlib encoder (never orjson, whose float and
+escaping output differ) and SHA-256. Digests carry a tag naming that scheme;
+digests without the current tag were produced differently and must not be
+compared with current ones.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import itertools
+import json
+from typing import Any, Optional
+
+VOLATILE_KEYS = frozenset({"tool_info", "errors", "timestamp", "created_at", "updated_at"})
+
+# Extraction kinds the revision diff compares structurally; their rows never need
+# a stored digest.
+UNHASHED_KINDS = frozenset({"kicad_ecad", "freecad_tree"})
+
+DIGEST_TAG = "sha256-json2:"
+
+# Canonical encoder (the json.dumps settings revision diffs have always hashed
+# with) and how many encoder tokens to join per hash update.
+_HASH_ENCODER = json.JSONEncoder(sort_keys=True, separators=(",", ":"))
+_HASH_CHUNK_BATCH = 1024
+# Marker for dict entries removed while cleaning a payload for hashing.
+_DROP = object()
+
+
+def content_hash(data: Any) -> Optional[str]:
+    """
+    Return the canonical digest of ``data``, or None if it cannot be encoded as JSON.
+
+    Only canonical digests are stored with extracted objects: they depend on the
+    payload alone, so they match however often and wherever it is re-encoded.
+    """
+    cleaned = _clean(data)
+    try:
+        # Stream the encoding into the hash instead of building one large string.
+        hasher = hashlib.sha256()
+        pending: list[str] = []
+        for chunk in _HASH_ENCODER.iterencode(cleaned):
+            pending.append(chunk)
+            if len(pending) >= _HASH_CHUNK_BATCH:
+                hasher.update("".join(pending).encode("utf-8"))
+                pending.clear()
+        hasher.update("".join(pending).encode("utf-8"))
+        return DIGEST_TAG + hasher.hexdigest()
+    except Exception:
+        return None
+
+
+def is_canonical_digest(digest: Optional[str]) -> bool:
+    """Whether ``digest`` was produced by the current ``content_hash`` scheme."""
+    return digest is not None and digest.startswith(DIGEST_TAG)
+
+
+def strip_digest_tag(digest: str) -> str:
+    """The bare hex digest, as reported in revision diffs."""
+    return digest.removeprefix(DIGEST_TAG)
+
+
+def structural_digest(data: Any) -> str:
+    """``content_hash`` with a best-effort digest of ``str(data)`` as the fallback."""
+    digest = content_hash(data)
+    if digest is not None:
+        return digest
+    return hashlib.sha256(str(data).encode("utf-8")).hexdigest()
+
+
+def _clean(obj: Any):
+    # Copy-on-write: containers with nothing excluded beneath them are returned
+    # as-is, so only the paths leading to excluded keys are copied.
+    if isinstance(obj, dict):
+        copied = None
+        for index, (k, v) in enumerate(obj.items()):
+            cleaned = _DROP if k in VOLATILE_KEYS else _clean(v)
+            if copied is None:
+                if cleaned is v:
+                    continue
+                copied = dict(itertools.islice(obj.items(), index))
+            if cleaned is not _DROP:
+                copied[k] = cleaned
+        return obj if copied is None else copied
+    if isinstance(obj, list):
+        copied_list = None
+        for index, v in enumerate(obj):
+            cleaned = _clean(v)
+            if copied_list is None:
+                if cleaned is v:
+                    continue
+                copied_list = obj[:index]
+            copied_list.append(cleaned)
+        return obj if copied_list is None else copied_list
+    return obj
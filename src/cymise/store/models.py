@@ -7,6 +7,7 @@ from sqlalchemy import (
     JSON,
     DateTime,
     ForeignKey,
+    Index,
     Integer,
     String,
     UniqueConstraint,
@@ -54,6 +55,10 @@ class TwinNode(Base):
 
 class RelationshipEdge(Base):
     __tablename__ = "relationship_edges"
+    __table_args__ = (
+        Index("ix_rel_source", "source_id"),
+        Index("ix_rel_target", "target_id"),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
     name: Mapped[Optional[str]] = mapped_column(String, nullable=True)
@@ -95,10 +100,15 @@ class FileObject(Base):
 
 class ExtractedObject(Base):
     __tablename__ = "extracted_objects"
+    __table_args__ = (Index("ix_extracted_file_id", "file_object_id", "id"),)
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
     kind: Mapped[str] = mapped_column(String, nullable=False)
     data: Mapped[dict] = mapped_column(JSON, nullable=False, default=dict)
+    # Digest from cymise.store.hashing.content_hash, set when the row is added;
+    # None for older rows, structurally diffed kinds and payloads without a
+    # canonical JSON form.
+    content_hash: Mapped[Optional[str]] = mapped_column(String, nullable=True)
     file_object_id: Mapped[int] = mapped_column(
         ForeignKey("file_objects.id", ondelete="CASCADE"), nullable=False
     )
@@ -111,6 +121,10 @@ class ExtractedObject(Base):
 
 class StitchCandidate(Base):
     __tablename__ = "stitch_candidates"
+    __table_args__ = (
+        Index("ix_stitch_file_status", "file_object_id", "status"),
+        Index("ix_stitch_extracted", "extracted_object_id"),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
 
@@ -136,6 +150,8 @@ class StitchCandidate(Base):
 
 class ModelDocument(Base):
     __tablename__ = "model_documents"
+    # Not unique: dtmi is optional and older stores may hold repeats.
+    __table_args__ = (Index("ix_model_documents_dtmi", "dtmi"),)
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
     name: Mapped[str] = mapped_column(String, nullable=False)
@@ -1,10 +1,12 @@
 from __future__ import annotations
 
-from typing import Iterable, Optional
+from contextlib import contextmanager
+from typing import Any, Iterable, Iterator, Optional, Sequence
 
-from sqlalchemy import delete, select
-from sqlalchemy.orm import Session
+from sqlalchemy import bindparam, case, delete, func, insert, or_, select, true, update
+from sqlalchemy.orm import Session, selectinload
 
+from .hashing import UNHASHED_KINDS, content_hash
 from .models import (
     ExtractedObject,
     FileObject,
@@ -14,12 +16,62 @@ from .models import (
     TwinNode,
 )
 
+# Keeps ``IN (...)`` lookups well under SQLite's bound-parameter limit.
+_IN_CHUNK_SIZE = 500
+# Rows fetched and turned into objects per batch by the streaming list_* methods.
+_STREAM_BATCH_SIZE = 500
+
+# Hot lookups built once with named bind parameters; each call only binds values,
+# skipping statement construction and the compiled-cache key generation.
+_TWIN_BY_DTMI = select(TwinNode).where(TwinNode.dtmi == bindparam("dtmi"))
+_MODEL_DOCUMENT_BY_DTMI = select(ModelDocument).where(ModelDocument.dtmi == bindparam("dtmi"))
+_EDGES_FOR_SOURCE = select(RelationshipEdge).where(
+    RelationshipEdge.source_id == bindparam("node_id")
+)
+_EDGES_FOR_TARGET = select(RelationshipEdge).where(
+    RelationshipEdge.target_id == bindparam("node_id")
+)
+_EDGES_FOR_NODE = (
+    select(RelationshipEdge)
+    .where(
+        or_(
+            RelationshipEdge.source_id == bindparam("node_id"),
+            RelationshipEdge.target_id == bindparam("node_id"),
+        )
+    )
+    .order_by(
+        case((RelationshipEdge.source_id == bindparam("node_id"), 0), else_=1),
+        RelationshipEdge.id,
+    )
+)
+
 
 class StoreRepository:
     """Minimal repository for graph store CRUD."""
 
     def __init__(self, session: Session):
         self.session = session
+        self._tx_depth = 0
+
+    @contextmanager
+    def transaction(self) -> Iterator[StoreRepository]:
+        """
+        Group several writes into one commit.
+
+        Inside the block CRUD methods only flush (primary keys are still assigned);
+        the outermost block commits on exit. Blocks may be nested; an exception
+        escaping any of them rolls back the whole transaction.
+        """
+        self._tx_depth += 1
+        try:
+            yield self
+        except Exception:
+            self._tx_depth -= 1
+            self.session.rollback()
+            raise
+        self._tx_depth -= 1
+        if not self._tx_depth:
+            self._commit()
 
     # TwinNode
     def add_twin(
@@ -32,43 +84,80 @@ class StoreRepository:
         self.session.add(twin)
         return self._commit_and_refresh(twin)
 
+    def upsert_twins(self, rows: Iterable[dict[str, Any]]) -> dict[str, int]:
+        """
+        Create or update many twins with a single commit and return ``{dtmi: id}``.
+
+        Like the other bulk writes it only flushes inside ``transaction()``.
+
+        Each row needs ``dtmi``; ``display_name`` and ``model_version`` behave as in
+        ``update_twin`` (``None`` keeps the stored value) and ``validation`` is
+        written whenever the key is present.
+        """
+        rows = list(rows)
+        if not rows:
+            return {}
+        twins = {twin.dtmi: twin for twin in self._twins_by_dtmis([r["dtmi"] for r in rows])}
+        for row in rows:
+            dtmi = row["dtmi"]
+            twin = twins.get(dtmi)
+            if twin is None:
+                twin = TwinNode(dtmi=dtmi)
+                self.session.add(twin)
+                twins[dtmi] = twin
+            if row.get("display_name") is not None:
+                twin.display_name = row["display_name"]
+            if row.get("model_version") is not None:
+                twin.model_version = row["model_version"]
+            if "validation" in row:
+                twin.validation = row["validation"]
+        try:
+            self.session.flush()
+        except Exception:
+            self.session.rollback()
+            raise
+        self._commit()
+        return {dtmi: twin.id for dtmi, twin in twins.items()}
+
     def get_twin_by_dtmi(self, dtmi: str) -> Optional[TwinNode]:
-        return self.session.scalar(select(TwinNode).where(TwinNode.dtmi == dtmi))
+        return self.session.scalar(_TWIN_BY_DTMI, {"dtmi": dtmi})
 
     def get_twin_by_id(self, twin_id: int) -> Optional[TwinNode]:
         return self.session.get(TwinNode, twin_id)
 
+    def get_twins_by_ids(self, twin_ids: Iterable[int]) -> dict[int, TwinNode]:
+        """Load many twins in chunked ``IN`` queries; unknown ids are omitted."""
+        ids = list(dict.fromkeys(twin_ids))
+        twins: dict[int, TwinNode] = {}
+        for start in range(0, len(ids), _IN_CHUNK_SIZE):
+            chunk = ids[start : start + _IN_CHUNK_SIZE]
+            for twin in self.session.scalars(select(TwinNode).where(TwinNode.id.in_(chunk))):
+                twins[twin.id] = twin
+        return twins
+
     def update_twin(
         self,
         dtmi: str,
         display_name: Optional[str] = None,
         model_version: Optional[str] = None,
     ) -> Optional[TwinNode]:
-        twin = self.get_twin_by_dtmi(dtmi)
-        if not twin:
-            return None
+        values = {}
         if display_name is not None:
-            twin.display_name = display_name
+            values["display_name"] = display_name
         if model_version is not None:
-            twin.model_version = model_version
-        return self._commit_and_refresh(twin)
+            values["model_version"] = model_version
+        if not values:
+            return self.get_twin_by_dtmi(dtmi)
+        return self._update_returning(TwinNode, TwinNode.dtmi == dtmi, values)
 
     def delete_twin_by_dtmi(self, dtmi: str) -> bool:
-        twin = self.get_twin_by_dtmi(dtmi)
-        if not twin:
-            return False
-        self.session.delete(twin)
-        self._commit()
-        return True
+        return self._delete_twin(TwinNode.dtmi == dtmi)
 
     def list_twins(self) -> Iterable[TwinNode]:
-        return self.session.scalars(select(TwinNode)).all()
+        return self._stream(select(TwinNode))
 
     def delete_twin(self, twin_id: int) -> None:
-        twin = self.session.get(TwinNode, twin_id)
-        if twin:
-            self.session.delete(twin)
-            self._commit()
+        self._delete_twin(TwinNode.id == twin_id)
 
     # RelationshipEdge
     def add_relationship(
@@ -78,8 +167,25 @@ class StoreRepository:
         self.session.add(edge)
         return self._commit_and_refresh(edge)
 
+    def add_relationships(self, rows: Iterable[dict[str, Any]]) -> int:
+        """
+        Insert many edges (``source_id``, ``target_id``, optional ``name``) in one commit.
+
+        Only flushes inside ``transaction()``.
+        """
+        edges = [
+            {
+                "source_id": row["source_id"],
+                "target_id": row["target_id"],
+                "name": row.get("name"),
+            }
+            for row in rows
+        ]
+        self._insert_returning_ids(RelationshipEdge, edges)
+        return len(edges)
+
     def list_relationships(self) -> Iterable[RelationshipEdge]:
-        return self.session.scalars(select(RelationshipEdge)).all()
+        return self._stream(select(RelationshipEdge))
 
     def get_relationship_by_id(self, edge_id: int) -> Optional[RelationshipEdge]:
         return self.session.get(RelationshipEdge, edge_id)
@@ -87,21 +193,19 @@ class StoreRepository:
     def update_relationship_name(
         self, edge_id: int, name: Optional[str]
     ) -> Optional[RelationshipEdge]:
-        edge = self.get_relationship_by_id(edge_id)
-        if not edge:
-            return None
-        edge.name = name
-        return self._commit_and_refresh(edge)
+        return self._update_returning(
+            RelationshipEdge, RelationshipEdge.id == edge_id, {"name": name}
+        )
 
     def get_relationships_for_source(self, source_id: int) -> Iterable[RelationshipEdge]:
-        return self.session.scalars(
-            select(RelationshipEdge).where(RelationshipEdge.source_id == source_id)
-        ).all()
+        return self.session.scalars(_EDGES_FOR_SOURCE, {"node_id": source_id}).all()
 
     def get_relationships_for_target(self, target_id: int) -> Iterable[RelationshipEdge]:
-        return self.session.scalars(
-            select(RelationshipEdge).where(RelationshipEdge.target_id == target_id)
-        ).all()
+        return self.session.scalars(_EDGES_FOR_TARGET, {"node_id": target_id}).all()
+
+    def get_relationships_for_node(self, node_id: int) -> Iterable[RelationshipEdge]:
+        """Edges touching ``node_id`` in one query: outgoing first, then incoming."""
+        return self.session.scalars(_EDGES_FOR_NODE, {"node_id": node_id}).all()
 
     # FileObject
     def add_file_object(
@@ -117,8 +221,27 @@ class StoreRepository:
         self.session.add(file_obj)
         return self._commit_and_refresh(file_obj)
 
+    def add_file_objects(self, rows: Iterable[dict[str, Any]]) -> list[int]:
+        """
+        Insert many file objects with a single commit and return their ids.
+
+        Rows take ``path`` plus the optional ``media_type``, ``version`` and
+        ``twin_id`` of ``add_file_object``; ids are returned in row order.
+        """
+        files = [
+            {
+                "path": row["path"],
+                "media_type": row.get("media_type"),
+                "version": row.get("version"),
+                "twin_id": row.get("twin_id"),
+            }
+            for row in rows
+        ]
+        return self._insert_returning_ids(FileObject, files)
+
     def list_file_objects(self) -> Iterable[FileObject]:
-        return self.session.scalars(select(FileObject)).all()
+        # Attached twins come in one extra IN query instead of a lookup per file.
+        return self._stream(select(FileObject).options(selectinload(FileObject.twin_node)))
 
     def get_file_object_by_id(self, file_id: int) -> Optional[FileObject]:
         return self.session.get(FileObject, file_id)
@@ -139,35 +262,82 @@ class StoreRepository:
             file_obj.media_type = media_type
         if version is not None:
             file_obj.version = version
-        return self._commit_and_refresh(file_obj)
+        self._commit_and_refresh(file_obj)
+        # Changing the foreign key does not update an already-loaded relationship.
+        self.session.expire(file_obj, ["twin_node"])
+        return file_obj
 
     # ExtractedObject
     def add_extracted_object(
         self, file_object_id: int, kind: str, data: dict
     ) -> ExtractedObject:
-        extracted = ExtractedObject(file_object_id=file_object_id, kind=kind, data=data)
+        extracted = ExtractedObject(
+            file_object_id=file_object_id,
+            kind=kind,
+            data=data,
+            content_hash=(
+                None
+                if kind in UNHASHED_KINDS
+                else content_hash(data if isinstance(data, dict) else {})
+            ),
+        )
         self.session.add(extracted)
         return self._commit_and_refresh(extracted)
 
     def list_extracted_objects(self) -> Iterable[ExtractedObject]:
-        return self.session.scalars(select(ExtractedObject)).all()
+        return self._stream(select(ExtractedObject))
 
     def list_extracted_objects_for_file(
         self,
         file_object_id: int,
         kind: Optional[str] = None,
         newest_first: bool = True,
+        limit: Optional[int] = None,
     ) -> Iterable[ExtractedObject]:
         stmt = select(ExtractedObject).where(ExtractedObject.file_object_id == file_object_id)
         if kind is not None:
             stmt = stmt.where(ExtractedObject.kind == kind)
         order_column = ExtractedObject.id.desc() if newest_first else ExtractedObject.id
         stmt = stmt.order_by(order_column)
+        if limit is not None:
+            stmt = stmt.limit(limit)
         return self.session.scalars(stmt).all()
 
+    def list_extracted_dt_keys_for_file(self, file_object_id: int) -> list[tuple[int, str]]:
+        """
+        Return flat ``(extracted_object_id, dt_key)`` pairs, newest object first.
+
+        SQLite's ``json_each`` unnests ``data["dt_keys"]`` in the query itself, so no
+        payload is hydrated or deserialized; non-string entries are skipped and
+        keys keep their stored order (duplicates included).
+        """
+        dt_keys = func.json_each(ExtractedObject.data, "$.dt_keys").table_valued(
+            "key", "value", "type"
+        )
+        stmt = (
+            select(ExtractedObject.id, dt_keys.c.value)
+            .join(dt_keys, true())
+            .where(ExtractedObject.file_object_id == file_object_id, dt_keys.c.type == "text")
+            .order_by(ExtractedObject.id.desc(), dt_keys.c.key)
+        )
+        return [(row[0], row[1]) for row in self.session.execute(stmt)]
+
     def get_extracted_object_by_id(self, extracted_object_id: int) -> Optional[ExtractedObject]:
         return self.session.get(ExtractedObject, extracted_object_id)
 
+    def get_extracted_objects_by_ids(
+        self, extracted_object_ids: Iterable[int]
+    ) -> dict[int, ExtractedObject]:
+        """Load many extracted objects in chunked ``IN`` queries; unknown ids are omitted."""
+        ids = list(dict.fromkeys(extracted_object_ids))
+        objects: dict[int, ExtractedObject] = {}
+        for start in range(0, len(ids), _IN_CHUNK_SIZE):
+            chunk = ids[start : start + _IN_CHUNK_SIZE]
+            stmt = select(ExtractedObject).where(ExtractedObject.id.in_(chunk))
+            for extracted in self.session.scalars(stmt):
+                objects[extracted.id] = extracted
+        return objects
+
     # ModelDocument
     def add_model_document(
         self, name: str, content: str, dtmi: Optional[str] = None
@@ -177,19 +347,17 @@ class StoreRepository:
         return self._commit_and_refresh(doc)
 
     def list_model_documents(self) -> Iterable[ModelDocument]:
-        return self.session.scalars(select(ModelDocument)).all()
+        return self._stream(select(ModelDocument))
 
     def get_model_document_by_dtmi(self, dtmi: str) -> Optional[ModelDocument]:
-        return self.session.scalar(select(ModelDocument).where(ModelDocument.dtmi == dtmi))
+        return self.session.scalar(_MODEL_DOCUMENT_BY_DTMI, {"dtmi": dtmi})
 
     def upsert_model_document(
         self, name: str, content: str, dtmi: Optional[str] = None
     ) -> ModelDocument:
         existing = None
         if dtmi:
-            existing = self.session.scalar(
-                select(ModelDocument).where(ModelDocument.dtmi == dtmi)
-            )
+            existing = self.get_model_document_by_dtmi(dtmi)
         if existing:
             existing.name = name
             existing.content = content
@@ -199,6 +367,43 @@ class StoreRepository:
         self.session.add(doc)
         return self._commit_and_refresh(doc)
 
+    def upsert_model_documents(self, rows: Iterable[dict[str, Any]]) -> int:
+        """
+        Bulk variant of ``upsert_model_document`` committing once (only flushing
+        inside ``transaction()``).
+
+        Rows carry ``name``, ``content`` and optional ``dtmi``; rows sharing a DTMI
+        update the same document, matching repeated single upserts.
+        """
+        rows = list(rows)
+        if not rows:
+            return 0
+        dtmis = [row["dtmi"] for row in rows if row.get("dtmi")]
+        existing: dict[str, ModelDocument] = {}
+        for start in range(0, len(dtmis), _IN_CHUNK_SIZE):
+            chunk = dtmis[start : start + _IN_CHUNK_SIZE]
+            stmt = (
+                select(ModelDocument)
+                .where(ModelDocument.dtmi.in_(chunk))
+                .order_by(ModelDocument.id)
+            )
+            for doc in self.session.scalars(stmt):
+                existing.setdefault(doc.dtmi, doc)
+
+        for row in rows:
+            dtmi = row.get("dtmi")
+            doc = existing.get(dtmi) if dtmi else None
+            if doc is not None:
+                doc.name = row["name"]
+                doc.content = row["content"]
+                continue
+            doc = ModelDocument(name=row["name"], content=row["content"], dtmi=dtmi)
+            self.session.add(doc)
+            if dtmi:
+                existing[dtmi] = doc
+        self._commit()
+        return len(rows)
+
     # Stitch candidates
     def add_stitch_candidate(
         self,
@@ -222,6 +427,15 @@ class StoreRepository:
         self.session.add(candidate)
         return self._commit_and_refresh(candidate)
 
+    def add_stitch_candidates(self, rows: Iterable[dict[str, Any]]) -> list[int]:
+        """
+        Insert many stitch candidates with a single commit and return their ids.
+
+        Rows take the same keys as ``add_stitch_candidate``; ids are returned in
+        row order.
+        """
+        return self._insert_returning_ids(StitchCandidate, list(rows))
+
     def list_stitch_candidates(
         self,
         *,
@@ -269,33 +483,116 @@ class StoreRepository:
 
     # Validation payloads
     def set_twin_validation(self, dtmi: str, payload: Optional[dict]) -> Optional[TwinNode]:
-        twin = self.get_twin_by_dtmi(dtmi)
-        if not twin:
-            return None
-        twin.validation = payload
-        return self._commit_and_refresh(twin)
+        return self._update_returning(TwinNode, TwinNode.dtmi == dtmi, {"validation": payload})
 
     def set_edge_validation(
         self, edge_id: int, payload: Optional[dict]
     ) -> Optional[RelationshipEdge]:
-        edge = self.get_relationship_by_id(edge_id)
-        if not edge:
-            return None
-        edge.validation = payload
-        return self._commit_and_refresh(edge)
+        return self._update_returning(
+            RelationshipEdge, RelationshipEdge.id == edge_id, {"validation": payload}
+        )
 
-    def _commit(self) -> None:
+    # Change tracking
+    def snapshot_version(self) -> tuple[Any, ...]:
+        """
+        Cheap token that changes whenever twins, edges or model documents change.
+
+        Row counts catch deletes; ``max(updated_at)`` catches inserts and updates.
+        """
+        row = self.session.execute(
+            select(
+                *(
+                    select(agg).scalar_subquery()
+                    for model in (TwinNode, RelationshipEdge, ModelDocument)
+                    for agg in (func.count(model.id), func.max(model.updated_at))
+                )
+            )
+        ).one()
+        return tuple(row)
+
+    def _twins_by_dtmis(self, dtmis: Sequence[str]) -> list[TwinNode]:
+        twins: list[TwinNode] = []
+        for start in range(0, len(dtmis), _IN_CHUNK_SIZE):
+            chunk = dtmis[start : start + _IN_CHUNK_SIZE]
+            twins.extend(self.session.scalars(select(TwinNode).where(TwinNode.dtmi.in_(chunk))))
+        return twins
+
+    def _delete_twin(self, criterion) -> bool:
+        # Set-based DELETEs that mirror the ORM cascades on TwinNode (edges on either
+        # end, attached files and their extractions and stitches) without loading
+        # the twin or any of its collections first.
+        try:
+            twin_id = self.session.scalar(
+                delete(TwinNode).where(criterion).returning(TwinNode.id)
+            )
+            if twin_id is None:
+                return False
+            file_ids = select(FileObject.id).where(FileObject.twin_id == twin_id)
+            for stmt in (
+                delete(StitchCandidate).where(StitchCandidate.file_object_id.in_(file_ids)),
+                delete(ExtractedObject).where(ExtractedObject.file_object_id.in_(file_ids)),
+                delete(FileObject).where(FileObject.twin_id == twin_id),
+                delete(RelationshipEdge).where(
+                    or_(
+                        RelationshipEdge.source_id == twin_id,
+                        RelationshipEdge.target_id == twin_id,
+                    )
+                ),
+            ):
+                self.session.execute(stmt)
+        except Exception:
+            self.session.rollback()
+            raise
+        self._commit()
+        return True
+
+    def _update_returning(self, model: type, criterion, values: dict[str, Any]):
+        # A single UPDATE ... RETURNING replaces the SELECT, attribute writes and
+        # flush; rows already in the identity map are refreshed from the result.
+        stmt = update(model).where(criterion).values(values).returning(model)
         try:
-            self.session.commit()
+            obj = self.session.scalars(stmt).one_or_none()
         except Exception:
             self.session.rollback()
             raise
+        if obj is None:
+            return None
+        return self._commit_and_refresh(obj)
+
+    def _insert_returning_ids(self, model: type, rows: list[dict[str, Any]]) -> list[int]:
+        # One Core INSERT ... RETURNING for the whole batch (SQLAlchemy splits it into
+        # multi-row VALUES statements) instead of building ORM instances for the unit
+        # of work. Every row must carry the same keys.
+        if not rows:
+            return []
+        stmt = insert(model).returning(model.id, sort_by_parameter_order=True)
+        try:
+            ids = list(self.session.scalars(stmt, rows))
+        except Exception:
+            self.session.rollback()
+            raise
+        self._commit()
+        return ids
 
-    def _commit_and_refresh(self, obj):
+    def _stream(self, stmt) -> Iterable[Any]:
+        # A one-pass result loaded in batches while the caller iterates, so listing a
+        # large table does not hold every row in memory first. Callers that need
+        # len(), indexing or a second pass wrap it in list().
+        return self.session.scalars(stmt.execution_options(yield_per=_STREAM_BATCH_SIZE))
+
+    def _commit(self) -> None:
         try:
-            self.session.commit()
-            self.session.refresh(obj)
-            return obj
+            if self._tx_depth:
+                self.session.flush()
+            else:
+                self.session.commit()
         except Exception:
             self.session.rollback()
             raise
+
+    def _commit_and_refresh(self, obj):
+        # No refresh: the flush assigns the primary key and every column default is
+        # Python-side, and sessions do not expire on commit, so the instance already
+        # holds exactly what was written.
+        self._commit()
+        return obj
@@ -3,13 +3,13 @@ from __future__ import annotations
 import logging
 import os
 import platform
-import shlex
-import shutil
 import subprocess
 from dataclasses import dataclass
 from pathlib import Path
 from typing import Optional
 
+from cymise.extract.external import find_executable, split_command
+
 logger = logging.getLogger(__name__)
 
 
@@ -67,11 +67,10 @@ def launch_tool(
     if configured_path:
         return _spawn([configured_path, str(file_path)], f"{tool} via configured path")
 
-    candidates = _candidate_executables(tool)
-    for candidate in candidates:
-        found = shutil.which(candidate)
-        if found:
-            return _spawn([found, str(file_path)], f"{tool} via {candidate}")
+    # PATH lookups are memoized per PATH value, so repeated launches skip the scan.
+    found = find_executable(tuple(_candidate_executables(tool)))
+    if found:
+        return _spawn([found, str(file_path)], f"{tool} via {Path(found).name}")
 
     # Fallback to default app
     return open_with_default_app(file_path)
@@ -88,7 +87,7 @@ def _env_command(tool: str) -> Optional[list[str]]:
     value = os.getenv(env_var)
     if not value:
         return None
-    return shlex.split(value)
+    return split_command(value)
 
 
 def _candidate_executables(tool: str) -> list[str]:
@@ -101,7 +100,15 @@ def _candidate_executables(tool: str) -> list[str]:
 
 def _spawn(cmd: list[str], context: str) -> ToolLaunchResult:
     try:
-        subprocess.Popen(cmd)  # noqa: S603,S607
+        # Detached from our session and stdio, without inheriting open descriptors.
+        subprocess.Popen(  # noqa: S603,S607
+            cmd,
+            close_fds=True,
+            start_new_session=True,
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+        )
         return ToolLaunchResult(ok=True, message=f"Launched {context}.", command=cmd)
     except Exception as exc:  # pragma: no cover - defensive
         msg = f"Failed to launch {context}: {exc}"
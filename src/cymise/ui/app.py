@@ -3,7 +3,7 @@ from __future__ import annotations
 import sys
 from typing import Optional
 
-from PySide6 import QtWidgets
+from PySide6 import QtCore, QtWidgets
 
 from cymise.graph.service import GraphService
 
@@ -19,7 +19,14 @@ def run_app(graph_service: GraphService, *, argv: Optional[list[str]] = None) ->
     """
 
     args = argv if argv is not None else sys.argv
-    app = QtWidgets.QApplication.instance() or QtWidgets.QApplication(args)
+    app = QtWidgets.QApplication.instance()
+    if app is None:
+        # Qt WebEngine needs shared OpenGL contexts set before the application
+        # exists; the graph canvas module itself is imported lazily by MainWindow.
+        QtCore.QCoreApplication.setAttribute(
+            QtCore.Qt.ApplicationAttribute.AA_ShareOpenGLContexts
+        )
+        app = QtWidgets.QApplication(args)
     window = MainWindow(graph_service)
     window.show()
     return app.exec()
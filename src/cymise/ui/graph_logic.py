@@ -0,0 +1,53 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Mapping, Optional
+
+# Above this share of changed elements one rebuild (with layout) is cheaper for the
+# canvas than applying every change individually.
+_FULL_REBUILD_RATIO = 0.5
+
+
+@dataclass(slots=True)
+class GraphDelta:
+    changed_nodes: list[dict]
+    removed_nodes: list[str]
+    changed_edges: list[dict]
+    removed_edges: list[str]
+
+
+def index_payload(payload: dict) -> tuple[dict[str, dict], dict[str, dict]]:
+    """Key the nodes and edges of a ``build_graph_payload`` result by id."""
+    nodes = {node["id"]: node for node in payload.get("nodes", ())}
+    edges = {edge["id"]: edge for edge in payload.get("edges", ())}
+    return nodes, edges
+
+
+def diff_graph_payload(
+    sent_nodes: Mapping[str, dict],
+    sent_edges: Mapping[str, dict],
+    nodes: Mapping[str, dict],
+    edges: Mapping[str, dict],
+) -> Optional[GraphDelta]:
+    """
+    Compare the elements last sent to the canvas with the current ones.
+
+    Returns the new or changed elements and the removed ids, or None when so much
+    changed that the whole graph should be sent again instead.
+    """
+    delta = GraphDelta(
+        changed_nodes=[node for key, node in nodes.items() if sent_nodes.get(key) != node],
+        removed_nodes=[key for key in sent_nodes if key not in nodes],
+        changed_edges=[edge for key, edge in edges.items() if sent_edges.get(key) != edge],
+        removed_edges=[key for key in sent_edges if key not in edges],
+    )
+    touched = (
+        len(delta.changed_nodes)
+        + len(delta.removed_nodes)
+        + len(delta.changed_edges)
+        + len(delta.removed_edges)
+    )
+    total = max(len(nodes) + len(edges), len(sent_nodes) + len(sent_edges))
+    if touched > total * _FULL_REBUILD_RATIO:
+        return None
+    return delta
@@ -2,6 +2,15 @@ from __future__ import annotations
 
 from typing import Sequence, Set
 
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - depends on optional dependency
+    np = None
+
+# Below this many records building the arrays costs more than the sort it replaces.
+_VECTORIZE_MIN_RECORDS = 256
+_BUCKET_NAMES = ("low", "medium", "high")
+
 
 def severity_bucket(value: float) -> str:
     if value >= 0.75:
@@ -11,20 +20,71 @@ def severity_bucket(value: float) -> str:
     return "low"
 
 
+def rank_impacts(records: Sequence[dict], *, copy: bool = True) -> list[dict]:
+    """
+    Copy, bucket and sort ``records`` once, most severe (then most confident) first.
+
+    Records that already carry ``_severity_bucket`` keep it. With ``copy=False``
+    the bucket is stamped on the records themselves instead of on shallow copies;
+    only pass it for records the caller owns. The result can be narrowed
+    repeatedly with ``filter_ranked_impacts`` when only the filters change,
+    without repeating the copies and the sort.
+    """
+    if np is not None and len(records) >= _VECTORIZE_MIN_RECORDS:
+        return _rank_impacts_vectorized(records, copy)
+    ranked = []
+    for rec in records:
+        if copy:
+            rec = dict(rec)
+        if "_severity_bucket" not in rec:
+            rec["_severity_bucket"] = severity_bucket(float(rec.get("severity", 0.0)))
+        ranked.append(rec)
+    # key= is evaluated once per record (not per comparison), so precomputing the
+    # keys or decorating the list saves nothing here.
+    ranked.sort(key=lambda r: (-float(r.get("severity", 0.0)), -float(r.get("confidence", 0.0))))
+    return ranked
+
+
+def _rank_impacts_vectorized(records: Sequence[dict], copy: bool) -> list[dict]:
+    count = len(records)
+    severity = np.fromiter(
+        (float(rec.get("severity", 0.0)) for rec in records), dtype=float, count=count
+    )
+    confidence = np.fromiter(
+        (float(rec.get("confidence", 0.0)) for rec in records), dtype=float, count=count
+    )
+    # Same thresholds as severity_bucket: 0 low, 1 medium, 2 high. Summing the two
+    # comparisons avoids the temporaries of nested np.where calls.
+    buckets = (severity >= 0.4).astype(np.uint8) + (severity >= 0.75).astype(np.uint8)
+    # lexsort is stable and treats its last key as the primary one, matching the
+    # (-severity, -confidence) sort of the pure-Python path.
+    order = np.lexsort((-confidence, -severity))
+    ranked = []
+    for index, code in zip(order.tolist(), buckets[order].tolist()):
+        rec = dict(records[index]) if copy else records[index]
+        rec.setdefault("_severity_bucket", _BUCKET_NAMES[code])
+        ranked.append(rec)
+    return ranked
+
+
+def filter_ranked_impacts(
+    ranked: Sequence[dict],
+    severity_filter: Set[str],
+    include_propagated: bool = True,
+) -> list[dict]:
+    # The sort is stable, so filtering a ranked list keeps the order that ranking
+    # the filtered records would give.
+    return [
+        rec
+        for rec in ranked
+        if (include_propagated or not rec.get("is_propagated"))
+        and (not severity_filter or rec["_severity_bucket"] in severity_filter)
+    ]
+
+
 def rank_and_filter_impacts(
     records: Sequence[dict],
     severity_filter: Set[str],
     include_propagated: bool = True,
 ) -> list[dict]:
-    filtered = []
-    for rec in records:
-        if not include_propagated and rec.get("is_propagated"):
-            continue
-        bucket = severity_bucket(float(rec.get("severity", 0.0)))
-        if severity_filter and bucket not in severity_filter:
-            continue
-        rec_copy = dict(rec)
-        rec_copy["_severity_bucket"] = bucket
-        filtered.append(rec_copy)
-    filtered.sort(key=lambda r: (-float(r.get("severity", 0.0)), -float(r.get("confidence", 0.0))))
-    return filtered
+    return filter_ranked_impacts(rank_impacts(records), severity_filter, include_propagated)
@@ -1,15 +1,19 @@
 from __future__ import annotations
 
-from PySide6 import QtWidgets
+from typing import TYPE_CHECKING, Optional
+
+from PySide6 import QtCore, QtWidgets
 
 from cymise.graph.service import GraphService
 
 from .views.artifacts_view import ArtifactsView
-from .views.graph_view import GraphView
 from .views.properties_panel import PropertiesPanel
 from .views.impact_view import ImpactView
 from .views.validation_view import ValidationView
 
+if TYPE_CHECKING:
+    from .views.graph_view import GraphView
+
 
 class MainWindow(QtWidgets.QMainWindow):
     """Minimal desktop shell with tabbed views."""
@@ -17,26 +21,40 @@ class MainWindow(QtWidgets.QMainWindow):
     def __init__(self, graph_service: GraphService):
         super().__init__()
         self.setWindowTitle("CyMiSE Desktop")
+        self.graph_service = graph_service
+        # Built on first use: loading Qt WebEngine dominates startup, so the
+        # canvas is created after the window has been shown (see showEvent).
+        self.graph_view: Optional[GraphView] = None
 
         self.tabs = QtWidgets.QTabWidget()
-        self.tabs.addTab(self._build_graph_tab(graph_service), "Graph")
+        self.graph_tab = self._build_graph_tab(graph_service)
+        self.tabs.addTab(self.graph_tab, "Graph")
         self.validation_view = ValidationView(graph_service, parent=self)
         self.artifacts_view = ArtifactsView(
             graph_service, get_selected_dtmi=lambda: self._current_selected_dtmi()
         )
         self.impact_view = ImpactView(
             graph_service,
-            highlight_node=lambda dtmi: self.graph_view.select_element("node", dtmi),
+            highlight_node=lambda dtmi: self._ensure_graph_view().select_element("node", dtmi),
             parent=self,
         )
         self.tabs.addTab(self.artifacts_view, "Artifacts")
         self.tabs.addTab(self.validation_view, "Validation")
         self.tabs.addTab(self.impact_view, "Impact")
 
+        # Switching to the Validation tab refreshes it after a short delay, and only
+        # when the store changed since the last refresh, so flipping through tabs
+        # does not rescan the store each time.
+        self._validation_version: Optional[tuple] = None
+        self._validation_refresh_timer = QtCore.QTimer(self)
+        self._validation_refresh_timer.setSingleShot(True)
+        self._validation_refresh_timer.setInterval(150)
+        self._validation_refresh_timer.timeout.connect(self._refresh_validation_if_stale)
+
         self.setCentralWidget(self.tabs)
         self.tabs.currentChanged.connect(self._on_tab_changed)
         self.validation_view.issueActivated.connect(self._on_validation_issue_activated)
-        self.validation_view.refresh_from_store(graph_service)
+        self._refresh_validation()
 
     def _build_graph_tab(self, graph_service: GraphService) -> QtWidgets.QWidget:
         container = QtWidgets.QWidget()
@@ -50,10 +68,10 @@ class MainWindow(QtWidgets.QMainWindow):
         button_row.addStretch(1)
         layout.addLayout(button_row)
 
-        splitter = QtWidgets.QSplitter()
-        self.graph_view = GraphView(graph_service, parent=container)
+        self._graph_splitter = QtWidgets.QSplitter()
+        splitter = self._graph_splitter
         self.properties_panel = PropertiesPanel(graph_service, parent=container)
-        splitter.addWidget(self.graph_view)
+        splitter.addWidget(QtWidgets.QLabel("Loading graph..."))
         splitter.addWidget(self.properties_panel)
         splitter.setStretchFactor(0, 3)
         splitter.setStretchFactor(1, 1)
@@ -61,10 +79,28 @@ class MainWindow(QtWidgets.QMainWindow):
 
         add_node_btn.clicked.connect(self._add_interface)
         add_edge_btn.clicked.connect(self._add_relationship)
-        self.graph_view.selectionChanged.connect(self._on_selection_changed)
 
         return container
 
+    def _ensure_graph_view(self) -> GraphView:
+        if self.graph_view is None:
+            # Imported here so QtWebEngineWidgets is only loaded once the canvas is needed.
+            from .views.graph_view import GraphView
+
+            graph_view = GraphView(self.graph_service, parent=self.graph_tab)
+            placeholder = self._graph_splitter.replaceWidget(0, graph_view)
+            if placeholder is not None:
+                placeholder.deleteLater()
+            graph_view.selectionChanged.connect(self._on_selection_changed)
+            self.graph_view = graph_view
+        return self.graph_view
+
+    def showEvent(self, event) -> None:
+        super().showEvent(event)
+        if self.graph_view is None and self.tabs.currentWidget() is self.graph_tab:
+            # Let the window paint before the WebEngine canvas is built.
+            QtCore.QTimer.singleShot(0, self._ensure_graph_view)
+
     def _placeholder_tab(self, label: str) -> QtWidgets.QWidget:
         widget = QtWidgets.QWidget()
         layout = QtWidgets.QVBoxLayout(widget)
@@ -88,8 +124,8 @@ class MainWindow(QtWidgets.QMainWindow):
         if not ok or not dtmi:
             return
         display_name, _ = QtWidgets.QInputDialog.getText(self, "Add Interface", "Display Name:")
-        self.graph_view.graph_service.create_twin(dtmi, display_name=display_name or None)
-        self.graph_view.update_nodes(
+        self.graph_service.create_twin(dtmi, display_name=display_name or None)
+        self._ensure_graph_view().update_nodes(
             [
                 {
                     "id": dtmi,
@@ -126,10 +162,8 @@ class MainWindow(QtWidgets.QMainWindow):
                 return
 
         name, _ = QtWidgets.QInputDialog.getText(self, "Add Relationship", "Name:")
-        edge = self.graph_view.graph_service.create_relationship(
-            source, target, name=name or None
-        )
-        self.graph_view.update_edges(
+        edge = self.graph_service.create_relationship(source, target, name=name or None)
+        self._ensure_graph_view().update_edges(
             [
                 {
                     "id": str(edge.id),
@@ -142,19 +176,36 @@ class MainWindow(QtWidgets.QMainWindow):
         )
 
     def _on_tab_changed(self, index: int) -> None:
+        if self.tabs.widget(index) is self.graph_tab:
+            if self.graph_view is None:
+                self._ensure_graph_view()
+            else:
+                # Pick up changes made from the other tabs.
+                self.graph_view.refresh_graph()
         if self.tabs.widget(index) is self.validation_view:
-            self.validation_view.refresh_from_store(self.graph_view.graph_service)
+            self._validation_refresh_timer.start()
         if self.tabs.widget(index) is self.artifacts_view:
             self.artifacts_view.refresh_from_store()
         if self.tabs.widget(index) is self.impact_view:
             self.impact_view.refresh_artifacts()
 
+    def _refresh_validation_if_stale(self) -> None:
+        if self.tabs.currentWidget() is not self.validation_view:
+            return
+        if self.graph_service.snapshot_version() != self._validation_version:
+            self._refresh_validation()
+
+    def _refresh_validation(self) -> None:
+        # Versioned before reading, so a change made during the refresh is picked up
+        # by the next one.
+        self._validation_version = self.graph_service.snapshot_version()
+        self.validation_view.refresh_from_store(self.graph_service)
 
     def _on_validation_issue_activated(self, kind: str, element_id: str) -> None:
         self.tabs.setCurrentIndex(0)
         if kind == "node":
             self.properties_panel.show_node(element_id)
-            self.graph_view.select_element("node", element_id)
+            self._ensure_graph_view().select_element("node", element_id)
         elif kind == "edge":
             self.properties_panel.show_edge(element_id)
-            self.graph_view.select_element("edge", element_id)
+            self._ensure_graph_view().select_element("edge", element_id)
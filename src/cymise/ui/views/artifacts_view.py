@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+from pathlib import Path
 from typing import Callable, Optional
 
 from PySide6 import QtWidgets
@@ -7,6 +8,9 @@ from PySide6 import QtWidgets
 from cymise.graph.service import GraphService
 from cymise.tools.launcher import launch_tool
 
+# Native editor per file suffix; anything else opens with the default application.
+_SUFFIX_TO_TOOL = {".fcstd": "freecad", ".kicad_pcb": "kicad", ".kicad_sch": "kicad"}
+
 
 class ArtifactsView(QtWidgets.QWidget):
     """Minimal artifact registry view."""
@@ -52,13 +56,24 @@ class ArtifactsView(QtWidgets.QWidget):
 
     def refresh_from_store(self) -> None:
         files = self.graph_service.list_file_objects()
-        self.table.setRowCount(len(files))
-        for row, f in enumerate(files):
-            self.table.setItem(row, 0, QtWidgets.QTableWidgetItem(str(f["id"])))
-            self.table.setItem(row, 1, QtWidgets.QTableWidgetItem(f.get("path") or ""))
-            self.table.setItem(row, 2, QtWidgets.QTableWidgetItem(f.get("media_type") or ""))
-            self.table.setItem(row, 3, QtWidgets.QTableWidgetItem(f.get("version") or ""))
-            self.table.setItem(row, 4, QtWidgets.QTableWidgetItem(f.get("twin_dtmi") or ""))
+        # Fill the table with repaints and item signals suspended so a refresh costs
+        # one relayout instead of one per cell.
+        self.table.setUpdatesEnabled(False)
+        self.table.blockSignals(True)
+        try:
+            self.table.setRowCount(len(files))
+            for row, f in enumerate(files):
+                self.table.setItem(row, 0, QtWidgets.QTableWidgetItem(str(f["id"])))
+                self.table.setItem(row, 1, QtWidgets.QTableWidgetItem(f.get("path") or ""))
+                self.table.setItem(
+                    row, 2, QtWidgets.QTableWidgetItem(f.get("media_type") or "")
+                )
+                self.table.setItem(row, 3, QtWidgets.QTableWidgetItem(f.get("version") or ""))
+                self.table.setItem(row, 4, QtWidgets.QTableWidgetItem(f.get("twin_dtmi") or ""))
+        finally:
+            self.table.blockSignals(False)
+            self.table.setUpdatesEnabled(True)
+            self.table.viewport().update()
 
     def _selected_file_id(self) -> Optional[int]:
         items = self.table.selectedItems()
@@ -70,11 +85,11 @@ class ArtifactsView(QtWidgets.QWidget):
             return None
 
     def _add_file(self) -> None:
-        path, _ = QtWidgets.QFileDialog.getOpenFileName(self, "Select Artifact")
-        if not path:
+        paths, _ = QtWidgets.QFileDialog.getOpenFileNames(self, "Select Artifacts")
+        if not paths:
             return
         dtmi = self.get_selected_dtmi()
-        self.graph_service.add_file_object(path=path, twin_dtmi=dtmi)
+        self.graph_service.add_file_objects(paths, twin_dtmi=dtmi)
         self.refresh_from_store()
 
     def _attach(self) -> None:
@@ -127,9 +142,4 @@ class ArtifactsView(QtWidgets.QWidget):
 
     @staticmethod
     def _infer_tool(path: str) -> str:
-        lower = path.lower()
-        if lower.endswith(".fcstd"):
-            return "freecad"
-        if lower.endswith(".kicad_pcb") or lower.endswith(".kicad_sch"):
-            return "kicad"
-        return "default"
+        return _SUFFIX_TO_TOOL.get(Path(path).suffix.lower(), "default")
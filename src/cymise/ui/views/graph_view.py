@@ -1,14 +1,21 @@
 from __future__ import annotations
 
-import json
 from pathlib import Path
+from typing import Optional
 
 from PySide6 import QtCore, QtWebChannel, QtWebEngineWidgets, QtWidgets
 
+from cymise import fastjson
 from cymise.graph.service import GraphService
 
+from ..graph_logic import diff_graph_payload, index_payload
 from ..web.graph_canvas_bridge import GraphCanvasBridge
 
+# Resolved once; every GraphView loads the same bundled page.
+_CANVAS_URL = QtCore.QUrl.fromLocalFile(
+    str(Path(__file__).resolve().parent.parent / "web" / "graph_canvas.html")
+)
+
 
 class GraphView(QtWidgets.QWidget):
     """Graph tab hosting the WebEngine canvas."""
@@ -18,6 +25,12 @@ class GraphView(QtWidgets.QWidget):
     def __init__(self, graph_service: GraphService, parent: QtWidgets.QWidget | None = None):
         super().__init__(parent)
         self.graph_service = graph_service
+        # Nodes and edges last sent to the page, by id; None until the page has them.
+        self._sent_nodes: Optional[dict[str, dict]] = None
+        self._sent_edges: Optional[dict[str, dict]] = None
+        # Last built payload and the store snapshot version it reflects; rebuilt only
+        # once the store has changed since.
+        self._payload_cache: Optional[tuple[tuple, dict]] = None
 
         layout = QtWidgets.QVBoxLayout(self)
         self._view = QtWebEngineWidgets.QWebEngineView(self)
@@ -30,13 +43,12 @@ class GraphView(QtWidgets.QWidget):
 
         self._bridge.graph_requested.connect(self._send_graph_data)
         self._bridge.selection_changed.connect(self._on_selection_changed)
+        self._view.loadStarted.connect(self._forget_sent_graph)
         self._view.loadFinished.connect(self._on_load_finished)
         self._load_canvas()
 
     def _load_canvas(self) -> None:
-        html_path = Path(__file__).resolve().parent.parent / "web" / "graph_canvas.html"
-        url = QtCore.QUrl.fromLocalFile(str(html_path))
-        self._view.setUrl(url)
+        self._view.setUrl(_CANVAS_URL)
 
     def _on_load_finished(self, ok: bool) -> None:
         if not ok:
@@ -46,9 +58,43 @@ class GraphView(QtWidgets.QWidget):
         self._send_graph_data()
 
     def _send_graph_data(self) -> None:
-        payload = build_graph_payload(self.graph_service)
+        # Sent whole: the page asked for the graph or has just loaded, so it has none.
+        payload = self._graph_payload()
+        self._sent_nodes, self._sent_edges = index_payload(payload)
         self._bridge.graph_data.emit(payload)
 
+    def _forget_sent_graph(self) -> None:
+        self._sent_nodes = self._sent_edges = None
+
+    def refresh_graph(self) -> None:
+        """Bring the canvas up to date, sending only what changed since the last send."""
+        if self._sent_nodes is None or self._sent_edges is None:
+            self._send_graph_data()
+            return
+        cached = self._payload_cache
+        payload = self._graph_payload()
+        if cached is not None and payload is cached[1]:
+            # the page already shows this payload
+            return
+        nodes, edges = index_payload(payload)
+        delta = diff_graph_payload(self._sent_nodes, self._sent_edges, nodes, edges)
+        self._sent_nodes, self._sent_edges = nodes, edges
+        if delta is None:
+            self._bridge.graph_data.emit(payload)
+            return
+        self.apply_batch(
+            update_nodes=delta.changed_nodes,
+            remove_nodes=delta.removed_nodes,
+            update_edges=delta.changed_edges,
+            remove_edges=delta.removed_edges,
+        )
+
+    def _graph_payload(self) -> dict:
+        version = self.graph_service.snapshot_version()
+        if self._payload_cache is None or self._payload_cache[0] != version:
+            self._payload_cache = (version, build_graph_payload(self.graph_service))
+        return self._payload_cache[1]
+
     def _on_selection_changed(self, element_id: str, kind: str) -> None:
         self.selectionChanged.emit(element_id, kind)
 
@@ -64,6 +110,36 @@ class GraphView(QtWidgets.QWidget):
     def remove_edges(self, edge_ids: list[str]) -> None:
         self._run_js("window.cyRemoveEdges && window.cyRemoveEdges", edge_ids)
 
+    def apply_batch(
+        self,
+        *,
+        add_nodes: Optional[list[dict]] = None,
+        update_nodes: Optional[list[dict]] = None,
+        remove_nodes: Optional[list[str]] = None,
+        add_edges: Optional[list[dict]] = None,
+        update_edges: Optional[list[dict]] = None,
+        remove_edges: Optional[list[str]] = None,
+        validation: Optional[dict[str, str]] = None,
+    ) -> None:
+        """
+        Apply several canvas changes in one page call.
+
+        The page removes edges before nodes and upserts nodes before edges, so the
+        sections may describe one consistent delta. Empty sections are not sent.
+        """
+        sections = {
+            "add_nodes": add_nodes,
+            "update_nodes": update_nodes,
+            "remove_nodes": remove_nodes,
+            "add_edges": add_edges,
+            "update_edges": update_edges,
+            "remove_edges": remove_edges,
+            "validation": validation,
+        }
+        batch = {name: value for name, value in sections.items() if value}
+        if batch:
+            self._run_js("window.cyBatchUpdate && window.cyBatchUpdate", batch)
+
     def apply_validation_styles(self, mapping: dict[str, str]) -> None:
         self._run_js("window.cyApplyValidation && window.cyApplyValidation", mapping)
 
@@ -75,36 +151,39 @@ class GraphView(QtWidgets.QWidget):
 
     def _run_js(self, func_prefix: str, payload: object) -> None:
         try:
-            encoded = json.dumps(payload)
+            # orjson when installed; its encode error subclasses TypeError.
+            encoded = fastjson.dumps(payload).decode("utf-8")
         except (TypeError, ValueError):
             return
         self._view.page().runJavaScript(f"{func_prefix}({encoded});")
 
 
 def build_graph_payload(graph_service: GraphService) -> dict:
-    nodes = graph_service.list_nodes()
-    edges = graph_service.repo.list_relationships()
-
-    node_payloads = [
-        {
-            "id": node.dtmi,
-            "label": node.display_name or node.dtmi,
-            "validation": node.validation or {},
-        }
-        for node in nodes
-    ]
+    # Edge endpoints resolve from the twins already listed for the nodes instead of
+    # two repository lookups per edge.
+    node_payloads = []
+    dtmi_by_id: dict[int, str] = {}
+    for twin in graph_service.repo.list_twins():
+        dtmi_by_id[twin.id] = twin.dtmi
+        node_payloads.append(
+            {
+                "id": twin.dtmi,
+                "label": twin.display_name or twin.dtmi,
+                "validation": twin.validation or {},
+            }
+        )
 
     edge_payloads = []
-    for edge in edges:
-        source = graph_service.repo.get_twin_by_id(edge.source_id)
-        target = graph_service.repo.get_twin_by_id(edge.target_id)
+    for edge in graph_service.repo.list_relationships():
+        source = dtmi_by_id.get(edge.source_id)
+        target = dtmi_by_id.get(edge.target_id)
         if not source or not target:
             continue
         edge_payloads.append(
             {
                 "id": str(edge.id),
-                "source": source.dtmi,
-                "target": target.dtmi,
+                "source": source,
+                "target": target,
                 "label": edge.name or "",
                 "validation": edge.validation or {},
             }
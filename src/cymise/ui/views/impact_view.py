@@ -2,10 +2,10 @@ from __future__ import annotations
 
 from typing import Callable, Iterable, Optional
 
-from PySide6 import QtCore, QtWidgets
+from PySide6 import QtCore, QtGui, QtWidgets
 
 from cymise.graph.service import GraphService
-from cymise.ui.impact_logic import rank_and_filter_impacts, severity_bucket
+from cymise.ui.impact_logic import filter_ranked_impacts, rank_impacts, severity_bucket
 
 
 class ImpactView(QtWidgets.QWidget):
@@ -21,6 +21,11 @@ class ImpactView(QtWidgets.QWidget):
         self.graph_service = graph_service
         self.highlight_node = highlight_node
         self._current_result: Optional[dict] = None
+        # Records of the current result, bucketed and ranked once when it arrives,
+        # and the filtered views already shown, so toggling a filter does not
+        # re-copy, re-bucket or re-sort every record.
+        self._ranked: list[dict] = []
+        self._filtered: dict[tuple[frozenset[str], bool], list[dict]] = {}
 
         self.artifact_combo = QtWidgets.QComboBox()
         self.kind_combo = QtWidgets.QComboBox()
@@ -37,8 +42,10 @@ class ImpactView(QtWidgets.QWidget):
         self.refresh_btn = QtWidgets.QPushButton("Compute Impact")
         self.message_label = QtWidgets.QLabel("")
 
-        self.table = QtWidgets.QTableWidget(0, 4)
-        self.table.setHorizontalHeaderLabels(["DTMI", "Severity", "Confidence", "Evidence"])
+        self.model = QtGui.QStandardItemModel(0, 4)
+        self.model.setHorizontalHeaderLabels(["DTMI", "Severity", "Confidence", "Evidence"])
+        self.table = QtWidgets.QTableView()
+        self.table.setModel(self.model)
         self.table.horizontalHeader().setStretchLastSection(True)
         self.table.setSelectionBehavior(QtWidgets.QAbstractItemView.SelectionBehavior.SelectRows)
         self.table.setEditTriggers(QtWidgets.QAbstractItemView.EditTrigger.NoEditTriggers)
@@ -68,7 +75,7 @@ class ImpactView(QtWidgets.QWidget):
         self.med_cb.stateChanged.connect(self._apply_filters)
         self.low_cb.stateChanged.connect(self._apply_filters)
         self.show_propagated_cb.stateChanged.connect(self._apply_filters)
-        self.table.itemSelectionChanged.connect(self._on_row_selected)
+        self.table.selectionModel().selectionChanged.connect(self._on_row_selected)
 
         self.refresh_artifacts()
 
@@ -107,20 +114,34 @@ class ImpactView(QtWidgets.QWidget):
             result = self.graph_service.compute_impact_for_file(file_id, kind)
         except Exception as exc:  # non-fatal UI
             self._show_message(f"Impact computation failed: {exc}")
-            self._current_result = None
+            self._set_result(None)
             self._populate_table([])
             return
 
         if not result:
             self._show_message("Not enough revisions to compute impact.")
-            self._current_result = None
+            self._set_result(None)
             self._populate_table([])
             return
 
-        self._current_result = result
+        self._set_result(result)
         self._show_message(result.get("summary", ""))  # type: ignore[arg-type]
         self._apply_filters()
 
+    def _set_result(self, result: Optional[dict]) -> None:
+        self._current_result = result
+        # The result is built fresh for this view, so its records are bucketed in
+        # place rather than copied.
+        self._ranked = (
+            rank_impacts(
+                list(result.get("impacted", [])) + list(result.get("propagated", [])),
+                copy=False,
+            )
+            if result
+            else []
+        )
+        self._filtered.clear()
+
     def _apply_filters(self) -> None:
         if not self._current_result:
             self._populate_table([])
@@ -135,35 +156,27 @@ class ImpactView(QtWidgets.QWidget):
             if cb.isChecked()
         }
         include_propagated = self.show_propagated_cb.isChecked()
-        combined = list(self._current_result.get("impacted", [])) + list(
-            self._current_result.get("propagated", [])
-        )
-        ranked = rank_and_filter_impacts(combined, severity_filter, include_propagated)
+        key = (frozenset(severity_filter), include_propagated)
+        ranked = self._filtered.get(key)
+        if ranked is None:
+            ranked = filter_ranked_impacts(self._ranked, severity_filter, include_propagated)
+            self._filtered[key] = ranked
         self._populate_table(ranked)
 
     def _populate_table(self, records: Iterable[dict]) -> None:
-        recs = list(records)
-        self.table.setRowCount(len(recs))
-        for row_idx, rec in enumerate(recs):
-            dtmi = rec.get("dtmi", "") or ""
-            severity = f"{rec.get('severity', 0):.2f}"
-            confidence = f"{rec.get('confidence', 0):.2f}"
-            evidences = rec.get("evidences", []) or []
-            summary_parts = []
-            for ev in evidences:
-                kind = ev.get("kind") if isinstance(ev, dict) else None
-                detail = ev.get("detail") if isinstance(ev, dict) else None
-                if kind and detail:
-                    summary_parts.append(f"{kind}: {detail}")
-                elif kind:
-                    summary_parts.append(kind)
-            summary = "; ".join(summary_parts)
-
-            self.table.setItem(row_idx, 0, QtWidgets.QTableWidgetItem(dtmi))
-            self.table.setItem(row_idx, 1, QtWidgets.QTableWidgetItem(severity))
-            self.table.setItem(row_idx, 2, QtWidgets.QTableWidgetItem(confidence))
-            self.table.setItem(row_idx, 3, QtWidgets.QTableWidgetItem(summary))
-            self.table.item(row_idx, 0).setData(QtCore.Qt.ItemDataRole.UserRole, rec)
+        # Rows are rebuilt inside one model reset with the model's signals blocked,
+        # so the view relayouts once instead of reacting to every inserted row.
+        self.table.setUpdatesEnabled(False)
+        self.model.beginResetModel()
+        self.model.blockSignals(True)
+        try:
+            self.model.setRowCount(0)
+            for rec in records:
+                self.model.appendRow(_impact_row(rec))
+        finally:
+            self.model.blockSignals(False)
+            self.model.endResetModel()
+            self.table.setUpdatesEnabled(True)
 
     def _selected_file_id(self) -> Optional[int]:
         return self.artifact_combo.currentData(QtCore.Qt.ItemDataRole.UserRole)
@@ -179,14 +192,38 @@ class ImpactView(QtWidgets.QWidget):
         if self._selected_file_id() is not None and self._selected_kind():
             self.compute_impact()
 
-    def _on_row_selected(self) -> None:
-        items = self.table.selectedItems()
-        if not items:
+    def _on_row_selected(self, *_args) -> None:
+        rows = self.table.selectionModel().selectedRows()
+        if not rows:
             return
-        row_item = items[0]
-        rec = row_item.data(QtCore.Qt.ItemDataRole.UserRole)
+        rec = self.model.item(rows[0].row(), 0).data(QtCore.Qt.ItemDataRole.UserRole)
         if isinstance(rec, dict) and rec.get("dtmi"):
             self.highlight_node(rec["dtmi"])
 
     def _show_message(self, text: str) -> None:
         self.message_label.setText(text)
+
+
+def _impact_row(rec: dict) -> list[QtGui.QStandardItem]:
+    dtmi = rec.get("dtmi", "") or ""
+    severity = f"{rec.get('severity', 0):.2f}"
+    confidence = f"{rec.get('confidence', 0):.2f}"
+    evidences = rec.get("evidences", []) or []
+    summary_parts = []
+    for ev in evidences:
+        kind = ev.get("kind") if isinstance(ev, dict) else None
+        detail = ev.get("detail") if isinstance(ev, dict) else None
+        if kind and detail:
+            summary_parts.append(f"{kind}: {detail}")
+        elif kind:
+            summary_parts.append(kind)
+    summary = "; ".join(summary_parts)
+
+    items = [
+        QtGui.QStandardItem(dtmi),
+        QtGui.QStandardItem(severity),
+        QtGui.QStandardItem(confidence),
+        QtGui.QStandardItem(summary),
+    ]
+    items[0].setData(rec, QtCore.Qt.ItemDataRole.UserRole)
+    return items
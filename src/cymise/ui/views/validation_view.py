@@ -3,12 +3,17 @@ from __future__ import annotations
 from dataclasses import dataclass
 from typing import Optional
 
-from PySide6 import QtCore, QtWidgets
+from PySide6 import QtCore, QtGui, QtWidgets
 
 from cymise.graph.service import GraphService
+from cymise.store.db import get_session
+from cymise.store.repo import StoreRepository
 
+_SHOWN_SEVERITIES = frozenset({"error", "warning"})
+_CYMISE_CODE_PREFIXES = ("dt_", "cymise_")
 
-@dataclass
+
+@dataclass(slots=True)
 class ValidationRow:
     model_id: str
     severity: str
@@ -30,10 +35,18 @@ class ValidationView(QtWidgets.QWidget):
         super().__init__(parent)
         self.graph_service = graph_service
         self._model_groups: dict[str, list[ValidationRow]] = {}
+        # Groups are built on a pool thread; a refresh requested while one runs is
+        # remembered and started when it lands, so passes never overlap.
+        self._refresh_running = False
+        self._pending_refresh: Optional[GraphService] = None
+        self._refresh_signals = _RefreshSignals(self)
+        self._refresh_signals.finished.connect(self._on_refresh_finished)
 
         self.models_list = QtWidgets.QListWidget()
-        self.issues_table = QtWidgets.QTableWidget(0, 5)
-        self.issues_table.setHorizontalHeaderLabels(["Severity", "Message", "Path", "Code", "Category"])
+        self.issues_model = QtGui.QStandardItemModel(0, 5)
+        self.issues_model.setHorizontalHeaderLabels(["Severity", "Message", "Path", "Code", "Category"])
+        self.issues_table = QtWidgets.QTableView()
+        self.issues_table.setModel(self.issues_model)
         self.issues_table.horizontalHeader().setStretchLastSection(True)
         self.issues_table.setSelectionBehavior(QtWidgets.QAbstractItemView.SelectionBehavior.SelectRows)
         self.issues_table.setEditTriggers(QtWidgets.QAbstractItemView.EditTrigger.NoEditTriggers)
@@ -48,13 +61,33 @@ class ValidationView(QtWidgets.QWidget):
         layout.addWidget(splitter)
 
         self.models_list.currentItemChanged.connect(self._on_model_selected)
-        self.issues_table.itemDoubleClicked.connect(self._on_issue_activated)
+        self.issues_table.doubleClicked.connect(self._on_issue_activated)
 
     def refresh_from_store(self, graph_service: Optional[GraphService] = None) -> None:
         svc = graph_service or self.graph_service
-        self._model_groups = extract_validation_groups(svc)
+        engine = _background_engine(svc)
+        if engine is None:
+            self._apply_groups(extract_validation_groups(svc))
+            return
+        if self._refresh_running:
+            self._pending_refresh = svc
+            return
+        self._refresh_running = True
+        worker = _ValidationWorker(engine, self._refresh_signals)
+        QtCore.QThreadPool.globalInstance().start(worker)
+
+    def _on_refresh_finished(self, groups: Optional[dict]) -> None:
+        self._refresh_running = False
+        if groups is not None:
+            self._apply_groups(groups)
+        pending, self._pending_refresh = self._pending_refresh, None
+        if pending is not None:
+            self.refresh_from_store(pending)
+
+    def _apply_groups(self, groups: dict[str, list[ValidationRow]]) -> None:
+        self._model_groups = groups
         self._populate_models()
-        self.issues_table.setRowCount(0)
+        self.issues_model.setRowCount(0)
 
     def _populate_models(self) -> None:
         self.models_list.clear()
@@ -74,34 +107,86 @@ class ValidationView(QtWidgets.QWidget):
         self._populate_issues(rows)
 
     def _populate_issues(self, rows: list[ValidationRow]) -> None:
-        self.issues_table.setRowCount(len(rows))
-        for idx, row in enumerate(rows):
-            self.issues_table.setItem(idx, 0, QtWidgets.QTableWidgetItem(row.severity))
-            self.issues_table.setItem(idx, 1, QtWidgets.QTableWidgetItem(row.message))
-            self.issues_table.setItem(idx, 2, QtWidgets.QTableWidgetItem(row.path or ""))
-            self.issues_table.setItem(idx, 3, QtWidgets.QTableWidgetItem(row.code or ""))
-            self.issues_table.setItem(idx, 4, QtWidgets.QTableWidgetItem(row.category))
-            # stash metadata
-            self.issues_table.item(idx, 0).setData(QtCore.Qt.ItemDataRole.UserRole, row)
-
-    def _on_issue_activated(self, item: QtWidgets.QTableWidgetItem) -> None:
-        row = item.data(QtCore.Qt.ItemDataRole.UserRole)
+        # One model reset with signals blocked, so the table relayouts once per fill.
+        self.issues_table.setUpdatesEnabled(False)
+        self.issues_model.beginResetModel()
+        self.issues_model.blockSignals(True)
+        try:
+            self.issues_model.setRowCount(0)
+            for row in rows:
+                items = [
+                    QtGui.QStandardItem(row.severity),
+                    QtGui.QStandardItem(row.message),
+                    QtGui.QStandardItem(row.path or ""),
+                    QtGui.QStandardItem(row.code or ""),
+                    QtGui.QStandardItem(row.category),
+                ]
+                # stash metadata
+                items[0].setData(row, QtCore.Qt.ItemDataRole.UserRole)
+                self.issues_model.appendRow(items)
+        finally:
+            self.issues_model.blockSignals(False)
+            self.issues_model.endResetModel()
+            self.issues_table.setUpdatesEnabled(True)
+
+    def _on_issue_activated(self, index: QtCore.QModelIndex) -> None:
+        item = self.issues_model.item(index.row(), 0)
+        row = item.data(QtCore.Qt.ItemDataRole.UserRole) if item else None
         if isinstance(row, ValidationRow):
             self.issueActivated.emit(row.kind, row.element_id)
 
 
+class _RefreshSignals(QtCore.QObject):
+    finished = QtCore.Signal(object)  # groups, or None when the pass failed
+
+
+class _ValidationWorker(QtCore.QRunnable):
+    """Builds validation groups on a pool thread through its own session."""
+
+    def __init__(self, engine, signals: _RefreshSignals):
+        super().__init__()
+        self._engine = engine
+        self._signals = signals
+
+    def run(self) -> None:
+        session = get_session(self._engine)
+        try:
+            groups = extract_validation_groups(GraphService(StoreRepository(session)))
+        except Exception:
+            groups = None
+        finally:
+            session.close()
+        try:
+            self._signals.finished.emit(groups)
+        except RuntimeError:
+            # the view was deleted while the worker ran
+            pass
+
+
+def _background_engine(graph_service: GraphService):
+    # Sessions are not thread-safe, so the worker opens its own on the same engine;
+    # an in-memory database is private to its connection and is read in place.
+    session = getattr(graph_service.repo, "session", None)
+    engine = session.get_bind() if session is not None else None
+    if engine is None or engine.url.database in (None, "", ":memory:"):
+        return None
+    return engine
+
+
 def extract_validation_groups(graph_service: GraphService) -> dict[str, list[ValidationRow]]:
     groups: dict[str, list[ValidationRow]] = {}
+    # Edge rows are grouped under their source twin, resolved from this map rather
+    # than a repository lookup per edge.
+    dtmi_by_id: dict[int, str] = {}
 
     for twin in graph_service.repo.list_twins():
+        dtmi_by_id[twin.id] = twin.dtmi
         rows = _rows_from_payload(twin.validation, model_id=twin.dtmi, kind="node", element_id=twin.dtmi)
         if rows:
             groups.setdefault(twin.dtmi, []).extend(rows)
 
     for edge in graph_service.repo.list_relationships():
-        source = graph_service.repo.get_twin_by_id(edge.source_id)
-        target = graph_service.repo.get_twin_by_id(edge.target_id)
-        model_id = source.dtmi if source else ""
+        model_id = dtmi_by_id.get(edge.source_id, "")
         rows = _rows_from_payload(
             edge.validation,
             model_id=model_id,
@@ -123,20 +208,23 @@ def _rows_from_payload(
 ) -> list[ValidationRow]:
     if not payload:
         return []
-    issues = payload.get("issues", [])
+    # A "cymise" payload categorizes every issue; otherwise each issue's code does.
+    cymise_payload = payload.get("category") == "cymise"
     rows: list[ValidationRow] = []
-    for issue in issues:
+    for issue in payload.get("issues") or ():
         if not isinstance(issue, dict):
             continue
         severity = (issue.get("severity") or "").lower()
-        if severity not in ("error", "warning"):
+        if severity not in _SHOWN_SEVERITIES:
             continue
         code = issue.get("code")
-        category = _issue_category(code, payload)
-        model = issue.get("model_id") or issue.get("modelId") or model_id
+        if cymise_payload or (code and code.startswith(_CYMISE_CODE_PREFIXES)):
+            category = "cymise"
+        else:
+            category = "dtdl"
         rows.append(
             ValidationRow(
-                model_id=model,
+                model_id=issue.get("model_id") or issue.get("modelId") or model_id,
                 severity=severity,
                 message=issue.get("message") or "",
                 path=issue.get("path"),
@@ -147,11 +235,3 @@ def _rows_from_payload(
             )
         )
     return rows
-
-
-def _issue_category(code: Optional[str], payload: dict) -> str:
-    if payload.get("category") == "cymise":
-        return "cymise"
-    if code and (code.startswith("dt_") or code.startswith("cymise_")):
-        return "cymise"
-    return "dtdl"
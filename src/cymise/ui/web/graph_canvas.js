@@ -166,6 +166,18 @@
       });
     };
 
+    // One call for a whole delta; edges are removed before nodes and upserted
+    // after them so no edge is left pointing at a missing node.
+    window.cyBatchUpdate = (batch) => {
+      if (!cy || !batch) return;
+      cy.batch(() => {
+        window.cyRemoveEdges(batch.remove_edges);
+        window.cyRemoveNodes(batch.remove_nodes);
+        window.cyUpdateNodes([...(batch.add_nodes || []), ...(batch.update_nodes || [])]);
+        window.cyUpdateEdges([...(batch.add_edges || []), ...(batch.update_edges || [])]);
+        window.cyApplyValidation(batch.validation);
+      });
+    };
 
     window.cyApplyValidation = (map) => {
       if (!cy || !map) return;
@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import hashlib
+import os
 import threading
 import time
 from dataclasses import dataclass
@@ -11,8 +12,25 @@ from cymise.graph.service import GraphService
 
 from .job_queue import JobQueue, ParseJob
 
+try:
+    import xxhash
+except ImportError:  # pragma: no cover - depends on optional dependency
+    xxhash = None
+
+try:
+    from watchdog.events import FileSystemEventHandler
+    from watchdog.observers import Observer
+except ImportError:  # pragma: no cover - depends on optional dependency
+    FileSystemEventHandler = object
+    Observer = None
+
 ChangeKind = Literal["created", "modified", "deleted"]
 
+# Large reads keep the hash's inner loop, not Python call overhead, dominant.
+_HASH_CHUNK_SIZE = 1 << 20
+# watchdog event types that can change a tracked file's content or existence.
+_NATIVE_EVENT_TYPES = frozenset({"created", "modified", "deleted", "moved", "closed"})
+
 
 @dataclass(slots=True)
 class FileChangeEvent:
@@ -26,7 +44,12 @@ class FileChangeEvent:
 class WatcherConfig:
     debounce_ms: int = 500
     scan_interval_ms: int = 1000
-    hash_algo: str = "sha256"
+    # Change detection only, so a fast non-cryptographic hash is enough (sha256
+    # when xxhash is not installed); any hashlib algorithm name also works.
+    hash_algo: str = "xxh3_128"
+    # With watchdog installed, files in watchable directories are only rechecked
+    # after an OS change notification instead of on every scan.
+    native_events: bool = True
 
 
 class FileWatcher:
@@ -41,6 +64,10 @@ class FileWatcher:
 
         self._state: dict[int, dict] = {}
         self._lock = threading.Lock()
+        # Native notification state: set by the observer thread, drained by _run.
+        self._wake = threading.Event()
+        self._dirty_paths: set[str] = set()
+        self._watches: dict[str, object] = {}
 
     @property
     def is_running(self) -> bool:
@@ -55,42 +82,119 @@ class FileWatcher:
 
     def stop(self) -> None:
         self._stop_event.set()
+        self._wake.set()
         if self._thread and self._thread.is_alive():
             self._thread.join(timeout=2)
 
     def _run(self) -> None:
         debounce = self.config.debounce_ms / 1000.0
         interval = max(self.config.scan_interval_ms / 1000.0, 0.05)
-        while not self._stop_event.is_set():
-            now = time.monotonic()
-            files = self.graph_service.list_file_objects()
-            seen_ids = set()
-            for f in files:
-                file_id = f["id"]
-                seen_ids.add(file_id)
-                path = Path(f["path"])
-                exists = path.exists()
-                last = self._state.get(file_id)
-                if not exists:
-                    self._mark_change(file_id, str(path), "deleted", now)
-                    continue
-                file_hash = self._hash_file(path)
-                if last is None:
-                    self._mark_change(file_id, str(path), "created", now, file_hash)
-                elif last.get("hash") != file_hash:
-                    self._mark_change(file_id, str(path), "modified", now, file_hash)
-                else:
-                    # no change
-                    pass
+        observer = self._start_observer()
+        try:
+            while not self._stop_event.is_set():
+                now = time.monotonic()
+                files = self.graph_service.list_file_objects()
+                if observer is not None:
+                    self._sync_watches(observer, files)
+                self._wake.clear()
+                with self._lock:
+                    dirty, self._dirty_paths = self._dirty_paths, set()
+                seen_ids = set()
+                for f in files:
+                    file_id = f["id"]
+                    seen_ids.add(file_id)
+                    path = Path(f["path"])
+                    if observer is not None and self._is_quiet(file_id, path, dirty):
+                        continue
+                    self._check_file(file_id, path, now)
 
-            # detect deleted for previously seen files not in current list
-            for file_id, state in list(self._state.items()):
-                if file_id not in seen_ids and state.get("exists", False):
-                    self._mark_change(file_id, state.get("path", ""), "deleted", now)
+                # detect deleted for previously seen files not in current list
+                for file_id, state in list(self._state.items()):
+                    if file_id not in seen_ids and state.get("exists", False):
+                        self._mark_change(file_id, state.get("path", ""), "deleted", now)
 
-            self._flush_ready(now, debounce)
+                self._flush_ready(now, debounce)
 
-            self._stop_event.wait(interval)
+                self._wake.wait(self._next_wait(interval, debounce))
+        finally:
+            if observer is not None:
+                observer.stop()
+                observer.join(timeout=2)
+                self._watches.clear()
+
+    def _check_file(self, file_id: int, path: Path, now: float) -> None:
+        last = self._state.get(file_id)
+        try:
+            st = path.stat()
+        except OSError:
+            if last is None or last.get("exists"):
+                self._mark_change(file_id, str(path), "deleted", now)
+            return
+        signature = (st.st_mtime_ns, st.st_size)
+        if last and last.get("exists") and last.get("signature") == signature:
+            # unchanged mtime and size: skip reading the content
+            return
+        file_hash = self._hash_file(path)
+        if last is None:
+            self._mark_change(file_id, str(path), "created", now, file_hash, signature)
+        elif last.get("hash") != file_hash:
+            self._mark_change(file_id, str(path), "modified", now, file_hash, signature)
+        elif last.get("exists"):
+            # touched without a content change
+            with self._lock:
+                last["signature"] = signature
+
+    def _is_quiet(self, file_id: int, path: Path, dirty: set[str]) -> bool:
+        # A file needs no check when it is known, its directory is watched and no
+        # notification arrived for it since the last pass.
+        last = self._state.get(file_id)
+        if last is None or last.get("path") != str(path):
+            return False
+        key = _path_key(path)
+        return key not in dirty and os.path.dirname(key) in self._watches
+
+    def _start_observer(self):
+        if Observer is None or not self.config.native_events:
+            return None
+        observer = Observer()
+        try:
+            observer.start()
+        except OSError:
+            return None
+        return observer
+
+    def _sync_watches(self, observer, files: list[dict]) -> None:
+        # Watch the directories of tracked files (non-recursively); files whose
+        # directory cannot be watched are stat-polled as before.
+        wanted = {os.path.dirname(_path_key(f["path"])) for f in files}
+        for directory in set(self._watches) - wanted:
+            try:
+                observer.unschedule(self._watches.pop(directory))
+            except (KeyError, OSError):
+                pass
+        new_dirs = wanted - set(self._watches)
+        handler = _ChangeHandler(self) if new_dirs else None
+        for directory in new_dirs:
+            try:
+                watch = observer.schedule(handler, directory, recursive=False)
+            except OSError:
+                continue
+            self._watches[directory] = watch
+
+    def _note_paths(self, *paths) -> None:
+        keys = {_path_key(p) for p in paths if p}
+        with self._lock:
+            self._dirty_paths.update(keys)
+        self._wake.set()
+
+    def _next_wait(self, interval: float, debounce: float) -> float:
+        # Wake for the earliest pending debounce deadline rather than a full interval.
+        with self._lock:
+            pending = [e["pending_at"] for e in self._state.values() if e.get("pending_at")]
+        if not pending:
+            return interval
+        remaining = min(pending) + debounce - time.monotonic()
+        return min(max(remaining, 0.005), interval)
 
     def _mark_change(
         self,
@@ -99,6 +203,7 @@ class FileWatcher:
         change: ChangeKind,
         now: float,
         file_hash: Optional[str] = None,
+        signature: Optional[tuple[int, int]] = None,
     ) -> None:
         with self._lock:
             entry = self._state.get(file_id, {})
@@ -115,6 +220,7 @@ class FileWatcher:
                     "pending_change": change,
                     "pending_at": ts,
                     "hash": file_hash if file_hash is not None else entry.get("hash"),
+                    "signature": signature,
                     "exists": change != "deleted",
                 }
             )
@@ -147,13 +253,34 @@ class FileWatcher:
             entry["last_change"] = change
 
     def _hash_file(self, path: Path) -> str:
-        h = hashlib.new(self.config.hash_algo)
+        if self.config.hash_algo == "xxh3_128":
+            # without the optional extra keep sha256, hardware-accelerated on most CPUs
+            h = xxhash.xxh3_128() if xxhash is not None else hashlib.sha256()
+        else:
+            h = hashlib.new(self.config.hash_algo)
         with path.open("rb") as f:
-            for chunk in iter(lambda: f.read(8192), b""):
+            for chunk in iter(lambda: f.read(_HASH_CHUNK_SIZE), b""):
                 h.update(chunk)
         return h.hexdigest()
 
 
+class _ChangeHandler(FileSystemEventHandler):
+    """Forwards watchdog file events to the watcher as paths to recheck."""
+
+    def __init__(self, watcher: FileWatcher):
+        super().__init__()
+        self._watcher = watcher
+
+    def on_any_event(self, event) -> None:
+        if event.is_directory or event.event_type not in _NATIVE_EVENT_TYPES:
+            return
+        self._watcher._note_paths(event.src_path, getattr(event, "dest_path", ""))
+
+
+def _path_key(path) -> str:
+    return os.path.normcase(os.path.abspath(os.fsdecode(path)))
+
+
 def start_watcher(graph_service: GraphService, config: Optional[WatcherConfig] = None) -> FileWatcher:
     watcher = FileWatcher(graph_service, config=config)
     watcher.start()
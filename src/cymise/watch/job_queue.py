@@ -1,10 +1,19 @@
 from __future__ import annotations
 
+import dataclasses
+import heapq
+import itertools
 import queue
+import threading
 import time
 from dataclasses import dataclass
 from typing import Any, Optional
 
+# Lower runs first: a deletion makes any pending reparse moot, and new files
+# matter more than edits to files already parsed.
+_REASON_PRIORITY = {"deleted": 0, "created": 1, "modified": 2}
+_DEFAULT_PRIORITY = 3
+
 
 @dataclass(slots=True)
 class ParseJob:
@@ -16,16 +25,49 @@ class ParseJob:
 
 
 class JobQueue:
-    """Simple in-memory FIFO for parse jobs."""
+    """
+    In-memory parse job queue that keeps at most one pending job per file.
+
+    Enqueueing for a file that already has a pending job replaces it with the newer
+    job, which keeps the earlier ``queued_at``, so a burst of saves costs one
+    reparse. Jobs come out by reason (deleted, created, modified), oldest first.
+    """
 
     def __init__(self):
-        self._queue: queue.Queue[ParseJob] = queue.Queue()
+        self._heap: list[tuple[int, float, int, int]] = []
+        # file_id -> (sequence number of its live heap entry, job); heap entries
+        # whose sequence no longer matches were superseded and are skipped.
+        self._pending: dict[int, tuple[int, ParseJob]] = {}
+        self._counter = itertools.count()
+        self._not_empty = threading.Condition(threading.Lock())
 
     def enqueue(self, job: ParseJob) -> None:
-        self._queue.put(job)
+        with self._not_empty:
+            previous = self._pending.get(job.file_id)
+            if previous is not None and previous[1].queued_at < job.queued_at:
+                job = dataclasses.replace(job, queued_at=previous[1].queued_at)
+            seq = next(self._counter)
+            priority = _REASON_PRIORITY.get(job.reason, _DEFAULT_PRIORITY)
+            self._pending[job.file_id] = (seq, job)
+            heapq.heappush(self._heap, (priority, job.queued_at, seq, job.file_id))
+            self._not_empty.notify()
 
     def get(self, timeout: Optional[float] = None) -> ParseJob:
-        return self._queue.get(timeout=timeout)
+        """Pop the next job, blocking like ``queue.Queue.get`` (raises ``queue.Empty``)."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._not_empty:
+            while not self._pending:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    raise queue.Empty
+                self._not_empty.wait(remaining)
+            while True:
+                _priority, _queued_at, seq, file_id = heapq.heappop(self._heap)
+                entry = self._pending.get(file_id)
+                if entry is not None and entry[0] == seq:
+                    del self._pending[file_id]
+                    return entry[1]
 
     def empty(self) -> bool:
-        return self._queue.empty()
+        with self._not_empty:
+            return not self._pending
@@ -1,10 +1,26 @@
 from __future__ import annotations
 
+import gc
 import sys
 from pathlib import Path
 
+import pytest
+
 ROOT = Path(__file__).resolve().parents[1]
 SRC = ROOT / "src"
 
 if str(SRC) not in sys.path:
     sys.path.insert(0, str(SRC))
+
+
+@pytest.fixture(autouse=True)
+def _settle_qt_threads():
+    yield
+    # Widgets left behind by a test are cyclic garbage. Drain the Qt thread pool and
+    # collect them here, on the GUI thread; a collection that happens to run on a
+    # pool thread would finalize them off-thread and crash Qt.
+    if "PySide6.QtCore" in sys.modules:
+        from PySide6 import QtCore
+
+        QtCore.QThreadPool.globalInstance().waitForDone()
+        gc.collect()
@@ -0,0 +1,21 @@
+from __future__ import annotations
+
+import pytest
+
+pytest.importorskip("PySide6.QtWidgets")
+
+from cymise.ui.views.artifacts_view import ArtifactsView
+
+
+@pytest.mark.parametrize(
+    ("path", "tool"),
+    [
+        ("/models/part.FCStd", "freecad"),
+        ("board.kicad_pcb", "kicad"),
+        ("C:\\boards\\top.KICAD_SCH", "kicad"),
+        ("notes.txt", "default"),
+        ("archive.fcstd/readme", "default"),
+    ],
+)
+def test_infer_tool_by_suffix(path, tool):
+    assert ArtifactsView._infer_tool(path) == tool
@@ -1,10 +1,26 @@
 from __future__ import annotations
 
 import json
+import sys
 from types import SimpleNamespace
 
 import cymise.dtdl.dotnet_validator as dotnet_validator
-from cymise.dtdl.dotnet_validator import validate_with_dotnet
+from cymise.dtdl.dotnet_validator import DotnetValidatorPool, validate_with_dotnet
+
+_FAKE_SERVER = """
+import sys
+out, inp = sys.stdout.buffer, sys.stdin.buffer
+out.write(b"cymise-dtdl-validator-server/1\\n")
+out.flush()
+while True:
+    header = inp.readline()
+    if not header:
+        break
+    body = inp.read(int(header))
+    resp = b'{"issues": [{"severity": "warning", "message": "%d bytes"}]}' % len(body)
+    out.write(b"%d\\n" % len(resp) + resp)
+    out.flush()
+"""
 
 
 class DummyCompleted(SimpleNamespace):
@@ -89,3 +105,97 @@ def test_bad_json(monkeypatch, tmp_path):
 
     assert len(result.errors) == 1
     assert result.errors[0].code == "invalid_validator_output"
+
+
+def test_input_bytes_piped_to_stdin(monkeypatch):
+    monkeypatch.setenv("CYMISE_DTDL_VALIDATOR_SERVER", "0")
+    dotnet_validator.clear_validator_cache()
+    called = {}
+
+    def fake_run(cmd, **kwargs):
+        called["cmd"] = cmd
+        called["input"] = kwargs.get("input")
+        return DummyCompleted(stdout=b'{"issues": []}', stderr=b"", returncode=0)
+
+    monkeypatch.setattr(dotnet_validator.subprocess, "run", fake_run)
+
+    result = validate_with_dotnet(input_bytes=b"[]")
+
+    assert result.is_ok
+    assert called["cmd"][-2:] == ["--input", "-"]
+    assert called["input"] == b"[]"
+
+
+def test_pool_reuses_server_process(tmp_path):
+    script = tmp_path / "fake_server.py"
+    script.write_text(_FAKE_SERVER, encoding="utf-8")
+    pool = DotnetValidatorPool([sys.executable, str(script)], timeout=10)
+    try:
+        first = pool.validate_bytes(b"[]")
+        pid = pool._proc.pid
+        second = pool.validate_bytes(b"[{}]")
+        assert pool._proc.pid == pid
+    finally:
+        pool.close()
+
+    assert json.loads(first)["issues"][0]["message"] == "2 bytes"
+    assert json.loads(second)["issues"][0]["message"] == "4 bytes"
+    assert pool.supported
+
+
+def test_pool_falls_back_without_server_mode(tmp_path):
+    script = tmp_path / "old_validator.py"
+    script.write_text("import sys; sys.exit(1)", encoding="utf-8")
+    pool = DotnetValidatorPool([sys.executable, str(script)], timeout=10)
+
+    assert pool.validate_bytes(b"[]") is None
+    assert pool.supported is False
+
+
+def test_piped_results_cached_by_payload(monkeypatch):
+    monkeypatch.setenv("CYMISE_DTDL_VALIDATOR_SERVER", "0")
+    dotnet_validator.clear_validator_cache()
+    calls = []
+
+    def fake_run(cmd, **kwargs):
+        calls.append(kwargs.get("input"))
+        payload = {"issues": [{"severity": "error", "message": "bad", "code": "E1"}]}
+        return DummyCompleted(stdout=json.dumps(payload).encode(), returncode=2)
+
+    monkeypatch.setattr(dotnet_validator.subprocess, "run", fake_run)
+
+    first = validate_with_dotnet(input_bytes=b"[1]")
+    first.issues.clear()
+    second = validate_with_dotnet(input_bytes=b"[1]")
+    validate_with_dotnet(input_bytes=b"[2]")
+
+    assert calls == [b"[1]", b"[2]"]
+    assert [issue.code for issue in second.issues] == ["E1"]
+
+
+def test_tool_failures_not_cached(monkeypatch):
+    monkeypatch.setenv("CYMISE_DTDL_VALIDATOR_SERVER", "0")
+    dotnet_validator.clear_validator_cache()
+    calls = []
+
+    def fake_run(cmd, **kwargs):
+        calls.append(cmd)
+        raise FileNotFoundError("dotnet")
+
+    monkeypatch.setattr(dotnet_validator.subprocess, "run", fake_run)
+
+    validate_with_dotnet(input_bytes=b"[]")
+    validate_with_dotnet(input_bytes=b"[]")
+
+    assert len(calls) == 2
+
+
+def test_env_command_parsed_once_per_value(monkeypatch):
+    monkeypatch.setenv("CYMISE_DTDL_VALIDATOR_CMD", "validator --flag")
+    first = dotnet_validator._build_command()
+    first.append("--input")
+
+    assert dotnet_validator._build_command() == ["validator", "--flag"]
+
+    monkeypatch.setenv("CYMISE_DTDL_VALIDATOR_CMD", "other")
+    assert dotnet_validator._build_command() == ["other"]
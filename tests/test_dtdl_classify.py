@@ -0,0 +1,22 @@
+from __future__ import annotations
+
+from cymise.dtdl.classify import filter_keys, first_string, has_type
+
+
+def test_has_type_matches_plain_namespaced_and_list_forms():
+    assert has_type({"@type": "Interface"}, "Interface")
+    assert has_type({"@type": "dtmi:dtdl:class:Interface"}, "Interface") is False
+    assert has_type({"@type": "dtdl.Relationship"}, "Relationship")
+    assert has_type({"@type": ["Telemetry", "Relationship"]}, "Relationship")
+    assert not has_type({"@type": ["Telemetry", 3]}, "Relationship")
+    assert not has_type({"@type": 3}, "Interface")
+    assert not has_type({}, "Interface")
+
+
+def test_first_string_and_filter_keys_preserve_order():
+    assert first_string(["", "b"]) == ""
+    assert first_string([1, "b"]) == "b"
+    assert first_string({"en": "x"}) is None
+
+    item = {"name": "n", "custom": 1, "@type": "Property", "schema": "double"}
+    assert list(filter_keys(item)) == ["name", "@type", "schema"]
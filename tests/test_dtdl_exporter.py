@@ -5,7 +5,7 @@ from pathlib import Path
 
 import pytest
 
-from cymise.dtdl.exporter import export_dtdl
+from cymise.dtdl.exporter import export_dtdl, export_dtdl_to_models
 from cymise.dtdl.validation_types import ValidationResult
 from cymise.graph.service import GraphService
 from cymise.store.db import create_db, get_engine, get_session
@@ -27,7 +27,7 @@ def service(tmp_path):
 
 @pytest.fixture(autouse=True)
 def mock_dotnet(monkeypatch):
-    def _fake_validate(models_path):
+    def _fake_validate(*args, **kwargs):
         return ValidationResult()
 
     monkeypatch.setattr("cymise.dtdl.exporter.validate_with_dotnet", _fake_validate)
@@ -111,3 +111,20 @@ def test_validation_aggregated_without_raising(monkeypatch, service: GraphServic
     assert result.validation.errors
     assert result.counts.invalid_models == 1
     assert out_path.exists()
+
+
+def test_export_cache_invalidated_by_graph_changes(service: GraphService):
+    service.create_twin("dtmi:com:example:a;1", display_name="A")
+    first = export_dtdl_to_models(service)
+    first[0]["displayName"] = "mutated"
+
+    again = export_dtdl_to_models(service)
+    assert again[0]["displayName"] == "A"
+
+    service.update_twin("dtmi:com:example:a;1", display_name="Renamed")
+    assert export_dtdl_to_models(service)[0]["displayName"] == "Renamed"
+
+    service.create_twin("dtmi:com:example:b;1")
+    assert len(export_dtdl_to_models(service)) == 2
+    service.delete_twin("dtmi:com:example:b;1")
+    assert len(export_dtdl_to_models(service)) == 1
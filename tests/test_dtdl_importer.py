@@ -27,7 +27,7 @@ def service(tmp_path):
 
 @pytest.fixture(autouse=True)
 def mock_dotnet(monkeypatch):
-    def _fake_validate(models_path):
+    def _fake_validate(*args, **kwargs):
         return ValidationResult()
 
     monkeypatch.setattr("cymise.dtdl.importer.validate_with_dotnet", _fake_validate)
@@ -123,3 +123,81 @@ def test_invalid_model_recorded_and_document_stored(service: GraphService, tmp_p
     assert result.counts.invalid_models >= 1
     docs = list(service.repo.list_model_documents())
     assert docs and docs[0].dtmi == "dtmi:com:example:invalid;1"
+
+
+def test_array_file_stores_one_document_per_model(service: GraphService, tmp_path):
+    first = {"@id": "dtmi:com:example:a;1", "@type": "Interface", "contents": []}
+    second = {"@id": "dtmi:com:example:b;1", "@type": "Interface", "contents": []}
+    file_path = _write_json(tmp_path / "bundle.json", [first, second])
+
+    import_dtdl(file_path, service)
+
+    doc = service.repo.get_model_document_by_dtmi("dtmi:com:example:b;1")
+    assert doc is not None
+    assert json.loads(doc.content) == second
+
+
+def test_invalid_json_file_reported(service: GraphService, tmp_path):
+    file_path = tmp_path / "broken.json"
+    file_path.write_text('[{"@id": "dtmi:com:example:a;1"}, {', encoding="utf-8")
+
+    result = import_dtdl(file_path, service)
+
+    assert [issue.code for issue in result.validation.issues] == ["invalid_json"]
+    assert result.counts.models_loaded == 0
+
+
+def test_folder_import_parses_files_concurrently(service: GraphService, tmp_path):
+    for idx in range(5):
+        _write_json(
+            tmp_path / f"model_{idx}.json",
+            {"@id": f"dtmi:com:example:m{idx};1", "@type": "Interface", "contents": []},
+        )
+    (tmp_path / "broken.json").write_text("{", encoding="utf-8")
+
+    result = import_dtdl(tmp_path, service)
+
+    assert result.counts.files_scanned == 6
+    assert result.counts.json_docs_parsed == 5
+    assert result.counts.interface_nodes_upserted == 5
+    assert [i.path for i in result.validation.issues if i.code == "invalid_json"] == [
+        str(tmp_path / "broken.json")
+    ]
+
+
+def test_folder_import_walks_nested_directories(service: GraphService, tmp_path):
+    nested = tmp_path / "a" / "b"
+    nested.mkdir(parents=True)
+    _write_json(nested / "deep.json", {"@id": "dtmi:com:example:deep;1", "@type": "Interface"})
+    (tmp_path / "a" / "notes.txt").write_text("ignored", encoding="utf-8")
+    (tmp_path / "dir.json").mkdir()
+
+    result = import_dtdl(tmp_path, service)
+
+    assert result.counts.files_scanned == 1
+    assert service.get_node("dtmi:com:example:deep;1") is not None
+
+
+def test_import_rolls_back_when_a_write_fails(service: GraphService, tmp_path, monkeypatch):
+    models = [
+        {
+            "@id": "dtmi:com:example:a;1",
+            "@type": "Interface",
+            "contents": [
+                {"@type": "Relationship", "name": "feeds", "target": "dtmi:com:example:b;1"}
+            ],
+            "@context": "dtmi:dtdl:context;3",
+        },
+        {"@id": "dtmi:com:example:b;1", "@type": "Interface"},
+    ]
+    file_path = _write_json(tmp_path / "models.json", models)
+
+    def _fail(_rows):
+        raise RuntimeError("edge insert failed")
+
+    monkeypatch.setattr(service.repo, "add_relationships", _fail)
+    with pytest.raises(RuntimeError):
+        import_dtdl(file_path, service)
+
+    assert list(service.repo.list_twins()) == []
+    assert list(service.repo.list_model_documents()) == []
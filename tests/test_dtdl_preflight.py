@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 from cymise.dtdl.preflight import preflight_validate
+from cymise.dtdl.validation_types import ValidationIssue
 
 
 def _base_model(dtmi: str = "dtmi:com:example:device;1", type_value="Interface"):
@@ -59,3 +60,38 @@ def test_unknown_keys_warn():
     model["customKey"] = 123
     result = preflight_validate([model])
     assert any(issue.code == "unknown_key" for issue in result.warnings)
+
+
+def test_error_summary_counts_errors_and_model_ids():
+    result = preflight_validate([{"@id": "bad"}, {"@id": "dtmi:a:b;1"}])
+
+    model_ids, count = result.error_summary()
+
+    assert model_ids == {"bad", "dtmi:a:b;1"}
+    assert count == len(result.errors)
+
+
+def test_validation_issue_is_lightweight_tuple():
+    issue = ValidationIssue("error", "bad", model_id="dtmi:a:b;1")
+
+    assert issue.code is None
+    assert issue._replace(path="[0]").path == "[0]"
+    assert issue._asdict() == {
+        "severity": "error",
+        "message": "bad",
+        "model_id": "dtmi:a:b;1",
+        "path": None,
+        "code": None,
+    }
+
+
+def test_paths_index_parsed_models_and_missing_keys_sorted():
+    result = preflight_validate([42, {"@id": "dtmi:com:example:a;1"}])
+
+    assert result.issues[0].path == "[0]"
+    missing = [i for i in result.issues if i.code == "missing_key"]
+    assert [i.message for i in missing] == [
+        "Missing required key '@context'.",
+        "Missing required key '@type'.",
+    ]
+    assert {i.path for i in missing} == {"[0]"}
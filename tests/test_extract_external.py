@@ -0,0 +1,92 @@
+from __future__ import annotations
+
+import json
+import sys
+import time
+
+import pytest
+
+from cymise.extract import external
+from cymise.extract.external import run_extractor, shutdown_extractor_servers
+from cymise.procserver import FramedProcessServer
+
+_FAKE_SERVER = """
+import json, os, sys
+if "--server" not in sys.argv:
+    print(json.dumps({"mode": "oneshot", "path": sys.argv[-1]}))
+    sys.exit(0)
+out, inp = sys.stdout.buffer, sys.stdin.buffer
+out.write(b"cymise-extractor-server/1\\n")
+out.flush()
+while True:
+    header = inp.readline()
+    if not header:
+        break
+    path = inp.read(int(header)).decode()
+    body = b"" if path.endswith(".bad") else json.dumps(
+        {"mode": "server", "path": path, "pid": os.getpid()}
+    ).encode()
+    out.write(b"%d\\n" % len(body) + body)
+    out.flush()
+"""
+
+
+@pytest.fixture
+def fake_command(tmp_path):
+    script = tmp_path / "fake_extractor.py"
+    script.write_text(_FAKE_SERVER, encoding="utf-8")
+    yield [sys.executable, str(script)]
+    shutdown_extractor_servers()
+
+
+def test_run_extractor_spawns_per_call_by_default(monkeypatch, fake_command):
+    monkeypatch.delenv("CYMISE_EXTRACT_SERVER", raising=False)
+
+    completed = run_extractor(fake_command, "a.kicad_pcb", timeout=10)
+
+    assert completed.returncode == 0
+    assert json.loads(completed.stdout) == {"mode": "oneshot", "path": "a.kicad_pcb"}
+    assert external._SERVERS == {}
+
+
+def test_run_extractor_reuses_server_process(monkeypatch, fake_command):
+    monkeypatch.setenv("CYMISE_EXTRACT_SERVER", "1")
+
+    first = json.loads(run_extractor(fake_command, "a.kicad_pcb", timeout=10).stdout)
+    second = json.loads(run_extractor(fake_command, "b.kicad_pcb", timeout=10).stdout)
+    failed = run_extractor(fake_command, "c.bad", timeout=10)
+
+    assert first["mode"] == second["mode"] == "server"
+    assert second["path"] == "b.kicad_pcb"
+    assert first["pid"] == second["pid"]
+    assert failed.returncode != 0
+
+
+def test_run_extractor_falls_back_without_server_mode(monkeypatch, tmp_path):
+    script = tmp_path / "plain_extractor.py"
+    script.write_text(
+        "import json, sys; print(json.dumps({'path': sys.argv[-1]}))", encoding="utf-8"
+    )
+    monkeypatch.setenv("CYMISE_EXTRACT_SERVER", "1")
+    command = [sys.executable, str(script)]
+    try:
+        completed = run_extractor(command, "a.FCStd", timeout=10)
+        assert json.loads(completed.stdout) == {"path": "a.FCStd"}
+        assert external._SERVERS[tuple(command)].supported is False
+    finally:
+        shutdown_extractor_servers()
+
+
+def test_server_gives_up_on_a_silent_helper_quickly(tmp_path):
+    script = tmp_path / "silent_extractor.py"
+    script.write_text("import time; time.sleep(30)", encoding="utf-8")
+    server = FramedProcessServer(
+        [sys.executable, str(script)], banner=b"x", timeout=60, banner_timeout=0.5
+    )
+    try:
+        started = time.monotonic()
+        assert server.request(b"a.FCStd") is None
+        assert time.monotonic() - started < 10
+        assert server.supported is False
+    finally:
+        server.close()
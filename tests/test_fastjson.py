@@ -0,0 +1,34 @@
+from __future__ import annotations
+
+import json
+
+import pytest
+
+from cymise import fastjson
+
+
+def test_roundtrip_returns_utf8_bytes():
+    data = {"@id": "dtmi:example:Motor;1", "displayName": "Motör", "contents": [1, 2.5, None]}
+
+    encoded = fastjson.dumps(data)
+
+    assert isinstance(encoded, bytes)
+    assert fastjson.loads(encoded) == data
+    assert fastjson.loads(encoded.decode("utf-8")) == data
+
+
+def test_stdlib_fallback_matches_orjson_layout(monkeypatch):
+    data = [{"b": 1, "a": [True, "x"]}]
+    expected_compact = fastjson.dumps(data)
+    expected_indented = fastjson.dumps(data, indent=True, sort_keys=True)
+
+    monkeypatch.setattr(fastjson, "orjson", None)
+
+    assert fastjson.dumps(data) == expected_compact
+    assert fastjson.dumps(data, indent=True, sort_keys=True) == expected_indented
+    assert json.loads(expected_indented) == data
+
+
+def test_decode_error_is_stdlib_compatible():
+    with pytest.raises(json.JSONDecodeError):
+        fastjson.loads(b"{not json")
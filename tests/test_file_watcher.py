@@ -1,7 +1,10 @@
 from __future__ import annotations
 
+import os
 import time
 
+import pytest
+
 from cymise.graph.service import GraphService
 from cymise.store.db import create_db, get_engine, get_session
 from cymise.store.repo import StoreRepository
@@ -64,3 +67,76 @@ def test_watcher_detects_deletion(tmp_path):
         events.append(watcher.events.get_nowait())
 
     assert any(ev.change == "deleted" for ev in events)
+
+
+def test_watcher_hashes_only_when_mtime_or_size_change(tmp_path, monkeypatch):
+    service = _setup_service(tmp_path)
+    file_path = tmp_path / "stable.bin"
+    file_path.write_bytes(b"same")
+    service.add_file_object(str(file_path))
+
+    watcher = FileWatcher(service, config=WatcherConfig(debounce_ms=0, scan_interval_ms=50))
+    hashed: list[str] = []
+    original = watcher._hash_file
+
+    def _counting_hash(path):
+        hashed.append(path.name)
+        return original(path)
+
+    monkeypatch.setattr(watcher, "_hash_file", _counting_hash)
+    watcher.start()
+    try:
+        time.sleep(0.3)
+    finally:
+        watcher.stop()
+
+    assert hashed == ["stable.bin"]
+
+
+def test_watcher_rehashes_same_size_rewrite(tmp_path):
+    service = _setup_service(tmp_path)
+    file_path = tmp_path / "fixed.bin"
+    file_path.write_bytes(b"aaaa")
+    service.add_file_object(str(file_path))
+
+    watcher = FileWatcher(service, config=WatcherConfig(debounce_ms=0, scan_interval_ms=30))
+    watcher.start()
+    try:
+        time.sleep(0.15)
+        st = file_path.stat()
+        file_path.write_bytes(b"bbbb")
+        # same size; the mtime bump alone has to trigger the rehash
+        os.utime(file_path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000))
+        time.sleep(0.15)
+    finally:
+        watcher.stop()
+
+    changes = []
+    while not watcher.events.empty():
+        changes.append(watcher.events.get_nowait().change)
+    assert changes == ["created", "modified"]
+
+
+def test_watcher_native_events_skip_polling(tmp_path):
+    pytest.importorskip("watchdog")
+    service = _setup_service(tmp_path)
+    file_path = tmp_path / "native.txt"
+    file_path.write_text("one")
+    service.add_file_object(str(file_path))
+
+    # the scan interval is far longer than the test, so only a notification can
+    # surface the modification in time
+    watcher = FileWatcher(service, config=WatcherConfig(debounce_ms=0, scan_interval_ms=10_000))
+    watcher.start()
+    try:
+        time.sleep(0.2)
+        assert watcher._watches
+        file_path.write_text("three")
+        time.sleep(0.3)
+    finally:
+        watcher.stop()
+
+    changes = []
+    while not watcher.events.empty():
+        changes.append(watcher.events.get_nowait().change)
+    assert changes == ["created", "modified"]
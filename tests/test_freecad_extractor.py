@@ -3,12 +3,28 @@ from __future__ import annotations
 import json
 from types import SimpleNamespace
 
-from cymise.extract.freecad_extractor import ExtractResult, extract_freecad
+import pytest
+
+from cymise.extract.external import reset_command_cache
+from cymise.extract.freecad_extractor import (
+    ExtractResult,
+    _build_command,
+    extract_freecad,
+    find_dt_keys,
+)
 from cymise.graph.service import GraphService
 from cymise.store.db import create_db, get_engine, get_session
 from cymise.store.repo import StoreRepository
 
 
+@pytest.fixture(autouse=True)
+def _fresh_command_cache():
+    # Tests patch shutil.which, so memoized PATH lookups must not leak between them.
+    reset_command_cache()
+    yield
+    reset_command_cache()
+
+
 def _setup_service(tmp_path):
     engine = get_engine(tmp_path / "freecad.db")
     create_db(engine)
@@ -65,3 +81,38 @@ def test_extract_missing_file(monkeypatch, tmp_path):
 
     assert result.ok is False
     assert result.extracted_object_id is None
+
+
+def test_find_dt_keys_handles_shared_and_cyclic_containers():
+    shared = {"dt_shared": 1, "items": [{"dt_leaf": 2}]}
+    data = {"a": shared, "b": [shared, {"dt_other": None}], "dt_top": "x"}
+    data["self"] = data
+
+    assert find_dt_keys(data) == {"dt_shared", "dt_leaf", "dt_other", "dt_top"}
+    assert find_dt_keys("dt_not_a_key") == set()
+
+
+def test_command_lookup_is_memoized(monkeypatch):
+    calls = []
+
+    def fake_which(name):
+        calls.append(name)
+        return "/opt/freecad/FreeCADCmd" if name == "FreeCADCmd" else None
+
+    monkeypatch.delenv("CYMISE_FREECAD_EXTRACT_CMD", raising=False)
+    monkeypatch.setattr("shutil.which", fake_which)
+
+    first = _build_command()
+    first.append("--mutated")
+    assert _build_command() == ["/opt/freecad/FreeCADCmd"]
+    assert calls == ["FreeCADCmd"]
+
+    monkeypatch.setenv("CYMISE_FREECAD_EXTRACT_CMD", "freecad-extract --json")
+    assert _build_command() == ["freecad-extract", "--json"]
+
+
+def test_find_dt_keys_tolerates_non_string_keys():
+    data = {1: {"dt_nested": True}, None: "x", ("dt_", 1): [], "dt_top": [{2: 3}]}
+
+    assert find_dt_keys(data) == {"dt_nested", "dt_top"}
+    assert find_dt_keys(None) == set()
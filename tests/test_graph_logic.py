@@ -0,0 +1,43 @@
+from __future__ import annotations
+
+from cymise.ui.graph_logic import diff_graph_payload, index_payload
+
+
+def _payload(node_labels: dict[str, str], edges: list[tuple[str, str, str]]) -> dict:
+    return {
+        "nodes": [
+            {"id": node_id, "label": label, "validation": {}}
+            for node_id, label in node_labels.items()
+        ],
+        "edges": [
+            {"id": edge_id, "source": source, "target": target, "label": "", "validation": {}}
+            for edge_id, source, target in edges
+        ],
+    }
+
+
+def test_diff_graph_payload_reports_only_changes():
+    labels = {f"n{i}": f"N{i}" for i in range(10)}
+    before = index_payload(_payload(labels, [("1", "n0", "n1"), ("2", "n1", "n2")]))
+    labels["n3"] = "renamed"
+    labels["n10"] = "N10"
+    del labels["n9"]
+    after = index_payload(_payload(labels, [("1", "n0", "n1"), ("3", "n2", "n10")]))
+
+    delta = diff_graph_payload(*before, *after)
+
+    assert [node["id"] for node in delta.changed_nodes] == ["n3", "n10"]
+    assert delta.removed_nodes == ["n9"]
+    assert [edge["id"] for edge in delta.changed_edges] == ["3"]
+    assert delta.removed_edges == ["2"]
+
+
+def test_diff_graph_payload_prefers_full_rebuild_for_large_changes():
+    before = index_payload(_payload({"a": "A", "b": "B"}, []))
+    after = index_payload(_payload({"c": "C", "d": "D"}, []))
+
+    assert diff_graph_payload(*before, *after) is None
+
+    unchanged = diff_graph_payload(*before, *before)
+    assert unchanged is not None
+    assert unchanged.changed_nodes == unchanged.removed_nodes == []
@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import pytest
+from sqlalchemy import event
 
 from cymise.graph.service import GraphService
 from cymise.store.db import create_db, get_engine, get_session
@@ -120,3 +121,105 @@ def test_get_subgraph_directionality(service: GraphService):
         "dtmi:com:example:c2;1",
     }
     assert len(edges_u) == 2
+
+
+def test_get_subgraph_resolves_twins_in_bulk(service: GraphService, monkeypatch):
+    for name in ("a3", "b3", "c3", "d3"):
+        service.create_twin(f"dtmi:com:example:{name};1")
+    service.create_relationship("dtmi:com:example:a3;1", "dtmi:com:example:b3;1")
+    service.create_relationship("dtmi:com:example:a3;1", "dtmi:com:example:c3;1")
+    service.create_relationship("dtmi:com:example:c3;1", "dtmi:com:example:d3;1")
+
+    def _no_single_lookup(_twin_id):
+        raise AssertionError("get_twin_by_id should not be used per edge")
+
+    monkeypatch.setattr(service.repo, "get_twin_by_id", _no_single_lookup)
+
+    nodes, edges = service.get_subgraph("dtmi:com:example:a3;1", max_hops=2)
+    assert [n.dtmi for n in nodes] == [
+        "dtmi:com:example:a3;1",
+        "dtmi:com:example:b3;1",
+        "dtmi:com:example:c3;1",
+        "dtmi:com:example:d3;1",
+    ]
+    assert {(e.source_dtmi, e.target_dtmi) for e in edges} == {
+        ("dtmi:com:example:a3;1", "dtmi:com:example:b3;1"),
+        ("dtmi:com:example:a3;1", "dtmi:com:example:c3;1"),
+        ("dtmi:com:example:c3;1", "dtmi:com:example:d3;1"),
+    }
+    assert [n.dtmi for n in service.get_outgoing_neighbors("dtmi:com:example:a3;1")] == [
+        "dtmi:com:example:b3;1",
+        "dtmi:com:example:c3;1",
+    ]
+
+
+def test_require_twin_is_memoized_until_twins_change(service: GraphService, monkeypatch):
+    service.create_twin("dtmi:com:example:cached;1")
+    service.create_twin("dtmi:com:example:other;1")
+
+    lookups = []
+    original = service.repo.get_twin_by_dtmi
+
+    def counting_lookup(dtmi):
+        lookups.append(dtmi)
+        return original(dtmi)
+
+    monkeypatch.setattr(service.repo, "get_twin_by_dtmi", counting_lookup)
+
+    service.create_relationship("dtmi:com:example:cached;1", "dtmi:com:example:other;1")
+    service.create_relationship("dtmi:com:example:other;1", "dtmi:com:example:cached;1")
+    assert lookups == ["dtmi:com:example:cached;1", "dtmi:com:example:other;1"]
+
+    # Deleting behind the service's back must not leave a usable stale entry.
+    service.repo.delete_twin_by_dtmi("dtmi:com:example:other;1")
+    with pytest.raises(ValueError):
+        service.get_outgoing_neighbors("dtmi:com:example:other;1")
+
+
+def test_add_file_objects_inserts_in_one_batch(service: GraphService):
+    service.create_twin("dtmi:com:example:board;1")
+
+    added = service.add_file_objects(
+        ["a.kicad_pcb", "b.FCStd"], twin_dtmi="dtmi:com:example:board;1"
+    )
+
+    assert [f["path"] for f in added] == ["a.kicad_pcb", "b.FCStd"]
+    assert service.list_file_objects() == added
+    with pytest.raises(ValueError):
+        service.add_file_objects(["c.step"], twin_dtmi="dtmi:com:example:missing;1")
+    assert service.add_file_objects([]) == []
+
+
+def test_list_file_objects_loads_twins_in_one_query(service: GraphService):
+    for index in range(3):
+        dtmi = f"dtmi:com:example:part{index};1"
+        service.create_twin(dtmi)
+        service.add_file_object(f"part{index}.FCStd", twin_dtmi=dtmi)
+    service.add_file_object("loose.step")
+    session = service.repo.session
+    session.expunge_all()
+    service.clear_cache()
+
+    statements = []
+    engine = session.get_bind()
+
+    def record(_conn, _cursor, statement, *_args):
+        statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", record)
+    try:
+        files = service.list_file_objects()
+    finally:
+        event.remove(engine, "before_cursor_execute", record)
+
+    assert len(statements) == 2
+    assert [f["twin_dtmi"] for f in files] == [
+        "dtmi:com:example:part0;1",
+        "dtmi:com:example:part1;1",
+        "dtmi:com:example:part2;1",
+        None,
+    ]
+
+    moved = service.attach_file(files[3]["id"], "dtmi:com:example:part0;1")
+    assert moved["twin_dtmi"] == "dtmi:com:example:part0;1"
+    assert service.detach_file(files[0]["id"])["twin_dtmi"] is None
@@ -1,7 +1,9 @@
 from __future__ import annotations
 
+from dataclasses import asdict
+
 from cymise.graph.service import GraphService
-from cymise.impact.service import ImpactService
+from cymise.impact.service import ImpactEvidence, ImpactRecord, ImpactResult, ImpactService
 from cymise.store.db import create_db, get_engine, get_session
 from cymise.store.repo import StoreRepository
 
@@ -140,3 +142,78 @@ def test_dedup_merges_evidences(tmp_path):
         assert len(evidences) == 2
     finally:
         session.close()
+
+
+def test_stitches_fetched_once_per_computation(tmp_path, monkeypatch):
+    _engine, session, repo, graph, impact = setup_env(tmp_path)
+    try:
+        file_obj = repo.add_file_object(path="doc.json", media_type="application/json")
+        extracted = repo.add_extracted_object(
+            file_object_id=file_obj.id, kind="kicad_ecad", data={"dt_keys": []}
+        )
+        repo.add_stitch_candidate(
+            file_object_id=file_obj.id,
+            extracted_object_id=extracted.id,
+            dt_key="part-1",
+            target_dtmi="dtmi:com:example:Candidate;1",
+            status="candidate",
+        )
+        repo.add_stitch_candidate(
+            file_object_id=file_obj.id,
+            extracted_object_id=extracted.id,
+            dt_key="part-1",
+            target_dtmi="dtmi:com:example:Accepted;1",
+            status="accepted",
+        )
+
+        calls = []
+        original = graph.list_stitches
+
+        def counting_list_stitches(*args, **kwargs):
+            calls.append(kwargs.get("status"))
+            return original(*args, **kwargs)
+
+        monkeypatch.setattr(graph, "list_stitches", counting_list_stitches)
+
+        diff = {
+            "dt_key_added": ["part-1", "part-2", "part-3"],
+            "dt_key_removed": ["part-4", "part-1"],
+            "new_extracted_object_id": extracted.id,
+        }
+        result = impact.compute_impact_from_diff(file_obj.id, diff, hops=0)
+
+        assert calls == ["accepted", "candidate"]
+        assert [r.dtmi for r in result.impacted] == ["dtmi:com:example:Accepted;1"]
+        assert len(result.impacted[0].evidences) == 2
+    finally:
+        session.close()
+
+
+def test_to_dict_matches_asdict():
+    record = ImpactRecord(
+        dtmi="dtmi:com:example:A;1",
+        severity=0.8,
+        confidence=0.9,
+        evidences=[ImpactEvidence(kind="dt_key_removed", detail="dt_a", source="2")],
+    )
+    propagated = ImpactRecord(
+        dtmi="dtmi:com:example:B;1",
+        severity=0.3,
+        confidence=0.3,
+        evidences=[ImpactEvidence(kind="propagated", detail="from A")],
+        is_propagated=True,
+    )
+    result = ImpactResult(
+        file_object_id=1,
+        kind="kicad_ecad",
+        old_extracted_object_id=1,
+        new_extracted_object_id=2,
+        impacted=[record],
+        propagated=[propagated],
+        summary="impacted=1, propagated=1",
+    )
+
+    converted = ImpactService.to_dict(result)
+    assert converted == asdict(result)
+    assert list(converted) == list(asdict(result))
+    assert converted["impacted"][0]["evidences"] is not record.evidences
@@ -0,0 +1,53 @@
+from __future__ import annotations
+
+import pytest
+
+pytest.importorskip("PySide6.QtWidgets")
+
+from PySide6 import QtWidgets
+
+from cymise.graph.service import GraphService
+from cymise.store.db import create_db, get_engine, get_session
+from cymise.store.repo import StoreRepository
+from cymise.ui.views.impact_view import ImpactView
+
+
+@pytest.fixture
+def service(tmp_path):
+    engine = get_engine(tmp_path / "impact_view.db")
+    create_db(engine)
+    session = get_session(engine)
+    repo = StoreRepository(session)
+    svc = GraphService(repo)
+    try:
+        yield svc
+    finally:
+        session.close()
+
+
+def test_populate_table_replaces_rows_and_selection_highlights(service: GraphService):
+    QtWidgets.QApplication.instance() or QtWidgets.QApplication([])
+    highlighted: list[str] = []
+    view = ImpactView(service, highlighted.append)
+    records = [
+        {
+            "dtmi": f"dtmi:com:example:n{i};1",
+            "severity": 0.9,
+            "confidence": 0.5,
+            "evidences": [{"kind": "param_changed", "detail": "width"}, {"kind": "ref"}],
+        }
+        for i in range(3)
+    ]
+
+    view._populate_table(records * 2)
+    view._populate_table(records)
+
+    assert view.model.rowCount() == 3
+    assert [view.model.item(1, col).text() for col in range(4)] == [
+        "dtmi:com:example:n1;1",
+        "0.90",
+        "0.50",
+        "param_changed: width; ref",
+    ]
+    view.table.selectRow(2)
+    assert highlighted == ["dtmi:com:example:n2;1"]
@@ -1,6 +1,12 @@
 from __future__ import annotations
 
-from cymise.ui.impact_logic import rank_and_filter_impacts, severity_bucket
+from cymise.ui import impact_logic
+from cymise.ui.impact_logic import (
+    filter_ranked_impacts,
+    rank_and_filter_impacts,
+    rank_impacts,
+    severity_bucket,
+)
 
 
 def test_rank_and_filter_impacts_orders_and_filters():
@@ -20,3 +26,64 @@ def test_severity_bucket_thresholds():
     assert severity_bucket(0.8) == "high"
     assert severity_bucket(0.5) == "medium"
     assert severity_bucket(0.1) == "low"
+
+
+def test_filter_ranked_impacts_matches_ranking_filtered_records():
+    records = [
+        {"dtmi": "a", "severity": 0.9, "confidence": 0.4, "is_propagated": True},
+        {"dtmi": "b", "severity": 0.5, "confidence": 0.6},
+        {"dtmi": "c", "severity": 0.9, "confidence": 0.8},
+    ]
+    ranked = rank_impacts(records)
+
+    assert [r["dtmi"] for r in ranked] == ["c", "a", "b"]
+    for severity_filter in (set(), {"high"}, {"medium", "low"}):
+        for include_propagated in (True, False):
+            assert filter_ranked_impacts(
+                ranked, severity_filter, include_propagated
+            ) == rank_and_filter_impacts(records, severity_filter, include_propagated)
+    assert "_severity_bucket" not in records[0]
+
+
+def test_rank_impacts_large_inputs_match_pure_python_path(monkeypatch):
+    records = [
+        {
+            "dtmi": f"dtmi:example:{i};1",
+            "severity": (i * 37 % 100) / 100,
+            "confidence": (i * 11 % 7) / 7,
+            "is_propagated": i % 3 == 0,
+        }
+        for i in range(300)
+    ]
+    records.append({"dtmi": "dtmi:example:bare;1"})
+
+    ranked = impact_logic.rank_impacts(records)
+    monkeypatch.setattr(impact_logic, "np", None)
+
+    assert ranked == impact_logic.rank_impacts(records)
+    assert ranked[-1]["_severity_bucket"] == "low"
+
+
+def test_rank_impacts_keeps_precomputed_buckets(monkeypatch):
+    def fail(_value):
+        raise AssertionError("bucket recomputed")
+
+    monkeypatch.setattr(impact_logic, "severity_bucket", fail)
+    records = [
+        {"dtmi": "a", "severity": 0.2, "_severity_bucket": "low"},
+        {"dtmi": "b", "severity": 0.9, "_severity_bucket": "high"},
+    ]
+
+    ranked = impact_logic.rank_impacts(records)
+    assert [r["dtmi"] for r in ranked] == ["b", "a"]
+    assert impact_logic.filter_ranked_impacts(ranked, {"low"}) == [ranked[1]]
+
+
+def test_rank_impacts_can_bucket_records_in_place():
+    records = [{"dtmi": "a", "severity": 0.2}, {"dtmi": "b", "severity": 0.9}]
+
+    ranked = rank_impacts(records, copy=False)
+
+    assert ranked == [records[1], records[0]]
+    assert ranked[0] is records[1]
+    assert records[0]["_severity_bucket"] == "low"
@@ -0,0 +1,46 @@
+from __future__ import annotations
+
+import queue
+
+import pytest
+
+from cymise.watch.job_queue import JobQueue, ParseJob
+
+
+def _job(file_id: int, reason: str, at: float, digest: str = "") -> ParseJob:
+    payload = {"hash": digest}
+    return ParseJob(
+        file_id=file_id, path=f"f{file_id}", reason=reason, queued_at=at, payload=payload
+    )
+
+
+def test_jobs_for_same_file_coalesce():
+    jobs = JobQueue()
+    jobs.enqueue(_job(1, "modified", 1.0, "a"))
+    jobs.enqueue(_job(1, "modified", 2.0, "b"))
+    jobs.enqueue(_job(1, "modified", 3.0, "c"))
+
+    job = jobs.get(timeout=0)
+    assert (job.queued_at, job.payload) == (1.0, {"hash": "c"})
+    assert jobs.empty()
+
+
+def test_jobs_ordered_by_reason_then_age():
+    jobs = JobQueue()
+    jobs.enqueue(_job(1, "modified", 1.0))
+    jobs.enqueue(_job(2, "modified", 0.5))
+    jobs.enqueue(_job(3, "created", 2.0))
+    jobs.enqueue(_job(4, "deleted", 3.0))
+    # a later deletion takes over the pending modification of file 1
+    jobs.enqueue(_job(1, "deleted", 4.0))
+
+    order = []
+    while not jobs.empty():
+        job = jobs.get(timeout=0)
+        order.append((job.file_id, job.reason))
+    assert order == [(1, "deleted"), (4, "deleted"), (3, "created"), (2, "modified")]
+
+
+def test_get_times_out_when_empty():
+    with pytest.raises(queue.Empty):
+        JobQueue().get(timeout=0.01)
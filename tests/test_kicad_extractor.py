@@ -3,7 +3,13 @@ from __future__ import annotations
 import json
 from types import SimpleNamespace
 
-from cymise.extract.kicad_extractor import extract_kicad
+from cymise.extract.freecad_extractor import ExtractResult
+from cymise.extract.kicad_extractor import (
+    _RE_COMP_HEAD,
+    _iter_sexp_blocks,
+    _parse_components,
+    extract_kicad,
+)
 from cymise.graph.service import GraphService
 from cymise.store.db import create_db, get_engine, get_session
 from cymise.store.repo import StoreRepository
@@ -68,5 +74,43 @@ def test_extract_kicad_missing_file(tmp_path):
 
     result = extract_kicad(service, fobj["id"])
 
+    assert isinstance(result, ExtractResult)
     assert not result.ok
     assert result.extracted_object_id is None
+
+
+def test_extract_kicad_external_failure_decodes_stderr(monkeypatch, tmp_path):
+    service = _setup_service(tmp_path)
+    file_path = tmp_path / "board.kicad_pcb"
+    file_path.write_text('(net 1 "GND")')
+    fobj = service.add_file_object(str(file_path), media_type="application/kicad")
+
+    monkeypatch.setenv("CYMISE_KICAD_EXTRACT_CMD", "kicad-extract")
+
+    def fake_run(cmd, capture_output, text, timeout, check):
+        assert text is False
+        return SimpleNamespace(returncode=1, stdout=b"", stderr="boom – failed".encode())
+
+    monkeypatch.setattr("subprocess.run", fake_run)
+
+    result = extract_kicad(service, fobj["id"])
+    assert not result.ok
+    extracted = next(iter(service.repo.list_extracted_objects()))
+    assert extracted.data["tool"]["mode"] == "native"
+    assert extracted.data["errors"] == ["boom – failed"]
+    assert extracted.data["nets"] == {"GND": {"connections": 1}}
+
+
+def test_parse_components_scans_balanced_blocks():
+    text = (
+        b"(export (components (comp (ref R1) (value 10k) (footprint R_0603)"
+        b' (property (name "note") (value "a ) b"))) (comp (ref C2) (value 1u))))'
+    )
+
+    components = _parse_components(text)
+
+    assert [(c["ref"], c["value"], c["footprint"]) for c in components] == [
+        ("R1", "10k", "R_0603"),
+        ("C2", "1u", ""),
+    ]
+    assert list(_iter_sexp_blocks(b"(comp (ref R9", _RE_COMP_HEAD)) == [b"(ref R9"]
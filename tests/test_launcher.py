@@ -6,9 +6,18 @@ from types import SimpleNamespace
 
 import pytest
 
+from cymise.extract import external
+from cymise.extract.external import reset_command_cache
 from cymise.tools import launcher
 
 
+@pytest.fixture(autouse=True)
+def _clear_command_cache():
+    reset_command_cache()
+    yield
+    reset_command_cache()
+
+
 def test_open_with_default_app_windows(monkeypatch, tmp_path):
     called = {}
 
@@ -33,8 +42,9 @@ def test_launch_tool_env_override(monkeypatch, tmp_path):
     monkeypatch.setenv("CYMISE_FREECAD_CMD", "C:\\FreeCAD\\FreeCAD.exe --flag")
     spawned = {}
 
-    def fake_popen(cmd):
+    def fake_popen(cmd, **kwargs):
         spawned["cmd"] = cmd
+        spawned["kwargs"] = kwargs
         return SimpleNamespace()
 
     monkeypatch.setattr(launcher.subprocess, "Popen", fake_popen)
@@ -44,6 +54,8 @@ def test_launch_tool_env_override(monkeypatch, tmp_path):
     assert result.ok
     assert spawned["cmd"][0].endswith("FreeCAD.exe")
     assert spawned["cmd"][-1] == str(file_path)
+    assert spawned["kwargs"]["start_new_session"] is True
+    assert spawned["kwargs"]["stdout"] is launcher.subprocess.DEVNULL
 
 
 def test_launch_tool_which_fallback(monkeypatch, tmp_path):
@@ -51,20 +63,28 @@ def test_launch_tool_which_fallback(monkeypatch, tmp_path):
     file_path.write_text("x")
 
     monkeypatch.delenv("CYMISE_KICAD_CMD", raising=False)
-    monkeypatch.setattr(launcher.shutil, "which", lambda _: "kicad")
+    lookups = []
+
+    def fake_which(name):
+        lookups.append(name)
+        return "kicad"
+
+    monkeypatch.setattr(external.shutil, "which", fake_which)
     spawned = {}
 
-    def fake_popen(cmd):
+    def fake_popen(cmd, **kwargs):
         spawned["cmd"] = cmd
         return SimpleNamespace()
 
     monkeypatch.setattr(launcher.subprocess, "Popen", fake_popen)
 
     result = launcher.launch_tool("kicad", file_path)
+    launcher.launch_tool("kicad", file_path)
 
     assert result.ok
     assert spawned["cmd"][0] == "kicad"
     assert spawned["cmd"][-1] == str(file_path)
+    assert lookups == ["kicad"]
 
 
 def test_launch_tool_missing_file(tmp_path):
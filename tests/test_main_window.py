@@ -0,0 +1,89 @@
+from __future__ import annotations
+
+from types import SimpleNamespace
+
+import pytest
+
+pytest.importorskip("PySide6.QtWidgets")
+
+from PySide6 import QtCore, QtWidgets
+
+from cymise.graph.service import GraphService
+from cymise.store.db import create_db, get_engine, get_session
+from cymise.store.repo import StoreRepository
+from cymise.ui.main_window import MainWindow
+
+
+@pytest.fixture
+def service(tmp_path):
+    engine = get_engine(tmp_path / "main_window.db")
+    create_db(engine)
+    session = get_session(engine)
+    repo = StoreRepository(session)
+    svc = GraphService(repo)
+    try:
+        yield svc
+    finally:
+        # Validation refreshes run on the pool; let them finish before the session
+        # and database go away.
+        QtCore.QThreadPool.globalInstance().waitForDone()
+        session.close()
+
+
+def test_graph_view_is_built_on_first_use(service: GraphService, monkeypatch):
+    app = QtWidgets.QApplication.instance() or QtWidgets.QApplication([])
+    built = []
+
+    window = MainWindow(service)
+    assert window.graph_view is None
+
+    window.tabs.setCurrentWidget(window.impact_view)
+    assert window.graph_view is None
+
+    # Stand in for the WebEngine-backed view, which may not load headless.
+    def ensure():
+        built.append(True)
+
+    monkeypatch.setattr(window, "_ensure_graph_view", ensure)
+    window.tabs.setCurrentWidget(window.graph_tab)
+    assert built == [True]
+    window.close()
+    app.processEvents()
+
+
+def test_validation_tab_refreshes_only_after_store_changes(service: GraphService, monkeypatch):
+    app = QtWidgets.QApplication.instance() or QtWidgets.QApplication([])
+    window = MainWindow(service)
+    refreshes = []
+    monkeypatch.setattr(
+        window.validation_view, "refresh_from_store", lambda svc=None: refreshes.append(svc)
+    )
+
+    window.tabs.setCurrentWidget(window.validation_view)
+    assert window._validation_refresh_timer.isActive()
+    assert refreshes == []
+
+    window._refresh_validation_if_stale()
+    assert refreshes == []
+
+    service.create_twin("dtmi:com:example:node;1")
+    window._refresh_validation_if_stale()
+    window._refresh_validation_if_stale()
+    assert refreshes == [service]
+    window.close()
+    app.processEvents()
+
+
+def test_graph_tab_refreshes_existing_view(service: GraphService):
+    app = QtWidgets.QApplication.instance() or QtWidgets.QApplication([])
+    window = MainWindow(service)
+    refreshes = []
+    window.graph_view = SimpleNamespace(refresh_graph=lambda: refreshes.append(True))
+
+    window.tabs.setCurrentWidget(window.impact_view)
+    window.tabs.setCurrentWidget(window.graph_tab)
+
+    assert refreshes == [True]
+    window.graph_view = None
+    window.close()
+    app.processEvents()
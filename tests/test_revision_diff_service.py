@@ -1,7 +1,14 @@
 from __future__ import annotations
 
+import hashlib
+import json
+
+import pytest
+
+from cymise import fastjson
 from cymise.graph.service import GraphService
 from cymise.revision_diff.service import RevisionDiffService
+from cymise.store import hashing
 from cymise.store.db import create_db, get_engine, get_session
 from cymise.store.repo import StoreRepository
 
@@ -32,6 +39,13 @@ def test_dt_key_diff_added_removed(tmp_path):
         assert result.dt_key_added == ["c"]
         assert result.dt_key_removed == ["a"]
         assert result.dt_key_unchanged == ["b"]
+
+        same_obj = repo.add_extracted_object(
+            file_object_id=file_obj.id, kind="kicad_ecad", data={"dt_keys": ["c", "b", "c"]}
+        )
+        same = service.diff_extracted_objects(new_obj.id, same_obj.id)
+        assert same.dt_key_added == [] and same.dt_key_removed == []
+        assert same.dt_key_unchanged == ["b", "c"]
     finally:
         session.close()
 
@@ -109,3 +123,201 @@ def test_diff_latest_for_file(tmp_path):
         assert result["dt_key_removed"] == []
     finally:
         session.close()
+
+
+def test_structural_diff_hash_ignores_volatile_keys(tmp_path):
+    _engine, session, repo, _graph, service = setup_env(tmp_path)
+    try:
+        file_obj = repo.add_file_object(path="doc.bin", media_type="application/octet-stream")
+        base = {"b": [1, {"y": "ü", "x": 2}], "a": 1}
+        first = repo.add_extracted_object(
+            file_object_id=file_obj.id, kind="generic", data={**base, "timestamp": 1}
+        )
+        second = repo.add_extracted_object(
+            file_object_id=file_obj.id, kind="generic", data={"a": 1, **base, "timestamp": 2}
+        )
+        third = repo.add_extracted_object(
+            file_object_id=file_obj.id, kind="generic", data={**base, "a": 2}
+        )
+
+        same = service.diff_extracted_objects(first.id, second.id)
+        changed = service.diff_extracted_objects(first.id, third.id)
+        assert same.structural["hash_changed"] is False
+        assert changed.structural["hash_changed"] is True
+
+        # Inputs orjson rejects still hash deterministically via the stdlib
+        odd = service._structural_diff_hash({1: 2**70}, {1: 2**70})
+        assert odd["hash_changed"] is False
+
+        # Equal payloads report the same digest on both sides
+        equal = service._structural_diff_hash(dict(base), dict(base))
+        assert equal["data_hash_old"] == equal["data_hash_new"]
+        assert equal["data_hash_old"] == same.structural["data_hash_old"]
+
+        # Reported digests keep their historical format: bare SHA-256 hex
+        normalized = json.dumps(base, sort_keys=True, separators=(",", ":"))
+        assert equal["data_hash_old"] == hashlib.sha256(normalized.encode("utf-8")).hexdigest()
+    finally:
+        session.close()
+
+
+@pytest.mark.parametrize("new_value", [True, 1.0])
+def test_structural_diff_hash_reports_type_changes(tmp_path, new_value):
+    _engine, session, _repo, _graph, service = setup_env(tmp_path)
+    try:
+        # equal in Python, different once serialized
+        result = service._structural_diff_hash({"a": 1}, {"a": new_value})
+        assert result["hash_changed"] is True
+
+        added, removed = service._identity_diff([1], [new_value], service._component_identities)
+        assert (added, removed) == ([str(new_value)], ["1"])
+    finally:
+        session.close()
+
+
+def test_to_dict_and_lazy_key_lists(tmp_path):
+    _engine, session, repo, _graph, service = setup_env(tmp_path)
+    try:
+        file_obj = repo.add_file_object(path="board.kicad_pcb", media_type="kicad")
+        old_obj = repo.add_extracted_object(
+            file_object_id=file_obj.id,
+            kind="kicad_ecad",
+            data={"dt_keys": ["a"], "components": [{"ref": "R1"}]},
+        )
+        new_obj = repo.add_extracted_object(
+            file_object_id=file_obj.id,
+            kind="kicad_ecad",
+            data={"dt_keys": ["a", "b"], "components": [{"ref": "R2"}]},
+        )
+
+        result = service.diff_extracted_objects(old_obj.id, new_obj.id)
+        assert result.added_keys == {"b"}
+        assert result.dt_key_added is result.dt_key_added
+
+        shallow = RevisionDiffService.to_dict(result)
+        assert shallow == {
+            "file_object_id": file_obj.id,
+            "kind": "kicad_ecad",
+            "old_extracted_object_id": old_obj.id,
+            "new_extracted_object_id": new_obj.id,
+            "dt_key_added": ["b"],
+            "dt_key_removed": [],
+            "dt_key_unchanged": ["a"],
+            "structural": result.structural,
+            "summary": result.summary,
+        }
+        assert shallow["structural"] is result.structural
+
+        deep = RevisionDiffService.to_dict(result, deep=True)
+        assert deep == shallow
+        assert deep["structural"] is not result.structural
+    finally:
+        session.close()
+
+
+def test_structural_diff_hash_uses_stored_content_hash(tmp_path, monkeypatch):
+    _engine, session, repo, _graph, service = setup_env(tmp_path)
+    try:
+        file_obj = repo.add_file_object(path="doc.bin", media_type="application/octet-stream")
+        first = repo.add_extracted_object(
+            file_object_id=file_obj.id, kind="generic", data={"a": 1, "timestamp": 1}
+        )
+        second = repo.add_extracted_object(
+            file_object_id=file_obj.id, kind="generic", data={"timestamp": 2, "a": 1}
+        )
+        assert first.content_hash is not None
+        assert first.content_hash == second.content_hash
+
+        def fail(_data):
+            raise AssertionError("payload should not be re-hashed")
+
+        monkeypatch.setattr("cymise.revision_diff.service.structural_digest", fail)
+        result = service.diff_extracted_objects(first.id, second.id)
+        assert result.structural["data_hash_old"] == hashing.strip_digest_tag(
+            first.content_hash
+        )
+        assert result.structural["hash_changed"] is False
+    finally:
+        session.close()
+
+
+def test_component_identities_fast_path_matches_fallback(tmp_path):
+    _engine, session, _repo, _graph, service = setup_env(tmp_path)
+    try:
+        uniform = [{"ref": "R1"}, {"ref": "R2", "value": "10k"}]
+        assert service._component_identities(uniform) == {"R1", "R2"}
+
+        mixed = [{"ref": "", "reference": "R3"}, {"ref": 5}, "U1", {"value": "1k"}]
+        assert service._component_identities(mixed) == {
+            "R3",
+            str({"ref": 5}),
+            "U1",
+            str({"value": "1k"}),
+        }
+    finally:
+        session.close()
+
+
+def test_structural_diff_kicad_unchanged_lists(tmp_path):
+    _engine, session, _repo, _graph, service = setup_env(tmp_path)
+    try:
+        data = {"components": [{"ref": "R1"}, {"value": "1k"}], "nets": [{"name": "GND"}]}
+        result = service._structural_diff_kicad(data, {**data, "parts": []})
+        assert result == {
+            "components_added": [],
+            "components_removed": [],
+            "nets_added": [],
+            "nets_removed": [],
+        }
+        changed = service._structural_diff_kicad(data, {"components": [{"ref": "R2"}]})
+        assert changed["components_added"] == ["R2"]
+        assert changed["nets_removed"] == ["GND"]
+    finally:
+        session.close()
+
+
+def test_content_hash_is_independent_of_optional_encoders(monkeypatch):
+    data = {"name": "é", "v": 1e-7, "timestamp": 3}
+    canonical = json.dumps({"name": "é", "v": 1e-7}, sort_keys=True, separators=(",", ":"))
+    expected = hashing.DIGEST_TAG + hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+    assert hashing.content_hash(data) == expected
+    monkeypatch.setattr(fastjson, "orjson", None)
+    assert hashing.content_hash(data) == expected
+
+
+def test_structural_diff_hash_recomputes_untagged_stored_hashes(tmp_path):
+    _engine, session, repo, _graph, service = setup_env(tmp_path)
+    try:
+        file_obj = repo.add_file_object(path="doc.bin", media_type="application/octet-stream")
+        first = repo.add_extracted_object(
+            file_object_id=file_obj.id, kind="generic", data={"a": 1}
+        )
+        second = repo.add_extracted_object(
+            file_object_id=file_obj.id, kind="generic", data={"a": 1}
+        )
+        # as written by an older install with a different encoder or algorithm
+        first.content_hash = "0" * 64
+        session.commit()
+
+        result = service.diff_extracted_objects(first.id, second.id)
+        assert result.structural["hash_changed"] is False
+        assert result.structural["data_hash_old"] == hashing.strip_digest_tag(
+            second.content_hash
+        )
+    finally:
+        session.close()
+
+
+def test_structurally_diffed_kinds_store_no_hash(tmp_path):
+    _engine, session, repo, _graph, _service = setup_env(tmp_path)
+    try:
+        file_obj = repo.add_file_object(
+            path="board.kicad_pcb", media_type="application/x-kicad"
+        )
+        extracted = repo.add_extracted_object(
+            file_object_id=file_obj.id, kind="kicad_ecad", data={"dt_keys": ["a"]}
+        )
+        assert extracted.content_hash is None
+    finally:
+        session.close()
@@ -71,6 +71,11 @@ def test_persistence_and_list_filters(stitch_env):
     stitched = graph_service.stitch_file(file_obj.id)
     assert len(stitched) == 2
     ids = {c["id"] for c in stitched}
+    stored = {c.id: c for c in repo.list_stitch_candidates()}
+    for row in stitched:
+        assert row["dt_key"] == stored[row["id"]].dt_key
+        assert row["extracted_object_id"] == extracted.id
+        assert row["status"] == "candidate"
 
     listed_all = repo.list_stitch_candidates()
     assert {c.id for c in listed_all} == ids
@@ -109,3 +114,53 @@ def test_update_stitch_candidate(stitch_env):
     assert updated.target_dtmi == "dtmi:com:acme:Bar;2"
     assert updated.confidence == 0.95
     assert updated.rationale == "manual review"
+
+
+def test_persist_candidates_commits_once(stitch_env, monkeypatch):
+    stitch_service, _graph_service, repo = stitch_env
+    file_obj = repo.add_file_object(
+        path="doc.json", media_type="application/json", version="1.0"
+    )
+    repo.add_extracted_object(
+        file_object_id=file_obj.id,
+        kind="metadata",
+        data={"dt_keys": ["dtmi:com:acme:Foo;1", "dt_part_id", "dt_other"]},
+    )
+    candidates = stitch_service.generate_candidates_for_file(file_obj.id)
+
+    commits = []
+    original_commit = repo.session.commit
+    monkeypatch.setattr(repo.session, "commit", lambda: commits.append(original_commit()))
+    ids = stitch_service.persist_candidates(candidates)
+
+    assert len(commits) == 1
+    assert len(ids) == 3
+    stored = {c.id: c for c in repo.list_stitch_candidates()}
+    assert [stored[i].dt_key for i in ids] == [c.dt_key for c in candidates]
+    assert stitch_service.persist_candidates([]) == []
+
+
+def test_generate_candidates_dedupes_per_extracted_object(stitch_env):
+    stitch_service, _graph_service, repo = stitch_env
+    file_obj = repo.add_file_object(
+        path="doc.json", media_type="application/json", version="1.0"
+    )
+    older = repo.add_extracted_object(
+        file_object_id=file_obj.id,
+        kind="metadata",
+        data={"dt_keys": ["dt_part_id", "dt_part_id", 7], "components": [{"ref": "R1"}]},
+    )
+    newer = repo.add_extracted_object(
+        file_object_id=file_obj.id,
+        kind="metadata",
+        data={"dt_keys": ["dt_part_id", "dtmi:com:acme:Foo;1", "dtmi:com:acme:Foo;1"]},
+    )
+    repo.add_extracted_object(file_object_id=file_obj.id, kind="metadata", data={})
+
+    candidates = stitch_service.generate_candidates_for_file(file_obj.id)
+    assert [(c.extracted_object_id, c.dt_key) for c in candidates] == [
+        (newer.id, "dt_part_id"),
+        (newer.id, "dtmi:com:acme:Foo;1"),
+        (older.id, "dt_part_id"),
+    ]
+    assert stitch_service.generate_candidates_for_file(9999) == []
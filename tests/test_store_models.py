@@ -3,7 +3,7 @@ from __future__ import annotations
 import json
 
 import pytest
-from sqlalchemy import inspect
+from sqlalchemy import event, inspect
 from sqlalchemy.exc import IntegrityError
 
 from cymise.store.db import create_db, get_engine, get_session
@@ -38,6 +38,46 @@ def test_schema_created(engine):
     assert expected.issubset(table_names)
 
 
+def test_create_db_adds_missing_indexes(engine):
+    with engine.begin() as conn:
+        conn.exec_driver_sql("DROP INDEX ix_stitch_file_status")
+    create_db(engine)
+    indexes = {ix["name"] for ix in inspect(engine).get_indexes("stitch_candidates")}
+    assert {"ix_stitch_file_status", "ix_stitch_extracted"} <= indexes
+    rel_indexes = {ix["name"] for ix in inspect(engine).get_indexes("relationship_edges")}
+    assert {"ix_rel_source", "ix_rel_target"} <= rel_indexes
+
+
+def test_model_document_lookup_uses_dtmi_index(engine):
+    with engine.connect() as conn:
+        plan = conn.exec_driver_sql(
+            "EXPLAIN QUERY PLAN SELECT * FROM model_documents WHERE dtmi = 'x'"
+        ).all()
+    assert any("ix_model_documents_dtmi" in row[-1] for row in plan)
+
+
+def test_create_db_adds_missing_columns(engine):
+    with engine.begin() as conn:
+        conn.exec_driver_sql("ALTER TABLE extracted_objects DROP COLUMN content_hash")
+    create_db(engine)
+    columns = {col["name"] for col in inspect(engine).get_columns("extracted_objects")}
+    assert "content_hash" in columns
+
+
+def test_engine_applies_sqlite_pragmas(engine):
+    with engine.connect() as conn:
+        assert conn.exec_driver_sql("PRAGMA journal_mode").scalar() == "wal"
+        assert conn.exec_driver_sql("PRAGMA synchronous").scalar() == 1
+        assert conn.exec_driver_sql("PRAGMA temp_store").scalar() == 2
+
+
+def test_engine_requires_sqlite_with_returning(tmp_path, monkeypatch):
+    monkeypatch.setattr("cymise.store.db.sqlite3.sqlite_version_info", (3, 31, 1))
+    monkeypatch.setattr("cymise.store.db.sqlite3.sqlite_version", "3.31.1")
+    with pytest.raises(RuntimeError, match=r"SQLite 3\.35 or newer.*3\.31\.1"):
+        get_engine(tmp_path / "old.db")
+
+
 def test_twin_crud(repo):
     twin = repo.add_twin("dtmi:com:example:device;1", display_name="Device")
     fetched = repo.get_twin_by_dtmi("dtmi:com:example:device;1")
@@ -59,13 +99,24 @@ def test_relationship_crud(repo):
     target = repo.add_twin("dtmi:com:example:target;1", display_name="Target")
     edge = repo.add_relationship(source.id, target.id, name="relatesTo")
 
-    edges = repo.list_relationships()
+    edges = list(repo.list_relationships())
     assert len(edges) == 1
     assert edges[0].id == edge.id
     assert edges[0].source_id == source.id
     assert edges[0].target_id == target.id
 
 
+def test_relationships_for_node_lists_outgoing_then_incoming(repo):
+    hub = repo.add_twin("dtmi:com:example:hub;1")
+    other = repo.add_twin("dtmi:com:example:other;1")
+    incoming = repo.add_relationship(other.id, hub.id, name="in")
+    outgoing = repo.add_relationship(hub.id, other.id, name="out")
+    loop = repo.add_relationship(hub.id, hub.id, name="loop")
+
+    edges = repo.get_relationships_for_node(hub.id)
+    assert [e.id for e in edges] == [outgoing.id, loop.id, incoming.id]
+
+
 def test_file_and_extracted_objects(repo):
     twin = repo.add_twin("dtmi:com:example:filetwin;1")
     file_obj = repo.add_file_object(
@@ -78,8 +129,8 @@ def test_file_and_extracted_objects(repo):
         file_object_id=file_obj.id, kind="metadata", data={"k": "v"}
     )
 
-    files = repo.list_file_objects()
-    extracted_objects = repo.list_extracted_objects()
+    files = list(repo.list_file_objects())
+    extracted_objects = list(repo.list_extracted_objects())
 
     assert len(files) == 1
     assert files[0].id == file_obj.id
@@ -97,7 +148,199 @@ def test_model_documents(repo):
         content='{"@id":"dtmi:com:example:interface;1"}',
         dtmi="dtmi:com:example:interface;1",
     )
-    docs = repo.list_model_documents()
+    docs = list(repo.list_model_documents())
     assert len(docs) == 1
     assert docs[0].id == doc.id
     assert docs[0].dtmi == "dtmi:com:example:interface;1"
+
+
+def test_bulk_upserts_commit_once_and_update_existing(repo):
+    existing = repo.add_twin("dtmi:example:a;1", display_name="Old")
+    repo.add_model_document(name="old", content="{}", dtmi="dtmi:example:a;1")
+
+    ids = repo.upsert_twins(
+        [
+            {"dtmi": "dtmi:example:a;1", "display_name": None, "validation": {"is_ok": True}},
+            {"dtmi": "dtmi:example:b;1", "display_name": "B"},
+        ]
+    )
+    assert ids["dtmi:example:a;1"] == existing.id
+    assert repo.get_twin_by_dtmi("dtmi:example:a;1").display_name == "Old"
+    assert repo.get_twin_by_dtmi("dtmi:example:a;1").validation == {"is_ok": True}
+    assert repo.get_twin_by_dtmi("dtmi:example:b;1").display_name == "B"
+
+    created = repo.add_relationships(
+        [{"source_id": ids["dtmi:example:a;1"], "target_id": ids["dtmi:example:b;1"]}]
+    )
+    assert created == 1
+    assert list(repo.list_relationships())[0].name is None
+
+    repo.upsert_model_documents(
+        [
+            {"name": "a", "content": '{"v": 2}', "dtmi": "dtmi:example:a;1"},
+            {"name": "b", "content": "{}", "dtmi": "dtmi:example:b;1"},
+        ]
+    )
+    docs = list(repo.list_model_documents())
+    assert len(docs) == 2
+    assert repo.get_model_document_by_dtmi("dtmi:example:a;1").content == '{"v": 2}'
+
+
+def test_transaction_defers_commit_and_rolls_back(repo, monkeypatch):
+    commits = []
+    original_commit = repo.session.commit
+    monkeypatch.setattr(repo.session, "commit", lambda: commits.append(original_commit()))
+
+    with repo.transaction():
+        a = repo.add_twin("dtmi:example:a;1")
+        with repo.transaction():
+            b = repo.add_twin("dtmi:example:b;1")
+        repo.add_relationship(a.id, b.id, name="rel")
+        assert commits == []
+    assert len(commits) == 1
+    assert a.id is not None and b.id is not None
+    assert len(list(repo.list_relationships())) == 1
+
+    with pytest.raises(RuntimeError):
+        with repo.transaction():
+            repo.add_twin("dtmi:example:c;1")
+            raise RuntimeError("boom")
+    assert repo.get_twin_by_dtmi("dtmi:example:c;1") is None
+    assert len(commits) == 1
+
+
+def test_list_extracted_dt_keys_for_file_is_flat(repo):
+    file_obj = repo.add_file_object(path="a.kicad_pcb")
+    old = repo.add_extracted_object(
+        file_object_id=file_obj.id, kind="k", data={"dt_keys": ["dt_b", 3, "dt_a"]}
+    )
+    repo.add_extracted_object(file_object_id=file_obj.id, kind="k", data={"nets": {}})
+    new = repo.add_extracted_object(
+        file_object_id=file_obj.id, kind="k", data={"dt_keys": ["x"]}
+    )
+
+    assert repo.list_extracted_dt_keys_for_file(file_obj.id) == [
+        (new.id, "x"),
+        (old.id, "dt_b"),
+        (old.id, "dt_a"),
+    ]
+
+
+def test_get_extracted_objects_by_ids(repo):
+    file_obj = repo.add_file_object(path="a.kicad_pcb")
+    first = repo.add_extracted_object(file_object_id=file_obj.id, kind="k", data={})
+    second = repo.add_extracted_object(file_object_id=file_obj.id, kind="k", data={})
+
+    found = repo.get_extracted_objects_by_ids([second.id, first.id, second.id, 9999])
+    assert found == {first.id: first, second.id: second}
+    latest = repo.list_extracted_objects_for_file(file_obj.id, limit=1)
+    assert [obj.id for obj in latest] == [second.id]
+
+
+def test_add_does_not_reload_the_new_row(repo, engine):
+    statements = []
+
+    def record(_conn, _cursor, statement, *_args):
+        statements.append(statement.split()[0].upper())
+
+    event.listen(engine, "before_cursor_execute", record)
+    try:
+        twin = repo.add_twin("dtmi:example:a;1", display_name="A")
+        assert (twin.id, twin.dtmi, twin.display_name) == (1, "dtmi:example:a;1", "A")
+        assert twin.created_at is not None
+    finally:
+        event.remove(engine, "before_cursor_execute", record)
+    assert statements == ["INSERT"]
+
+
+def test_updates_are_single_statements(repo, engine):
+    twin = repo.add_twin("dtmi:example:a;1", display_name="Old")
+    other = repo.add_twin("dtmi:example:b;1")
+    edge_id = repo.add_relationship(twin.id, other.id, name="old").id
+    stamp = repo.get_twin_by_dtmi("dtmi:example:a;1").updated_at
+    statements = []
+
+    def record(_conn, _cursor, statement, *_args):
+        statements.append(statement.split()[0].upper())
+
+    event.listen(engine, "before_cursor_execute", record)
+    try:
+        updated = repo.update_twin("dtmi:example:a;1", display_name="New")
+        renamed = repo.update_relationship_name(edge_id, "new")
+        validated = repo.set_twin_validation("dtmi:example:a;1", {"is_ok": False})
+    finally:
+        event.remove(engine, "before_cursor_execute", record)
+    assert statements == ["UPDATE", "UPDATE", "UPDATE"]
+
+    assert updated is twin and validated is twin
+    assert renamed.name == "new"
+    assert repo.get_twin_by_dtmi("dtmi:example:a;1").display_name == "New"
+    assert twin.validation == {"is_ok": False}
+    assert twin.updated_at >= stamp
+    assert repo.update_twin("dtmi:example:missing;1", display_name="x") is None
+    assert repo.set_edge_validation(9999, {}) is None
+
+
+def test_delete_twin_cascades_without_loading_rows(repo, engine):
+    twin = repo.add_twin("dtmi:example:a;1")
+    other = repo.add_twin("dtmi:example:b;1")
+    repo.add_relationship(twin.id, other.id)
+    repo.add_relationship(other.id, twin.id)
+    attached = repo.add_file_object(path="a.txt", twin_id=twin.id)
+    loose = repo.add_file_object(path="b.txt")
+    for file_obj in (attached, loose):
+        extracted = repo.add_extracted_object(file_obj.id, kind="k", data={})
+        repo.add_stitch_candidate(file_obj.id, extracted.id, dt_key="dt_x")
+    twin_id, attached_id = twin.id, attached.id
+    statements = []
+
+    def record(_conn, _cursor, statement, *_args):
+        statements.append(statement.split()[0].upper())
+
+    event.listen(engine, "before_cursor_execute", record)
+    try:
+        assert repo.delete_twin_by_dtmi("dtmi:example:a;1") is True
+    finally:
+        event.remove(engine, "before_cursor_execute", record)
+    assert statements == ["DELETE"] * 5
+
+    assert repo.get_twin_by_id(twin_id) is None
+    assert list(repo.list_relationships()) == []
+    assert repo.get_file_object_by_id(attached_id) is None
+    assert repo.list_extracted_objects_for_file(attached_id) == []
+    assert [f.path for f in repo.list_file_objects()] == ["b.txt"]
+    assert [s.file_object_id for s in repo.list_stitch_candidates()] == [loose.id]
+    assert repo.delete_twin_by_dtmi("dtmi:example:a;1") is False
+
+
+def test_list_methods_return_one_pass_streams(repo):
+    repo.upsert_twins([{"dtmi": f"dtmi:example:n{i};1"} for i in range(1100)])
+
+    twins = repo.list_twins()
+
+    assert not isinstance(twins, list)
+    assert len({twin.dtmi for twin in twins}) == 1100
+    assert list(twins) == []
+
+
+def test_get_by_id_hits_identity_map_across_commits(repo, engine):
+    twin = repo.add_twin("dtmi:example:a;1")
+    other = repo.add_twin("dtmi:example:b;1")
+    edge = repo.add_relationship(twin.id, other.id, name="rel")
+    file_obj = repo.add_file_object(path="a.txt")
+    twin_id, edge_id, file_id = twin.id, edge.id, file_obj.id
+    statements = []
+
+    def record(_conn, _cursor, statement, *_args):
+        statements.append(statement.split()[0].upper())
+
+    event.listen(engine, "before_cursor_execute", record)
+    try:
+        repo.update_relationship_name(edge_id, "renamed")
+        repo.update_file_object(file_id, twin_id=twin_id)
+        assert repo.get_twin_by_id(twin_id) is twin
+        assert repo.get_relationship_by_id(edge_id) is edge
+        assert repo.get_file_object_by_id(file_id).twin_node is twin
+    finally:
+        event.remove(engine, "before_cursor_execute", record)
+    assert "SELECT" not in statements
@@ -4,7 +4,7 @@ import pytest
 
 pytest.importorskip("PySide6.QtWidgets")
 
-from PySide6 import QtWidgets
+from PySide6 import QtCore, QtWidgets
 
 from cymise.graph.service import GraphService
 from cymise.store.db import create_db, get_engine, get_session
@@ -54,6 +54,24 @@ def test_extract_validation_groups(service: GraphService):
     assert node2_rows[0].category == "cymise"
 
 
+def test_extract_validation_groups_edges_use_listed_twins(service: GraphService, monkeypatch):
+    service.create_twin("dtmi:com:example:a;1")
+    service.create_twin("dtmi:com:example:b;1")
+    edge = service.create_relationship("dtmi:com:example:a;1", "dtmi:com:example:b;1", "feeds")
+    service.set_edge_validation(
+        edge.id, {"issues": [{"severity": "warning", "message": "loose", "code": "W1"}]}
+    )
+
+    def _fail(*_args, **_kwargs):
+        raise AssertionError("edge endpoints should come from the listed twins")
+
+    monkeypatch.setattr(service.repo, "get_twin_by_id", _fail)
+    groups = extract_validation_groups(service)
+
+    rows = groups["dtmi:com:example:a;1"]
+    assert [(row.kind, row.severity) for row in rows] == [("edge", "warning")]
+
+
 def test_issue_activation_signal(service: GraphService):
     app = QtWidgets.QApplication.instance() or QtWidgets.QApplication([])
     service.create_twin("dtmi:com:example:node;1")
@@ -63,12 +81,15 @@ def test_issue_activation_signal(service: GraphService):
     )
     view = ValidationView(service)
     view.refresh_from_store()
+    # groups are built on the pool and delivered through a queued signal
+    QtCore.QThreadPool.globalInstance().waitForDone()
+    app.processEvents()
 
     # select first model to populate table
     model_item = view.models_list.item(0)
     view.models_list.setCurrentItem(model_item)
     # trigger double-click handler manually
-    first_cell = view.issues_table.item(0, 0)
+    first_cell = view.issues_model.index(0, 0)
     captured = []
 
     def _capture(kind, element_id):
@@ -78,3 +99,22 @@ def test_issue_activation_signal(service: GraphService):
     view._on_issue_activated(first_cell)
 
     assert captured == [("node", "dtmi:com:example:node;1")]
+
+
+def test_refresh_requested_while_running_is_queued(service: GraphService):
+    app = QtWidgets.QApplication.instance() or QtWidgets.QApplication([])
+    view = ValidationView(service)
+    view.refresh_from_store()
+    service.create_twin("dtmi:com:example:late;1")
+    service.set_node_validation(
+        "dtmi:com:example:late;1", {"issues": [{"severity": "warning", "message": "w"}]}
+    )
+    view.refresh_from_store()
+    assert view._pending_refresh is service
+
+    for _ in range(2):
+        QtCore.QThreadPool.globalInstance().waitForDone()
+        app.processEvents()
+
+    assert view._pending_refresh is None and not view._refresh_running
+    assert list(view._model_groups) == ["dtmi:com:example:late;1"]